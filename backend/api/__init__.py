@@ -1,3 +1,2 @@
 # API Routes package
 from .config_routes import router as config_router
-from .upload_routes import router as upload_router
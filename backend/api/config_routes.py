@@ -1,16 +1,23 @@
 """
 Dynamic configuration API endpoints.
 Allows frontend to fetch form options dynamically without redeployment.
+The tables below are defaults; a `form.options` document in the config
+collection overrides them at runtime through the config store.
 """
 
-from fastapi import APIRouter, Depends, Request
+import logging
+from fastapi import APIRouter
 from typing import Dict, Any, List
-from datetime import datetime
-from models.schemas import (
-    ConfigOption, FormConfigResponse,
-    SurfaceFinish, SolderMaskColor, StencilType, SourcingType,
-    PCB_LIMITS if hasattr(__import__('models.schemas'), 'PCB_LIMITS') else None
-)
+from datetime import datetime, timezone
+from pathlib import Path
+from pydantic import ValidationError
+from config import settings
+from models.schemas import ConfigOption, FormConfigResponse, FormOptions
+from seed_data import SEED_HASH_FIELD
+from services.config_store import ConfigSnapshot, ConfigStore
+from services.json_response import RawJSONResponse, conditional_json, prerendered
+
+logger = logging.getLogger(__name__)
 
 
 router = APIRouter(prefix="/api/v1/config", tags=["Configuration"])
@@ -128,75 +135,165 @@ FORM_LIMITS = {
     "bga_count": {"min": 0, "max": 500, "default": 0}
 }
 
+LEAD_TIME_OPTIONS = {
+    "fast": {"factor": 1.5, "days": "3-5"},
+    "standard": {"factor": 1.0, "days": "7-10"},
+    "economy": {"factor": 0.85, "days": "12-15"}
+}
+
+TOLERANCE_OPTIONS = {
+    "standard": {"min_mm": 0.15, "factor": 1.0},
+    "tight": {"min_mm": 0.10, "factor": 1.15},
+    "ultra_fine": {"min_mm": 0.075, "factor": 1.44}
+}
+
+
+# Defaults for the `form.options` config document. The live tables come
+# from the config store, so factors can change without a deploy.
+DEFAULT_FORM_OPTIONS = FormOptions(
+    finishes=SURFACE_FINISHES,
+    colors=SOLDER_MASK_COLORS,
+    layers=LAYER_OPTIONS,
+    thicknesses=THICKNESS_OPTIONS,
+    copper_weights=COPPER_WEIGHT_OPTIONS,
+    stencils=STENCIL_OPTIONS,
+    sourcing_options=SOURCING_OPTIONS,
+    limits=FORM_LIMITS,
+    lead_times=LEAD_TIME_OPTIONS,
+    tolerances=TOLERANCE_OPTIONS,
+)
+FORM_OPTIONS_KEY = "form.options"
+
+# Without a stored document the defaults above are the options, and they
+# only change on deploy: this module's mtime is their version, identical
+# across workers, which keeps ETags consistent.
+OPTIONS_UPDATED_AT = datetime.fromtimestamp(Path(__file__).stat().st_mtime, tz=timezone.utc)
+
+# Clients and proxies revalidate with If-None-Match
+cacheable = conditional_json(settings.CACHE_CONTROL_FORM_OPTIONS)
+
+config_store = ConfigStore(
+    poll_interval=settings.CONFIG_POLL_INTERVAL_SECONDS,
+    change_streams=settings.CONFIG_CHANGE_STREAMS,
+    hidden_fields=[SEED_HASH_FIELD],
+)
+
+
+def build_payloads(options: FormOptions, updated_at: datetime) -> Dict[str, Dict[str, Any]]:
+    """
+    Serialize every option payload once per config version. The routes
+    below serve these bytes as they are, so a request costs no
+    model_dump or encoding.
+    """
+    form_options = FormConfigResponse(
+        finishes=options.finishes,
+        colors=options.colors,
+        layers=options.layers,
+        thicknesses=options.thicknesses,
+        copper_weights=options.copper_weights,
+        stencils=options.stencils,
+        sourcing_options=options.sourcing_options,
+        limits=options.limits,
+        updated_at=updated_at
+    ).model_dump(mode="json")
+    pricing_factors = {
+        "finishes": {f.value: f.price_factor for f in options.finishes},
+        "colors": {c.value: c.price_factor for c in options.colors if c.price_factor},
+        "layers": {l.value: l.price_factor for l in options.layers},
+        "lead_times": options.lead_times,
+        "tolerances": options.tolerances
+    }
+    return {
+        "form-options": prerendered(form_options),
+        "finishes": prerendered([f.model_dump() for f in options.finishes]),
+        "colors": prerendered([c.model_dump() for c in options.colors]),
+        "layers": prerendered([l.model_dump() for l in options.layers]),
+        "limits": prerendered(options.limits),
+        "pricing-factors": prerendered(pricing_factors),
+    }
+
+
+_form_options = DEFAULT_FORM_OPTIONS
+PAYLOADS = build_payloads(DEFAULT_FORM_OPTIONS, OPTIONS_UPDATED_AT)
+
+
+def current_form_options() -> FormOptions:
+    """Option tables of the current config version."""
+    return _form_options
+
+
+def apply_snapshot(snapshot: ConfigSnapshot) -> None:
+    """
+    Rebuild the option tables and PAYLOADS from a config snapshot. Tables
+    missing from the stored document keep their defaults; an invalid
+    document is logged and the previous options stay in place.
+    """
+    global _form_options
+    doc = snapshot.docs.get(FORM_OPTIONS_KEY) or {}
+    try:
+        options = FormOptions.model_validate({**DEFAULT_FORM_OPTIONS.model_dump(), **doc.get("data", {})})
+        updated_at = doc.get("updated_at") or OPTIONS_UPDATED_AT
+        payloads = build_payloads(options, updated_at)
+    except ValidationError as e:
+        logger.error(f"Ignoring invalid {FORM_OPTIONS_KEY} (config version {snapshot.version}): {e}")
+        return
+    _form_options = options
+    PAYLOADS.update(payloads)
+
+
+config_store.subscribe(apply_snapshot)
+
 
 # =====================================================
 # API ENDPOINTS
 # =====================================================
 
-@router.get("/form-options", response_model=FormConfigResponse)
+@router.get("/form-options", response_model=FormConfigResponse, response_class=RawJSONResponse)
+@cacheable
 async def get_form_options():
     """
     Get all form configuration options.
-    Frontend should cache this response and refresh periodically.
+    Frontend should cache this response and revalidate with its ETag.
     """
-    return FormConfigResponse(
-        finishes=SURFACE_FINISHES,
-        colors=SOLDER_MASK_COLORS,
-        layers=LAYER_OPTIONS,
-        thicknesses=THICKNESS_OPTIONS,
-        copper_weights=COPPER_WEIGHT_OPTIONS,
-        stencils=STENCIL_OPTIONS,
-        sourcing_options=SOURCING_OPTIONS,
-        limits=FORM_LIMITS,
-        updated_at=datetime.utcnow()
-    )
+    return PAYLOADS["form-options"]
 
 
-@router.get("/finishes")
-async def get_surface_finishes() -> List[Dict[str, Any]]:
+@router.get("/finishes", response_model=List[ConfigOption], response_class=RawJSONResponse)
+@cacheable
+async def get_surface_finishes():
     """Get available surface finish options."""
-    return [f.model_dump() for f in SURFACE_FINISHES]
+    return PAYLOADS["finishes"]
 
 
-@router.get("/colors")
-async def get_solder_mask_colors() -> List[Dict[str, Any]]:
+@router.get("/colors", response_model=List[ConfigOption], response_class=RawJSONResponse)
+@cacheable
+async def get_solder_mask_colors():
     """Get available solder mask colors."""
-    return [c.model_dump() for c in SOLDER_MASK_COLORS]
+    return PAYLOADS["colors"]
 
 
-@router.get("/layers")
-async def get_layer_options() -> List[Dict[str, Any]]:
+@router.get("/layers", response_model=List[ConfigOption], response_class=RawJSONResponse)
+@cacheable
+async def get_layer_options():
     """Get available layer count options."""
-    return [l.model_dump() for l in LAYER_OPTIONS]
+    return PAYLOADS["layers"]
 
 
-@router.get("/limits")
-async def get_form_limits() -> Dict[str, Any]:
+@router.get("/limits", response_model=Dict[str, Any], response_class=RawJSONResponse)
+@cacheable
+async def get_form_limits():
     """Get form field limits for validation."""
-    return FORM_LIMITS
+    return PAYLOADS["limits"]
 
 
-@router.get("/pricing-factors")
-async def get_pricing_factors() -> Dict[str, Any]:
+@router.get("/pricing-factors", response_model=Dict[str, Any], response_class=RawJSONResponse)
+@cacheable
+async def get_pricing_factors():
     """
     Get all pricing factor information.
     Useful for showing price impact of different options.
     """
-    return {
-        "finishes": {f.value: f.price_factor for f in SURFACE_FINISHES},
-        "colors": {c.value: c.price_factor for c in SOLDER_MASK_COLORS if c.price_factor},
-        "layers": {l.value: l.price_factor for l in LAYER_OPTIONS},
-        "lead_times": {
-            "fast": {"factor": 1.5, "days": "3-5"},
-            "standard": {"factor": 1.0, "days": "7-10"},
-            "economy": {"factor": 0.85, "days": "12-15"}
-        },
-        "tolerances": {
-            "standard": {"min_mm": 0.15, "factor": 1.0},
-            "tight": {"min_mm": 0.10, "factor": 1.15},
-            "ultra_fine": {"min_mm": 0.075, "factor": 1.44}
-        }
-    }
+    return PAYLOADS["pricing-factors"]
 
 
 @router.get("/health")
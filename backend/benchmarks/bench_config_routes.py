@@ -0,0 +1,116 @@
+"""
+Static config route throughput benchmark.
+
+Compares requests/second for the form option routes when each request
+rebuilds the pydantic models and serializes them (old) with serving the
+payloads api/config_routes.py prebuilt at import (new). Both run as
+ASGI apps in-process through httpx, so the figures include FastAPI
+routing but no network.
+
+Usage (from backend/):
+    python -m benchmarks.bench_config_routes [--requests 3000]
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+
+import httpx
+from fastapi import APIRouter, FastAPI
+
+from api import config_routes
+from api.config_routes import (
+    COPPER_WEIGHT_OPTIONS, FORM_LIMITS, LAYER_OPTIONS, LEAD_TIME_OPTIONS,
+    OPTIONS_UPDATED_AT, SOLDER_MASK_COLORS, SOURCING_OPTIONS, STENCIL_OPTIONS,
+    SURFACE_FINISHES, THICKNESS_OPTIONS, TOLERANCE_OPTIONS, cacheable,
+)
+from models.schemas import FormConfigResponse
+from services.json_response import RawJSONResponse, render_json
+
+ROUTES = ["form-options", "finishes", "colors", "layers", "pricing-factors"]
+
+
+def old_router() -> APIRouter:
+    """The routes as they were: models dumped and serialized per request."""
+    router = APIRouter(prefix="/api/v1/config")
+
+    @router.get("/form-options", response_class=RawJSONResponse)
+    @cacheable
+    @render_json
+    async def get_form_options():
+        return FormConfigResponse(
+            finishes=SURFACE_FINISHES, colors=SOLDER_MASK_COLORS, layers=LAYER_OPTIONS,
+            thicknesses=THICKNESS_OPTIONS, copper_weights=COPPER_WEIGHT_OPTIONS,
+            stencils=STENCIL_OPTIONS, sourcing_options=SOURCING_OPTIONS,
+            limits=FORM_LIMITS, updated_at=OPTIONS_UPDATED_AT,
+        ).model_dump(mode="json")
+
+    @router.get("/finishes", response_class=RawJSONResponse)
+    @cacheable
+    @render_json
+    async def get_surface_finishes():
+        return [f.model_dump() for f in SURFACE_FINISHES]
+
+    @router.get("/colors", response_class=RawJSONResponse)
+    @cacheable
+    @render_json
+    async def get_solder_mask_colors():
+        return [c.model_dump() for c in SOLDER_MASK_COLORS]
+
+    @router.get("/layers", response_class=RawJSONResponse)
+    @cacheable
+    @render_json
+    async def get_layer_options():
+        return [l.model_dump() for l in LAYER_OPTIONS]
+
+    @router.get("/pricing-factors", response_class=RawJSONResponse)
+    @cacheable
+    @render_json
+    async def get_pricing_factors():
+        return {
+            "finishes": {f.value: f.price_factor for f in SURFACE_FINISHES},
+            "colors": {c.value: c.price_factor for c in SOLDER_MASK_COLORS if c.price_factor},
+            "layers": {l.value: l.price_factor for l in LAYER_OPTIONS},
+            "lead_times": LEAD_TIME_OPTIONS,
+            "tolerances": TOLERANCE_OPTIONS,
+        }
+
+    return router
+
+
+def make_app(router: APIRouter) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+async def per_second(app: FastAPI, route: str, n: int) -> float:
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        url = f"/api/v1/config/{route}"
+        await client.get(url)  # warm up
+        start = time.perf_counter()
+        for _ in range(n):
+            response = await client.get(url)
+            assert response.status_code == 200, response.text
+        return n / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=3000, help="requests per route and variant")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # httpx logs every request
+
+    old_app, new_app = make_app(old_router()), make_app(config_routes.router)
+    print(f"{'route':<16} {'bytes':>6} {'old req/s':>10} {'new req/s':>10} {'speedup':>8}")
+    for route in ROUTES:
+        old = asyncio.run(per_second(old_app, route, args.requests))
+        new = asyncio.run(per_second(new_app, route, args.requests))
+        size = len(config_routes.PAYLOADS[route]["body"])
+        print(f"{route:<16} {size:>6} {old:>10.0f} {new:>10.0f} {new / old:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Consultation submission benchmark.
+
+Measures submissions per second on one worker (one event loop):
+  - pipeline: request model validation through to the response body,
+              comparing the old InfoRequest rebuild + response_model
+              revalidation with InfoRequestCreate.to_document()
+  - endpoint: POST /api/v1/contact/consultation through the ASGI app,
+              including rate limiting, sanitizing and the journal write
+
+The endpoint case swaps in a write-behind queue backed by a no-op
+collection in a temporary directory, so nothing reaches MONGO_URL.
+
+Usage (from backend/):
+    python -m benchmarks.bench_consultation_submit [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import tempfile
+import time
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "aico_bench")
+
+import httpx  # noqa: E402
+
+import server  # noqa: E402
+from server import InfoRequest, InfoRequestCreate  # noqa: E402
+from services.write_behind import WriteBehindQueue  # noqa: E402
+
+PAYLOAD = {
+    "name": "Ahmet Yılmaz",
+    "email": "Ahmet.Yilmaz@Example.com",
+    "phone": "+90 (532) 123 45 67",
+    "company": "AICO Elektronik A.Ş.",
+    "project_type": "pcb_design",
+    "budget_range": "10k-50k",
+    "timeline": "3 months",
+    "message": "We need a 6-layer board with impedance control for a 10G SerDes link. "
+               "Volume is around 500 units per year.",
+}
+
+
+class NullCollection:
+    async def insert_many(self, docs, ordered=True):
+        return None
+
+
+def old_pipeline(payload: dict) -> bytes:
+    """Validate, rebuild InfoRequest, dump, then revalidate for response_model"""
+    info_request = InfoRequestCreate.model_validate(payload)
+    info_obj = InfoRequest(**info_request.model_dump())
+    info_dict = info_obj.model_dump()
+    info_dict["created_at"] = info_dict["created_at"].isoformat()
+    response = InfoRequest.model_validate(info_obj.model_dump()).model_dump(mode="json")
+    return json.dumps(response).encode()
+
+
+def new_pipeline(payload: dict) -> bytes:
+    """Validate once and serialize the stored document as the response"""
+    info_dict = InfoRequestCreate.model_validate(payload).to_document()
+    return json.dumps(info_dict).encode()
+
+
+def per_second(func, n: int) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        func(PAYLOAD)
+    return n / (time.perf_counter() - start)
+
+
+async def endpoint_per_second(n: int) -> float:
+    with tempfile.TemporaryDirectory() as journal_dir:
+        server.consultation_queue = WriteBehindQueue(NullCollection(), journal_dir, "bench", max_size=n + 1)
+        await server.consultation_queue.start()
+        transport = httpx.ASGITransport(app=server.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            start = time.perf_counter()
+            for i in range(n):
+                # Distinct client IPs keep the 5/minute limit out of the measurement
+                response = await client.post(
+                    "/api/v1/contact/consultation", json=PAYLOAD,
+                    headers={"X-Real-IP": f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}"},
+                )
+                assert response.status_code == 200, response.text
+            elapsed = time.perf_counter() - start
+        await server.consultation_queue.stop()
+    return n / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000, help="submissions per case")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)  # per-request access and flush logs would dominate
+
+    old = per_second(old_pipeline, args.requests)
+    new = per_second(new_pipeline, args.requests)
+    print(f"{'case':<10} {'variant':<10} {'submissions/s':>14}")
+    print(f"{'pipeline':<10} {'old':<10} {old:>14.0f}")
+    print(f"{'pipeline':<10} {'new':<10} {new:>14.0f}  ({new / old:.2f}x)")
+    print(f"{'endpoint':<10} {'new':<10} {asyncio.run(endpoint_per_second(args.requests)):>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
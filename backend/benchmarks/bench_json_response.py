@@ -0,0 +1,84 @@
+"""
+Project/config response serialization benchmark.
+
+Compares, per response, the default FastAPI path (jsonable_encoder, then
+JSONResponse.render) with RawJSONResponse (orjson on the raw document):
+  - time:   microseconds per rendered response
+  - allocs: peak bytes allocated while rendering one response (tracemalloc)
+
+Payloads are the seed projects and site config, as the routes return them.
+
+Usage (from backend/):
+    python -m benchmarks.bench_json_response [--iterations 2000]
+"""
+
+import argparse
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from seed_data import SAMPLE_PROJECTS, SITE_CONFIG
+from services.json_response import RawJSONResponse
+
+
+def _stored(doc: dict) -> dict:
+    now = datetime.now(timezone.utc).isoformat()
+    return {"id": str(uuid.uuid4()), **doc, "created_at": now, "updated_at": now}
+
+
+PROJECTS = [_stored(p) for p in SAMPLE_PROJECTS]
+PAYLOADS = {
+    "project": PROJECTS[0],
+    "project_list": {"success": True, "items": PROJECTS, "total": len(PROJECTS), "page": 1,
+                     "per_page": 20, "pages": 1, "next_cursor": None, "schema_version": 1},
+    "config": _stored(SITE_CONFIG),
+}
+
+
+def default_path(content) -> bytes:
+    return JSONResponse(jsonable_encoder(content)).body
+
+
+def raw_path(content) -> bytes:
+    return RawJSONResponse(content).body
+
+
+def us_per_response(func, content, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        func(content)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def peak_alloc(func, content) -> int:
+    func(content)  # warm caches outside the measurement
+    tracemalloc.start()
+    func(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="renders per payload and path")
+    args = parser.parse_args()
+
+    print(f"{'payload':<13} {'bytes':>7} {'default us':>11} {'raw us':>8} {'speedup':>8} "
+          f"{'default alloc':>14} {'raw alloc':>10}")
+    for name, content in PAYLOADS.items():
+        size = len(raw_path(content))
+        default_us = us_per_response(default_path, content, args.iterations)
+        raw_us = us_per_response(raw_path, content, args.iterations)
+        print(
+            f"{name:<13} {size:>7} {default_us:>11.1f} {raw_us:>8.1f} {default_us / raw_us:>7.1f}x "
+            f"{peak_alloc(default_path, content):>14} {peak_alloc(raw_path, content):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
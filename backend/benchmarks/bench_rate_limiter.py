@@ -0,0 +1,89 @@
+"""
+Rate limiter backend benchmark.
+
+Compares per-request CPU time and retained memory of the in-memory rate
+limit backends under two traffic shapes:
+  - scan:  many distinct IPs, a few requests each (rotating-IP scraping)
+  - burst: a few IPs hammering up to the hourly limit
+
+Usage (from backend/):
+    python -m benchmarks.bench_rate_limiter [--ips 20000] [--requests 200]
+"""
+
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from middleware.rate_limiter import (
+    InMemoryBackend, RateLimitConfig, RateLimiter, SlidingWindowCounterBackend,
+)
+
+BACKENDS = {
+    "InMemoryBackend": InMemoryBackend,
+    "SlidingWindowCounterBackend": SlidingWindowCounterBackend,
+}
+
+
+class _Request:
+    __slots__ = ("headers", "client")
+
+    def __init__(self, ip: str):
+        self.headers = {"X-Real-IP": ip}
+        self.client = None
+
+
+async def _drive(limiter: RateLimiter, requests: list) -> None:
+    for request in requests:
+        await limiter.check_rate_limit(request)
+
+
+def run_case(backend_cls, ips: int, per_ip: int) -> dict:
+    """Drive `ips * per_ip` requests through a fresh limiter and measure it."""
+    # Limits high enough that every request is recorded in every window
+    config = RateLimitConfig(
+        requests_per_minute=per_ip + 1,
+        requests_per_hour=per_ip + 1,
+        burst_limit=per_ip + 1,
+        whitelist_ips=[],
+    )
+    requests = [_Request(f"10.{i >> 16 & 255}.{i >> 8 & 255}.{i & 255}") for i in range(ips)] * per_ip
+
+    tracemalloc.start()
+    limiter = RateLimiter(config, backend_cls())
+    start = time.perf_counter()
+    asyncio.run(_drive(limiter, requests))
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "requests": len(requests),
+        "us_per_request": elapsed / len(requests) * 1e6,
+        "retained_kb": retained / 1024,
+        "bytes_per_ip": retained / ips,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ips", type=int, default=20000, help="distinct IPs in the scan case")
+    parser.add_argument("--requests", type=int, default=200, help="requests per IP in the burst case")
+    args = parser.parse_args()
+
+    cases = {
+        "scan": (args.ips, 3),
+        "burst": (50, args.requests),
+    }
+    print(f"{'case':<6} {'backend':<28} {'requests':>9} {'us/req':>8} {'retained KB':>12} {'B/IP':>8}")
+    for case, (ips, per_ip) in cases.items():
+        for name, backend_cls in BACKENDS.items():
+            r = run_case(backend_cls, ips, per_ip)
+            print(
+                f"{case:<6} {name:<28} {r['requests']:>9} {r['us_per_request']:>8.2f} "
+                f"{r['retained_kb']:>12.1f} {r['bytes_per_ip']:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Sanitizer benchmark.
+
+Compares the per-field cost of always running bleach.clean against the
+fast-path sanitizer, on realistic consultation form inputs:
+  - plain:  names, companies and messages without markup (typical)
+  - markup: the same text with tags or entities (falls back to bleach)
+
+Usage (from backend/):
+    python -m benchmarks.bench_sanitizer [--iterations 2000]
+"""
+
+import argparse
+import time
+
+from services.sanitizer import clean_html, sanitize_input
+
+PLAIN = [
+    "Ahmet Yılmaz",
+    "AICO Elektronik A.Ş.",
+    "FPGA tabanlı görüntü işleme",
+    "We need a 6-layer board with impedance control for a 10G SerDes link. "
+    "Volume is around 500 units per year, first prototypes by Q3.\n\nThanks!",
+]
+MARKUP = [
+    "<b>Ahmet</b> Yılmaz",
+    "R&D Department",
+    "<script>alert(1)</script>FPGA",
+    "Budget < 10k & timeline > 3 months",
+]
+
+
+def always_bleach(value: str) -> str:
+    return " ".join(clean_html(value).split()).strip()
+
+
+def time_per_field(func, values, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for value in values:
+            func(value)
+    return (time.perf_counter() - start) / (iterations * len(values)) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="passes over each input set")
+    args = parser.parse_args()
+
+    print(f"{'input':<8} {'bleach us':>10} {'fast us':>10} {'speedup':>8}")
+    for name, values in (("plain", PLAIN), ("markup", MARKUP)):
+        baseline = time_per_field(always_bleach, values, args.iterations)
+        fast = time_per_field(sanitize_input, values, args.iterations)
+        print(f"{name:<8} {baseline:>10.2f} {fast:>10.2f} {baseline / fast:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
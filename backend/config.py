@@ -27,6 +27,76 @@ class Settings(BaseSettings):
         default="aico_db",
         description="MongoDB database name"
     )
+    MONGO_MAX_POOL_SIZE: int = Field(
+        default=50,
+        description="Connections per worker; the deployment opens up to workers x this many"
+    )
+    MONGO_MIN_POOL_SIZE: int = Field(
+        default=5,
+        description="Connections opened at startup and kept open per worker"
+    )
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: Optional[int] = Field(
+        default=5000,
+        description="How long a request waits for a free pooled connection before failing"
+    )
+    MONGO_COMPRESSORS: str = Field(
+        default="",
+        description="Wire compressors in preference order, e.g. 'zstd,zlib' (empty disables)"
+    )
+    MONGO_READ_PREFERENCE: str = Field(
+        default="primary",
+        description="Read preference: primary, primaryPreferred, secondary, secondaryPreferred or nearest"
+    )
+    CONSULTATION_QUEUE_MAX_SIZE: int = Field(
+        default=10000,
+        description="Consultation requests held in memory awaiting insert before submits get 503"
+    )
+    CONSULTATION_QUEUE_BATCH_SIZE: int = Field(
+        default=100,
+        description="Maximum consultation requests per insert_many"
+    )
+    CONSULTATION_JOURNAL_DIR: str = Field(
+        default="uploads/journal",
+        description="Directory for the consultation write-behind journal; must survive restarts"
+    )
+    EXPORT_BATCH_SIZE: int = Field(
+        default=500,
+        description="Default cursor batch size for streaming exports"
+    )
+    EXPORT_SETTLE_SECONDS: float = Field(
+        default=60.0,
+        description="Exports stop at requests inserted this long ago, so in-flight inserts are not skipped"
+    )
+    CONFIG_CHANGE_STREAMS: bool = Field(
+        default=True,
+        description="Follow the config collection with a change stream (replica sets only; else poll)"
+    )
+    CONFIG_POLL_INTERVAL_SECONDS: float = Field(
+        default=30.0,
+        description="Config collection poll interval, and change stream retry delay"
+    )
+
+    WARMUP_RETRY_MAX_SECONDS: float = Field(
+        default=60.0,
+        description="Longest backoff between retries of a failed startup step (indexes, seeding, config load)"
+    )
+    READINESS_INTERVAL_SECONDS: float = Field(
+        default=5.0,
+        description="How often the readiness probe pings Mongo and Redis in the background"
+    )
+    READINESS_TIMEOUT_SECONDS: float = Field(
+        default=1.0,
+        description="Per-dependency ping timeout of the readiness probe"
+    )
+
+    HEALTH_SAMPLE_INTERVAL_SECONDS: float = Field(
+        default=5.0,
+        description="How often system, process and event-loop metrics are sampled for /health/detailed"
+    )
+    HEALTH_SAMPLE_WINDOW: int = Field(
+        default=60,
+        description="Samples kept for /health/detailed window aggregates"
+    )
 
     # ============================================
     # Redis Settings (Optional)
@@ -36,6 +106,35 @@ class Settings(BaseSettings):
         description="Redis connection URL for caching"
     )
 
+    RESPONSE_CACHE_TTL_SECONDS: float = Field(
+        default=30.0,
+        description="TTL of the in-process response cache tier"
+    )
+    RESPONSE_CACHE_REDIS_TTL_SECONDS: int = Field(
+        default=300,
+        description="TTL of the Redis response cache tier (used when REDIS_URL is set)"
+    )
+    RESPONSE_CACHE_REDIS_RETRY_SECONDS: float = Field(
+        default=30.0,
+        description="How long the response cache skips Redis after failing to reach it"
+    )
+    RESPONSE_CACHE_MAX_ENTRIES: int = Field(
+        default=1024,
+        description="Maximum entries in the in-process response cache"
+    )
+    CACHE_CONTROL_PROJECTS: str = Field(
+        default="public, max-age=60, stale-while-revalidate=300",
+        description="Cache-Control for project, technology and facet reads"
+    )
+    CACHE_CONTROL_CONFIG: str = Field(
+        default="public, max-age=60",
+        description="Cache-Control for config reads backed by the database"
+    )
+    CACHE_CONTROL_FORM_OPTIONS: str = Field(
+        default="public, max-age=300, stale-while-revalidate=86400",
+        description="Cache-Control for form option routes (reloaded from the config collection)"
+    )
+
     # ============================================
     # Security Settings
     # ============================================
@@ -107,6 +206,18 @@ class Settings(BaseSettings):
         default=200,
         description="Maximum API requests per hour"
     )
+    RATE_LIMIT_MAX_KEYS: int = Field(
+        default=100_000,
+        description="Maximum keys held by an in-memory rate limit backend before LRU eviction"
+    )
+    RATE_LIMIT_APPROXIMATE: bool = Field(
+        default=False,
+        description="Without Redis, use the constant-memory sliding window counter instead of per-request timestamps"
+    )
+    RATE_LIMIT_SWEEP_INTERVAL_SECONDS: float = Field(
+        default=30.0,
+        description="Interval of the background sweeper expiring idle in-memory rate limit keys"
+    )
 
     # ============================================
     # Email Settings (Optional)
@@ -4,8 +4,10 @@ Supports Redis-backed distributed rate limiting for horizontal scaling,
 with automatic fallback to in-memory storage for local development.
 
 Architecture:
-  - Production: Redis sorted sets for sliding window counters (stateless services)
+  - Production: Redis sorted sets for sliding window counters (stateless services),
+    checked and recorded across all windows by one atomic Lua script (EVALSHA)
   - Development: In-memory defaultdict (single process, no persistence)
+  - Approximate: In-memory sliding window counter, constant state per key
   - Graceful degradation: If Redis connection fails, falls back to in-memory
 """
 
@@ -13,8 +15,9 @@ from fastapi import Request, HTTPException
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response
 import time
-from collections import defaultdict
-from typing import Dict, Tuple, Optional, Protocol
+import weakref
+from collections import OrderedDict, defaultdict
+from typing import Dict, Tuple, Optional, Protocol, Sequence
 import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime
@@ -22,6 +25,13 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+# In-process key table bounds (see InMemoryBackend)
+DEFAULT_MAX_KEYS = 100_000
+EXPIRY_BUCKET_SECONDS = 5
+
+# Live in-process backends, swept by run_sweeper() and reported by local_backend_stats()
+_local_backends: "weakref.WeakSet" = weakref.WeakSet()
+
 
 @dataclass
 class RateLimitConfig:
@@ -51,32 +61,196 @@ class InMemoryBackend:
     In-memory rate limit backend.
     Suitable for single-process development only.
     WARNING: State is lost on restart, not shared across workers.
+
+    The key table is bounded: once max_keys is reached the least recently
+    used key is evicted. Idle keys are expired by cleanup() through a
+    time-bucketed expiry wheel, so a sweep touches only keys that are due
+    instead of scanning the whole table.
     """
 
-    def __init__(self) -> None:
-        self._requests: Dict[str, list[float]] = defaultdict(list)
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS, bucket_seconds: int = EXPIRY_BUCKET_SECONDS) -> None:
+        self._requests: "OrderedDict[str, list[float]]" = OrderedDict()
+        self._max_keys = max_keys
+        self._bucket_seconds = bucket_seconds
+        # Expiry wheel: bucket index -> keys whose last request expires in it
+        self._wheel: Dict[int, set] = defaultdict(set)
+        self._key_bucket: Dict[str, int] = {}
+        self.evictions = 0
+        self.expirations = 0
+        _local_backends.add(self)
+
+    def _touch(self, key: str) -> list[float]:
+        """Get the key's timestamps, marking it most recently used."""
+        timestamps = self._requests.get(key)
+        if timestamps is None:
+            if len(self._requests) >= self._max_keys:
+                evicted, _ = self._requests.popitem(last=False)
+                self._unschedule(evicted)
+                self.evictions += 1
+            timestamps = self._requests[key] = []
+        else:
+            self._requests.move_to_end(key)
+        return timestamps
+
+    def _schedule(self, key: str, expires_at: float) -> None:
+        bucket = int(expires_at // self._bucket_seconds)
+        previous = self._key_bucket.get(key)
+        if previous == bucket:
+            return
+        if previous is not None:
+            self._wheel[previous].discard(key)
+        self._wheel[bucket].add(key)
+        self._key_bucket[key] = bucket
+
+    def _unschedule(self, key: str) -> None:
+        bucket = self._key_bucket.pop(key, None)
+        if bucket is not None:
+            self._wheel[bucket].discard(key)
 
     async def record_request(self, key: str, window_seconds: int) -> int:
         current_time = time.time()
         cutoff = current_time - window_seconds
-        self._requests[key] = [ts for ts in self._requests[key] if ts > cutoff]
-        self._requests[key].append(current_time)
-        return len(self._requests[key])
+        timestamps = [ts for ts in self._touch(key) if ts > cutoff]
+        timestamps.append(current_time)
+        self._requests[key] = timestamps
+        self._schedule(key, current_time + window_seconds)
+        return len(timestamps)
 
     async def get_count(self, key: str, window_seconds: int) -> int:
+        timestamps = self._requests.get(key)
+        if not timestamps:
+            return 0
         current_time = time.time()
         cutoff = current_time - window_seconds
-        self._requests[key] = [ts for ts in self._requests[key] if ts > cutoff]
-        return len(self._requests[key])
+        self._requests.move_to_end(key)
+        self._requests[key] = timestamps = [ts for ts in timestamps if ts > cutoff]
+        return len(timestamps)
+
+    async def cleanup(self) -> None:
+        """Remove keys whose most recent request has left its window."""
+        # Buckets strictly before the current one have fully expired
+        current_bucket = int(time.time() // self._bucket_seconds)
+        for bucket in [b for b in self._wheel if b < current_bucket]:
+            for key in self._wheel.pop(bucket):
+                del self._key_bucket[key]
+                self._requests.pop(key, None)
+                self.expirations += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Key table metrics."""
+        return {
+            "keys": len(self._requests),
+            "max_keys": self._max_keys,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+class SlidingWindowCounterBackend:
+    """
+    Approximate sliding-window counter with constant state per key.
+
+    Instead of one timestamp per request, each key keeps the request counts
+    of the current and previous fixed windows. The sliding count is
+    estimated as:
+        current + previous * (1 - elapsed_in_current_window / window_seconds)
+    which assumes requests in the previous window were evenly spread.
+
+    Memory and CPU per call stay flat no matter how many requests an IP
+    sends, at the cost of slight inaccuracy at window boundaries.
+    WARNING: Like InMemoryBackend, state is per process.
+
+    The key table is bounded the same way as InMemoryBackend's: at max_keys
+    the least recently used key is evicted, and cleanup() drops idle keys.
+    """
+
+    # Per-key state: [window_start, previous_count, current_count, window_seconds]
+    _START, _PREVIOUS, _CURRENT, _WINDOW = range(4)
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS) -> None:
+        self._windows: "OrderedDict[str, list]" = OrderedDict()
+        self._max_keys = max_keys
+        self.evictions = 0
+        self.expirations = 0
+        _local_backends.add(self)
+
+    def _roll(self, key: str, window_seconds: int, current_time: float) -> list:
+        """Get the key's state, advanced to the window containing current_time."""
+        window_start = current_time - (current_time % window_seconds)
+        state = self._windows.get(key)
+        if state is None:
+            if len(self._windows) >= self._max_keys:
+                self._windows.popitem(last=False)
+                self.evictions += 1
+            state = [window_start, 0, 0, window_seconds]
+            self._windows[key] = state
+            return state
+        self._windows.move_to_end(key)
+        if state[self._START] != window_start:
+            # The current window becomes the previous one only if adjacent
+            adjacent = window_start - state[self._START] <= window_seconds
+            state[self._PREVIOUS] = state[self._CURRENT] if adjacent else 0
+            state[self._CURRENT] = 0
+            state[self._START] = window_start
+        return state
+
+    def _estimate(self, state: list, window_seconds: int, current_time: float) -> int:
+        weight = 1.0 - (current_time - state[self._START]) / window_seconds
+        return state[self._CURRENT] + int(state[self._PREVIOUS] * weight)
+
+    async def record_request(self, key: str, window_seconds: int) -> int:
+        current_time = time.time()
+        state = self._roll(key, window_seconds, current_time)
+        state[self._CURRENT] += 1
+        return self._estimate(state, window_seconds, current_time)
+
+    async def get_count(self, key: str, window_seconds: int) -> int:
+        current_time = time.time()
+        state = self._windows.get(key)
+        if state is None:
+            return 0
+        state = self._roll(key, window_seconds, current_time)
+        return self._estimate(state, window_seconds, current_time)
 
     async def cleanup(self) -> None:
-        """Remove expired entries to prevent memory leaks."""
+        """Remove keys with no requests in the last two windows."""
         current_time = time.time()
-        hour_cutoff = current_time - 3600
-        for key in list(self._requests.keys()):
-            self._requests[key] = [ts for ts in self._requests[key] if ts > hour_cutoff]
-            if not self._requests[key]:
-                del self._requests[key]
+        for key, state in list(self._windows.items()):
+            if current_time - state[self._START] >= 2 * state[self._WINDOW]:
+                del self._windows[key]
+                self.expirations += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Key table metrics."""
+        return {
+            "keys": len(self._windows),
+            "max_keys": self._max_keys,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+
+# Atomic check-and-record across every window in one round trip.
+# KEYS: one sorted set per window
+# ARGV: now, member, then a (window_seconds, limit) pair per key
+# Returns the 1-based index of the first exhausted window, or 0 if recorded.
+CHECK_AND_RECORD_SCRIPT = """
+local now = tonumber(ARGV[1])
+local member = ARGV[2]
+for i, key in ipairs(KEYS) do
+    local window = tonumber(ARGV[1 + i * 2])
+    local limit = tonumber(ARGV[2 + i * 2])
+    redis.call('ZREMRANGEBYSCORE', key, '-inf', now - window)
+    if redis.call('ZCARD', key) >= limit then
+        return i
+    end
+end
+for i, key in ipairs(KEYS) do
+    redis.call('ZADD', key, now, member)
+    redis.call('EXPIRE', key, tonumber(ARGV[1 + i * 2]) + 1)
+end
+return 0
+"""
 
 
 class RedisBackend:
@@ -90,16 +264,27 @@ class RedisBackend:
       Member: unique request ID (timestamp with microseconds)
 
     TTL is set to window_seconds + 1 to auto-expire old keys.
+
+    With atomic=True (default) RateLimiter checks and records all windows
+    through check_and_record(): one EVALSHA instead of six pipelines.
     """
 
-    def __init__(self, redis_url: str) -> None:
+    def __init__(self, redis_url: str, atomic: bool = True, max_connections: int = 50) -> None:
         self._redis_url = redis_url
         self._redis = None
         self._connected = False
+        self._check_and_record_script = None
+        self._max_connections = max_connections
+        self._connect_lock = asyncio.Lock()
+        self.atomic = atomic
 
     async def _get_redis(self):
-        """Lazy-initialize Redis connection."""
-        if self._redis is None:
+        """Lazy-initialize the Redis client (one connection pool per backend)."""
+        if self._redis is not None:
+            return self._redis
+        async with self._connect_lock:
+            if self._redis is not None:
+                return self._redis
             try:
                 import redis.asyncio as aioredis
                 self._redis = aioredis.from_url(
@@ -109,6 +294,7 @@ class RedisBackend:
                     socket_connect_timeout=2,
                     socket_timeout=2,
                     retry_on_timeout=True,
+                    max_connections=self._max_connections,
                 )
                 await self._redis.ping()
                 self._connected = True
@@ -151,6 +337,28 @@ class RedisBackend:
 
         return results[1]
 
+    async def check_and_record(self, windows: Sequence[Tuple[str, int, int]]) -> int:
+        """
+        Check every (key, window_seconds, limit) and, if none is exhausted,
+        record the request in all of them — atomically, in one EVALSHA.
+
+        Returns the index of the first exhausted window, or -1 if recorded.
+        """
+        redis = await self._get_redis()
+        if self._check_and_record_script is None:
+            # register_script uses EVALSHA and reloads the script on NOSCRIPT
+            self._check_and_record_script = redis.register_script(CHECK_AND_RECORD_SCRIPT)
+
+        current_time = time.time()
+        args: list = [current_time, f"{current_time:.6f}"]
+        for _, window_seconds, limit in windows:
+            args.extend((window_seconds, limit))
+
+        exceeded = await self._check_and_record_script(
+            keys=[key for key, _, _ in windows], args=args
+        )
+        return int(exceeded) - 1
+
     async def cleanup(self) -> None:
         """Redis handles TTL-based cleanup automatically."""
         pass
@@ -161,16 +369,60 @@ class RedisBackend:
             await self._redis.close()
 
 
-def create_backend(redis_url: Optional[str] = None) -> InMemoryBackend | RedisBackend:
+def create_backend(
+    redis_url: Optional[str] = None,
+    atomic: bool = True,
+    approximate: bool = False,
+    max_keys: int = DEFAULT_MAX_KEYS,
+) -> InMemoryBackend | SlidingWindowCounterBackend | RedisBackend:
     """
     Factory for rate limit backend.
     Uses Redis if REDIS_URL is configured, otherwise falls back to in-memory.
+    With approximate=True the in-memory fallback is the constant-memory
+    sliding window counter instead of per-request timestamps.
     """
     if redis_url:
         logger.info(f"Using Redis-backed rate limiter")
-        return RedisBackend(redis_url)
+        return RedisBackend(redis_url, atomic=atomic)
+    if approximate:
+        logger.info("Using in-memory sliding window counter rate limiter")
+        return SlidingWindowCounterBackend(max_keys=max_keys)
     logger.info("Using in-memory rate limiter (development mode)")
-    return InMemoryBackend()
+    return InMemoryBackend(max_keys=max_keys)
+
+
+# =====================================================
+# IN-PROCESS BACKEND MAINTENANCE
+# =====================================================
+
+async def run_sweeper(interval_seconds: float = 30.0) -> None:
+    """
+    Periodically expire idle keys in every live in-process backend.
+    Runs until cancelled; start it from the app lifecycle hooks.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        for backend in list(_local_backends):
+            try:
+                await backend.cleanup()
+            except Exception as e:
+                logger.warning(f"Rate limit backend sweep failed: {e}")
+
+
+def start_sweeper(interval_seconds: float = 30.0) -> asyncio.Task:
+    """Schedule run_sweeper() on the running event loop."""
+    return asyncio.create_task(run_sweeper(interval_seconds), name="rate-limit-sweeper")
+
+
+def local_backend_stats() -> Dict[str, int]:
+    """Aggregate key table metrics across live in-process backends."""
+    totals = {"backends": 0, "keys": 0, "evictions": 0, "expirations": 0}
+    for backend in list(_local_backends):
+        totals["backends"] += 1
+        for name, value in backend.stats().items():
+            if name in totals:
+                totals[name] += value
+    return totals
 
 
 class RateLimiter:
@@ -182,11 +434,15 @@ class RateLimiter:
     def __init__(
         self,
         config: Optional[RateLimitConfig] = None,
-        backend: Optional[InMemoryBackend | RedisBackend] = None,
+        backend: Optional[InMemoryBackend | SlidingWindowCounterBackend | RedisBackend] = None,
+        key_prefix: str = "rl",
     ):
         self.config = config or RateLimitConfig()
         self._backend = backend or InMemoryBackend()
         self._fallback_backend = InMemoryBackend()
+        # Limiters sharing a backend need distinct prefixes to keep separate quotas
+        self._key_prefix = key_prefix
+        self._atomic_failure_logged = False
 
     def _get_client_ip(self, request: Request) -> str:
         """Extract client IP from request, handling proxies."""
@@ -215,6 +471,30 @@ class RateLimiter:
                 return await self._fallback_backend.record_request(key, window)
             return await self._fallback_backend.get_count(key, window)
 
+    async def _check_and_record(self, windows: Sequence[Tuple[str, int, int]]) -> int:
+        """
+        Check all (key, window_seconds, limit) windows in order and record the
+        request in every window if none is exhausted.
+        Returns the index of the first exhausted window, or -1 if recorded.
+        """
+        if getattr(self._backend, "atomic", False):
+            try:
+                return await self._backend.check_and_record(windows)
+            except Exception as e:
+                # Graceful degradation: the sequential path below falls back too
+                if not self._atomic_failure_logged:
+                    logger.warning(f"Atomic rate limit check failed, using sequential checks: {e!r}")
+                    self._atomic_failure_logged = True
+
+        for index, (key, window, limit) in enumerate(windows):
+            if await self._backend_with_fallback(key, window) >= limit:
+                return index
+
+        for key, window, _ in windows:
+            await self._backend_with_fallback(key, window, record=True)
+
+        return -1
+
     async def check_rate_limit(self, request: Request) -> Tuple[bool, Optional[str], Optional[int]]:
         """
         Check if request should be rate limited.
@@ -232,28 +512,22 @@ class RateLimiter:
         if ip in self.config.blacklist_ips:
             return False, "IP address blocked", None
 
-        # Check burst limit
-        burst_key = f"rl:{ip}:burst"
-        burst_count = await self._backend_with_fallback(burst_key, self.config.burst_window_seconds)
-        if burst_count >= self.config.burst_limit:
-            return False, "Too many requests. Please slow down.", self.config.burst_window_seconds
-
-        # Check per-minute limit
-        minute_key = f"rl:{ip}:min"
-        minute_count = await self._backend_with_fallback(minute_key, 60)
-        if minute_count >= self.config.requests_per_minute:
-            return False, f"Rate limit exceeded. Maximum {self.config.requests_per_minute} requests per minute.", 60
-
-        # Check per-hour limit
-        hour_key = f"rl:{ip}:hour"
-        hour_count = await self._backend_with_fallback(hour_key, 3600)
-        if hour_count >= self.config.requests_per_hour:
-            return False, f"Hourly limit exceeded. Maximum {self.config.requests_per_hour} requests per hour.", 3600
-
-        # Record the request across all windows
-        await self._backend_with_fallback(burst_key, self.config.burst_window_seconds, record=True)
-        await self._backend_with_fallback(minute_key, 60, record=True)
-        await self._backend_with_fallback(hour_key, 3600, record=True)
+        # Burst, per-minute and per-hour windows, checked in this order
+        windows = [
+            (f"{self._key_prefix}:{ip}:burst", self.config.burst_window_seconds, self.config.burst_limit),
+            (f"{self._key_prefix}:{ip}:min", 60, self.config.requests_per_minute),
+            (f"{self._key_prefix}:{ip}:hour", 3600, self.config.requests_per_hour),
+        ]
+        denials = [
+            ("Too many requests. Please slow down.", self.config.burst_window_seconds),
+            (f"Rate limit exceeded. Maximum {self.config.requests_per_minute} requests per minute.", 60),
+            (f"Hourly limit exceeded. Maximum {self.config.requests_per_hour} requests per hour.", 3600),
+        ]
+
+        exceeded = await self._check_and_record(windows)
+        if exceeded >= 0:
+            message, retry_after = denials[exceeded]
+            return False, message, retry_after
 
         return True, None, None
 
@@ -261,8 +535,8 @@ class RateLimiter:
         """Get remaining request counts for an IP."""
         ip = self._get_client_ip(request)
 
-        minute_count = await self._backend_with_fallback(f"rl:{ip}:min", 60)
-        hour_count = await self._backend_with_fallback(f"rl:{ip}:hour", 3600)
+        minute_count = await self._backend_with_fallback(f"{self._key_prefix}:{ip}:min", 60)
+        hour_count = await self._backend_with_fallback(f"{self._key_prefix}:{ip}:hour", 3600)
 
         return {
             "remaining_per_minute": max(0, self.config.requests_per_minute - minute_count),
@@ -281,9 +555,11 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         config: Optional[RateLimitConfig] = None,
         redis_url: Optional[str] = None,
         exclude_paths: Optional[list] = None,
+        approximate: bool = False,
+        max_keys: int = DEFAULT_MAX_KEYS,
     ):
         super().__init__(app)
-        backend = create_backend(redis_url)
+        backend = create_backend(redis_url, approximate=approximate, max_keys=max_keys)
         self.limiter = RateLimiter(config, backend)
         self.exclude_paths = exclude_paths or [
             "/api/v1/health",
@@ -338,18 +614,53 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 # =====================================================
 
 class EndpointRateLimiter:
-    """Rate limiter for specific endpoints with different limits."""
+    """
+    Rate limiter for specific endpoints with different limits.
 
-    def __init__(self, redis_url: Optional[str] = None):
+    All endpoint limiters share one backend — and so one Redis connection
+    pool — and keep separate quotas through per-endpoint key prefixes.
+    """
+
+    def __init__(self, redis_url: Optional[str] = None, max_keys: int = DEFAULT_MAX_KEYS,
+                 approximate: bool = False):
         self._redis_url = redis_url
+        self._backend = create_backend(redis_url, approximate=approximate, max_keys=max_keys)
         self.limiters: Dict[str, RateLimiter] = {}
 
     def get_limiter(self, endpoint: str, config: Optional[RateLimitConfig] = None) -> RateLimiter:
         """Get or create a rate limiter for an endpoint."""
-        if endpoint not in self.limiters:
-            backend = create_backend(self._redis_url)
-            self.limiters[endpoint] = RateLimiter(config, backend)
-        return self.limiters[endpoint]
+        limiter = self.limiters.get(endpoint)
+        if limiter is None:
+            limiter = RateLimiter(config, self._backend, key_prefix=f"rl:{endpoint}")
+            self.limiters[endpoint] = limiter
+        return limiter
+
+    async def close(self) -> None:
+        """Release the shared backend connection."""
+        if isinstance(self._backend, RedisBackend):
+            await self._backend.close()
+
+
+# Process-wide registry used by the endpoint dependencies below
+_endpoint_rate_limiter: Optional[EndpointRateLimiter] = None
+
+
+def configure_endpoint_rate_limiter(
+    redis_url: Optional[str] = None,
+    max_keys: int = DEFAULT_MAX_KEYS,
+    approximate: bool = False,
+) -> EndpointRateLimiter:
+    """Replace the process-wide registry; call once at startup."""
+    global _endpoint_rate_limiter
+    _endpoint_rate_limiter = EndpointRateLimiter(redis_url, max_keys=max_keys, approximate=approximate)
+    return _endpoint_rate_limiter
+
+
+def get_endpoint_rate_limiter() -> EndpointRateLimiter:
+    """Get the process-wide registry, creating an in-memory one if unconfigured."""
+    if _endpoint_rate_limiter is None:
+        return configure_endpoint_rate_limiter()
+    return _endpoint_rate_limiter
 
 
 # Pre-configured rate limit settings for different endpoints
@@ -375,10 +686,8 @@ CONFIG_RATE_LIMIT = RateLimitConfig(
 )
 
 
-# Dependency for use in FastAPI routes
-async def check_pricing_rate_limit(request: Request) -> bool:
-    """Dependency to check rate limit for pricing endpoints."""
-    limiter = RateLimiter(PRICING_RATE_LIMIT)
+async def _enforce_rate_limit(limiter: RateLimiter, request: Request) -> bool:
+    """Raise 429 if the limiter denies the request."""
     allowed, error_message, retry_after = await limiter.check_rate_limit(request)
 
     if not allowed:
@@ -395,20 +704,14 @@ async def check_pricing_rate_limit(request: Request) -> bool:
     return True
 
 
-async def check_upload_rate_limit(request: Request) -> bool:
-    """Dependency to check rate limit for upload endpoints."""
-    limiter = RateLimiter(UPLOAD_RATE_LIMIT)
-    allowed, error_message, retry_after = await limiter.check_rate_limit(request)
+# Dependency for use in FastAPI routes
+async def check_pricing_rate_limit(request: Request) -> bool:
+    """Dependency to check rate limit for pricing endpoints."""
+    limiter = get_endpoint_rate_limiter().get_limiter("pricing", PRICING_RATE_LIMIT)
+    return await _enforce_rate_limit(limiter, request)
 
-    if not allowed:
-        raise HTTPException(
-            status_code=429,
-            detail={
-                "error": True,
-                "message": error_message,
-                "retry_after": retry_after
-            },
-            headers={"Retry-After": str(retry_after) if retry_after else "60"}
-        )
 
-    return True
+async def check_upload_rate_limit(request: Request) -> bool:
+    """Dependency to check rate limit for upload endpoints."""
+    limiter = get_endpoint_rate_limiter().get_limiter("upload", UPLOAD_RATE_LIMIT)
+    return await _enforce_rate_limit(limiter, request)
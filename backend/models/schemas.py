@@ -16,7 +16,7 @@ Naming Convention:
 """
 
 from pydantic import BaseModel, Field, ConfigDict, field_validator
-from typing import Optional, List, Any, Generic, TypeVar
+from typing import Optional, List, Any, Dict, Generic, Literal, TypeVar
 from datetime import datetime, timezone
 from enum import Enum
 
@@ -94,6 +94,7 @@ class PaginatedResponse(SchemaVersionMixin):
     page: int
     per_page: int
     pages: int
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for the next page; null on the last page")
     timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
@@ -124,6 +125,26 @@ class FormConfigResponse(SchemaVersionMixin):
     updated_at: datetime
 
 
+class FormOptions(BaseModel):
+    """
+    Option tables behind the quote form and engine, as stored in the
+    `form.options` config document's data. Missing tables keep their
+    defaults from api/config_routes.py.
+    """
+    model_config = ConfigDict(extra="ignore")
+
+    finishes: List[ConfigOption]
+    colors: List[ConfigOption]
+    layers: List[ConfigOption]
+    thicknesses: List[ConfigOption]
+    copper_weights: List[ConfigOption]
+    stencils: List[ConfigOption]
+    sourcing_options: List[ConfigOption]
+    limits: Dict[str, Dict[str, Any]]
+    lead_times: Dict[str, Dict[str, Any]]
+    tolerances: Dict[str, Dict[str, float]]
+
+
 # Type aliases used by config_routes.py imports
 SurfaceFinish = ConfigOption
 SolderMaskColor = ConfigOption
@@ -131,6 +152,109 @@ StencilType = ConfigOption
 SourcingType = ConfigOption
 
 
+# =====================================================
+# QUOTE MODELS
+# =====================================================
+
+class PCBQuoteOptions(BaseModel):
+    """
+    PCB fabrication and SMT assembly options for a single quote.
+    Numeric bounds mirror FORM_LIMITS in api/config_routes.py.
+    """
+    model_config = ConfigDict(extra="ignore")
+
+    quantity: int = Field(default=50, ge=1, le=100000)
+    layers: Literal[1, 2, 4, 6, 8, 10, 12] = 2
+    thickness_mm: float = Field(default=1.6, ge=0.4, le=2.4)
+    copper_oz: float = Field(default=1, ge=0.5, le=3)
+    finish: str = "HASL"
+    solder_mask_color: str = "green"
+    min_track_space_mm: float = Field(default=0.15, ge=0.075, le=1.0)
+    impedance_controlled: bool = False
+    e_test: bool = True
+    board_width_mm: float = Field(default=100, ge=5, le=500)
+    board_height_mm: float = Field(default=80, ge=5, le=500)
+
+    assembly_required: bool = False
+    sides: Literal["single", "double"] = "single"
+    component_count: int = Field(default=0, ge=0, le=10000)
+    unique_parts: int = Field(default=0, ge=0, le=1000)
+    bga_count: int = Field(default=0, ge=0, le=500)
+    uses_01005: bool = False
+    stencil: str = "none"
+    inspection_aoi: bool = True
+    inspection_xray: bool = False
+    sourcing: str = "turnkey"
+
+    lead_time: str = "standard"
+
+
+class QuoteBreakdown(BaseModel):
+    """Cost components of a quote"""
+    pcb: float
+    smt: float
+    stencil: float
+    lead_time: float
+
+
+class QuoteResult(BaseModel):
+    """Priced result for a single option set"""
+    total: float
+    unit_price: float
+    quantity: int
+    currency: str
+    lead_time_days: Optional[str] = None
+    breakdown: QuoteBreakdown
+    warnings: List[str] = Field(default_factory=list)
+
+
+class DFMAnalysis(BaseModel):
+    """Design-for-manufacturing score derived from the quote rules"""
+    score: int
+    grade: str
+    issues: List[str] = Field(default_factory=list)
+
+
+class QuoteResponse(SchemaVersionMixin):
+    """Single quote response envelope"""
+    success: bool = True
+    data: QuoteResult
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class QuoteAnalysisResponse(QuoteResponse):
+    """Quote plus DFM analysis"""
+    dfm_analysis: DFMAnalysis
+
+
+class QuotePriceBreak(BaseModel):
+    """Unit price at a volume break"""
+    quantity: int
+    unit_price: float
+
+
+class QuoteCurve(BaseModel):
+    """Price-vs-quantity curve for one option set (parallel arrays)"""
+    currency: str
+    lead_time_days: Optional[str] = None
+    quantities: List[int]
+    total: List[float]
+    unit_price: List[float]
+    price_breaks: List[QuotePriceBreak]
+
+
+class QuoteCurveResponse(SchemaVersionMixin):
+    """Price-break curve response envelope"""
+    success: bool = True
+    data: QuoteCurve
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+
+class QuoteBatchRequest(BaseModel):
+    """Many option sets priced in a single call"""
+    items: List[PCBQuoteOptions] = Field(..., min_length=1, max_length=10000)
+
+
 # =====================================================
 # V1 DOMAIN MODELS — Pinned to schema version 1
 # =====================================================
@@ -175,6 +299,25 @@ class V1ProjectDetail(SchemaVersionMixin):
     updated_at: Optional[str] = None
 
 
+class V1ProjectListItem(BaseModel):
+    """Lightweight project item for list views (v1)"""
+    model_config = ConfigDict(extra="ignore")
+
+    id: str
+    slug: str
+    title: str
+    title_en: Optional[str] = None
+    subtitle: str
+    subtitle_en: Optional[str] = None
+    thumbnail: Optional[str] = None
+    hero_image: Optional[str] = None
+    client_industry: str
+    client_industry_en: Optional[str] = None
+    technologies: List[str] = Field(default_factory=list)
+    featured: bool = False
+    order: int = 0
+
+
 class V1InfoRequest(SchemaVersionMixin):
     """Consultation request response (v1)"""
     model_config = ConfigDict(extra="ignore")
@@ -208,5 +351,6 @@ class V1StatusCheck(SchemaVersionMixin):
 
 ProjectPhase = V1ProjectPhase
 ProjectDetail = V1ProjectDetail
+ProjectListItem = V1ProjectListItem
 InfoRequest = V1InfoRequest
 StatusCheck = V1StatusCheck
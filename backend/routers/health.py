@@ -2,28 +2,51 @@
 Health Check Router - System health and monitoring endpoints.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from typing import Dict, Any
 from datetime import datetime
 import platform
-import psutil
 import os
 
-from config import settings, logger
+from config import settings
+from middleware.rate_limiter import local_backend_stats
+from services.health_sampler import HealthSampler
+from services.mongo import mongo
+from services.readiness import ReadinessProbe, RedisPing
+from services.startup_profile import startup_profile
 
 router = APIRouter(prefix="/api/v1", tags=["Health & Monitoring"])
 
 
+# Fills /health/detailed in the background (started and stopped with the app)
+health_sampler = HealthSampler(settings.HEALTH_SAMPLE_INTERVAL_SECONDS, settings.HEALTH_SAMPLE_WINDOW)
+
+
+async def ping_mongo() -> None:
+    await mongo.db.command("ping")
+
+
+# Pinged in the background (started and stopped with the app); Redis is
+# optional, so it is reported but does not gate readiness
+readiness = ReadinessProbe(settings.READINESS_INTERVAL_SECONDS, settings.READINESS_TIMEOUT_SECONDS)
+readiness.add("mongo", ping_mongo)
+if settings.redis_enabled:
+    readiness.add("redis", RedisPing(settings.REDIS_URL, settings.READINESS_TIMEOUT_SECONDS), required=False)
+
+
 @router.get("/health")
 async def health_check() -> Dict[str, Any]:
     """
     Basic health check endpoint.
-    Returns 200 if the service is running.
+    Returns 200 if the service is running; `startup` reports how long this
+    worker took to serve and which startup phases have run.
     """
     return {
         "status": "healthy",
         "service": "aico-backend",
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": datetime.utcnow().isoformat(),
+        "startup": startup_profile.report()
     }
 
 
@@ -31,90 +54,67 @@ async def health_check() -> Dict[str, Any]:
 async def detailed_health_check() -> Dict[str, Any]:
     """
     Detailed health check with system metrics.
-    Useful for monitoring and debugging.
+    Useful for monitoring and debugging. Metrics come from the background
+    sampler (latest sample plus window aggregates), so this does no I/O;
+    they are null until the first sample has been taken.
     """
-    try:
-        # System info
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-
-        return {
-            "status": "healthy",
-            "service": "aico-backend",
-            "environment": settings.ENVIRONMENT,
-            "timestamp": datetime.utcnow().isoformat(),
-            "system": {
-                "platform": platform.system(),
-                "platform_version": platform.version(),
-                "python_version": platform.python_version(),
-                "cpu_count": psutil.cpu_count(),
-                "cpu_percent": psutil.cpu_percent(interval=0.1),
-            },
-            "memory": {
-                "total_gb": round(memory.total / (1024**3), 2),
-                "available_gb": round(memory.available / (1024**3), 2),
-                "used_percent": memory.percent
-            },
-            "disk": {
-                "total_gb": round(disk.total / (1024**3), 2),
-                "free_gb": round(disk.free / (1024**3), 2),
-                "used_percent": round((disk.used / disk.total) * 100, 1)
-            },
-            "config": {
-                "debug": settings.DEBUG,
-                "redis_enabled": settings.redis_enabled,
-                "s3_enabled": settings.s3_enabled
-            }
-        }
-
-    except Exception as e:
-        logger.error(f"Health check error: {str(e)}")
-        return {
-            "status": "degraded",
-            "error": str(e),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+    sample = health_sampler.latest or {}
+    return {
+        "status": "healthy",
+        "service": "aico-backend",
+        "environment": settings.ENVIRONMENT,
+        "timestamp": datetime.utcnow().isoformat(),
+        "system": {
+            "platform": platform.system(),
+            "platform_version": platform.version(),
+            "python_version": platform.python_version(),
+            "cpu_count": os.cpu_count(),
+            "cpu_percent": sample.get("cpu_percent"),
+        },
+        "memory": {
+            "total_gb": sample.get("memory_total_gb"),
+            "available_gb": sample.get("memory_available_gb"),
+            "used_percent": sample.get("memory_used_percent")
+        },
+        "disk": {
+            "total_gb": sample.get("disk_total_gb"),
+            "free_gb": sample.get("disk_free_gb"),
+            "used_percent": sample.get("disk_used_percent")
+        },
+        "process": {
+            "rss_mb": sample.get("process_rss_mb"),
+            "cpu_percent": sample.get("process_cpu_percent"),
+            "open_files": sample.get("open_files"),
+            "event_loop_lag_ms": sample.get("loop_lag_ms")
+        },
+        "sampling": health_sampler.report(),
+        "config": {
+            "debug": settings.DEBUG,
+            "redis_enabled": settings.redis_enabled,
+            "s3_enabled": settings.s3_enabled
+        },
+        "rate_limiter": local_backend_stats(),
+        "mongo_pool": mongo.stats()
+    }
 
 
 @router.get("/health/ready")
-async def readiness_check() -> Dict[str, Any]:
+async def readiness_check():
     """
     Readiness check for Kubernetes.
-    Checks if the service is ready to accept traffic.
+    Serves the last background ping of each dependency (no I/O here);
+    503 until Mongo has answered within the timeout, or if the results
+    are stale.
     """
-    checks = {
-        "database": False,
-        "cache": None,  # Optional
+    report = readiness.report()
+    body = {
+        "status": "ready" if report["ready"] else "not_ready",
+        **report,
+        "timestamp": datetime.utcnow().isoformat()
     }
-
-    try:
-        # Check MongoDB connection
-        # In production, actually ping the database
-        checks["database"] = True
-
-        # Check Redis if configured
-        if settings.redis_enabled:
-            # In production, ping Redis
-            checks["cache"] = True
-
-        all_ready = checks["database"]
-
-        return {
-            "status": "ready" if all_ready else "not_ready",
-            "checks": checks,
-            "timestamp": datetime.utcnow().isoformat()
-        }
-
-    except Exception as e:
-        logger.error(f"Readiness check error: {str(e)}")
-        raise HTTPException(
-            status_code=503,
-            detail={
-                "status": "not_ready",
-                "error": str(e),
-                "checks": checks
-            }
-        )
+    if not report["ready"]:
+        return JSONResponse(status_code=503, content=body)
+    return body
 
 
 @router.get("/health/live")
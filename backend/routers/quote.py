@@ -0,0 +1,71 @@
+"""
+Quote Router - PCB fabrication and SMT assembly pricing endpoints.
+"""
+
+from fastapi import APIRouter, Depends, Query
+from typing import Dict, Any
+
+from middleware.rate_limiter import check_pricing_rate_limit
+from models.schemas import (
+    PCBQuoteOptions, QuoteBatchRequest, QuoteResponse, QuoteAnalysisResponse,
+    QuoteCurveResponse,
+)
+from services.quote_engine import CURVE_DEFAULT_POINTS, QuoteEngine, get_quote_engine
+
+router = APIRouter(
+    prefix="/api/v1/quote",
+    tags=["Quote"],
+    dependencies=[Depends(check_pricing_rate_limit)],
+)
+
+
+@router.post("/calculate", response_model=QuoteResponse)
+async def calculate_quote(
+    options: PCBQuoteOptions,
+    engine: QuoteEngine = Depends(get_quote_engine),
+) -> Dict[str, Any]:
+    """
+    Calculate a quote for a single option set.
+    Returns totals, cost breakdown and manufacturability warnings.
+    """
+    return {"success": True, "data": engine.quote(options)}
+
+
+@router.post("/complete-analysis", response_model=QuoteAnalysisResponse)
+async def complete_analysis(
+    options: PCBQuoteOptions,
+    engine: QuoteEngine = Depends(get_quote_engine),
+) -> Dict[str, Any]:
+    """
+    Calculate a quote together with a DFM score and grade.
+    """
+    result = engine.quote(options, analysis=True)
+    dfm_analysis = result.pop("dfm_analysis")
+    return {"success": True, "data": result, "dfm_analysis": dfm_analysis}
+
+
+@router.post("/calculate-batch")
+async def calculate_quote_batch(
+    batch: QuoteBatchRequest,
+    engine: QuoteEngine = Depends(get_quote_engine),
+) -> Dict[str, Any]:
+    """
+    Price up to 10,000 option sets in one call.
+    All items are priced together as NumPy columns; results keep input order.
+    No response_model: re-validating 10k results would cost more than pricing them.
+    """
+    items = engine.quote_many(batch.items)
+    return {"success": True, "count": len(items), "items": items}
+
+
+@router.post("/curve", response_model=QuoteCurveResponse)
+async def get_quote_curve(
+    options: PCBQuoteOptions,
+    points: int = Query(CURVE_DEFAULT_POINTS, ge=10, le=2000),
+    engine: QuoteEngine = Depends(get_quote_engine),
+) -> Dict[str, Any]:
+    """
+    Price-break curve across the full quantity range for one option set.
+    Replaces one calculate call per chart point; `quantity` in the body is ignored.
+    """
+    return {"success": True, "data": engine.price_curve(options, points)}
@@ -3,6 +3,13 @@ Seed data for Projects collection
 This file contains sample engineering projects for the portfolio
 """
 
+import hashlib
+import json
+import uuid
+from datetime import datetime, timezone
+
+from pymongo import UpdateOne
+
 SAMPLE_PROJECTS = [
     {
         "slug": "yuksek-hizli-fpga-karti",
@@ -257,59 +264,116 @@ SITE_CONFIG = {
 }
 
 
+# Seeded documents carry a hash of their seed content, so a restart only
+# writes what changed since the last deploy.
+SEED_HASH_FIELD = "seed_hash"
+SEED_LOCK = "seed_config"
+SEED_LOCK_TTL_SECONDS = 300
+SEED_LOCK_POLL_SECONDS = 0.5
+
+
+def content_hash(doc) -> str:
+    """Stable hash of a seed document (key order does not matter)."""
+    body = json.dumps(doc, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(body.encode(), digest_size=16).hexdigest()
+
+
+def changed_seeds(seeds, key_field, stored_hashes):
+    """(seed, hash) for each seed whose content differs from what was last seeded."""
+    changed = []
+    for seed in seeds:
+        digest = content_hash(seed)
+        if stored_hashes.get(seed[key_field]) != digest:
+            changed.append((seed, digest))
+    return changed
+
+
+def seed_upsert(seed, key_field, digest, now):
+    """Upsert of one seed; fields it does not own (id, created_at) are only set on insert."""
+    return UpdateOne(
+        {key_field: seed[key_field]},
+        {
+            "$set": {**seed, SEED_HASH_FIELD: digest, "updated_at": now},
+            "$setOnInsert": {"id": str(uuid.uuid4()), "created_at": now},
+        },
+        upsert=True,
+    )
+
+
 async def seed_config(db):
-    """Seed the database with portfolio data"""
-    from datetime import datetime, timezone
-    import uuid
-
-    # Seed site configuration
-    existing_config = await db.config.find_one({"key": "site.config"})
-    if not existing_config:
-        config_doc = {
-            "id": str(uuid.uuid4()),
-            "key": SITE_CONFIG["key"],
-            "enabled": SITE_CONFIG["enabled"],
-            "data": SITE_CONFIG["data"],
-            "created_at": datetime.now(timezone.utc).isoformat(),
-            "updated_at": datetime.now(timezone.utc).isoformat()
+    """
+    Seed the database with portfolio data.
+    One worker seeds under a leader lock; the others wait for it to finish
+    and skip. Returns {"config": n, "projects": m}, the number of documents
+    of each kind written, or None if skipped.
+    """
+    from api.config_routes import DEFAULT_FORM_OPTIONS, FORM_OPTIONS_KEY
+    from services.leader_lock import leader_lock, wait_released
+    from services.project_facets import FACET_FIELDS, FACETS_COLLECTION, apply_project_changes, rebuild_facets
+
+    async with leader_lock(db, SEED_LOCK, SEED_LOCK_TTL_SECONDS) as leader:
+        if not leader:
+            # Callers load config and project caches next: not before the seed is in
+            print("Database seeding skipped: waiting for the worker that is seeding")
+            await wait_released(db, SEED_LOCK, SEED_LOCK_POLL_SECONDS)
+            return None
+
+        now = datetime.now(timezone.utc).isoformat()
+
+        # Facet counts are maintained incrementally once materialized;
+        # if they never were, rebuild them from scratch after seeding.
+        facets_ready = await db[FACETS_COLLECTION].estimated_document_count() > 0
+
+        # Site configuration; form options are edited in place at runtime,
+        # so they are only inserted when missing and never hashed
+        stored_config = await db.config.find(
+            {"key": {"$in": [SITE_CONFIG["key"], FORM_OPTIONS_KEY]}},
+            {"_id": 0, "key": 1, SEED_HASH_FIELD: 1},
+        ).to_list(None)
+        config_hashes = {doc["key"]: doc.get(SEED_HASH_FIELD) for doc in stored_config}
+        config_ops = [
+            seed_upsert(seed, "key", digest, now)
+            for seed, digest in changed_seeds([SITE_CONFIG], "key", config_hashes)
+        ]
+        if FORM_OPTIONS_KEY not in config_hashes:
+            config_ops.append(UpdateOne(
+                {"key": FORM_OPTIONS_KEY},
+                {"$setOnInsert": {
+                    "id": str(uuid.uuid4()),
+                    "key": FORM_OPTIONS_KEY,
+                    "enabled": True,
+                    "data": DEFAULT_FORM_OPTIONS.model_dump(),
+                    "created_at": now,
+                    "updated_at": now
+                }},
+                upsert=True,
+            ))
+        if config_ops:
+            await db.config.bulk_write(config_ops, ordered=False)
+
+        # Sample projects: one query for the stored hashes (and the facet
+        # fields, to adjust counts), one bulk_write for what changed
+        facet_fields = {field: 1 for field, _ in FACET_FIELDS.values()}
+        stored_projects = {
+            doc["slug"]: doc
+            for doc in await db.projects.find(
+                {"slug": {"$in": [project["slug"] for project in SAMPLE_PROJECTS]}},
+                {"_id": 0, "slug": 1, SEED_HASH_FIELD: 1, **facet_fields},
+            ).to_list(None)
         }
-        await db.config.insert_one(config_doc)
-        print(f"Seeded site config: {SITE_CONFIG['key']}")
-    else:
-        await db.config.update_one(
-            {"key": "site.config"},
-            {
-                "$set": {
-                    "data": SITE_CONFIG["data"],
-                    "updated_at": datetime.now(timezone.utc).isoformat()
-                }
-            }
-        )
-        print(f"Updated site config: {SITE_CONFIG['key']}")
-
-    # Seed sample projects
-    for project in SAMPLE_PROJECTS:
-        existing_project = await db.projects.find_one({"slug": project["slug"]})
-        if not existing_project:
-            project_doc = {
-                "id": str(uuid.uuid4()),
-                **project,
-                "created_at": datetime.now(timezone.utc).isoformat(),
-                "updated_at": datetime.now(timezone.utc).isoformat()
-            }
-            await db.projects.insert_one(project_doc)
-            print(f"Seeded project: {project['title']}")
-        else:
-            # Update existing project
-            await db.projects.update_one(
-                {"slug": project["slug"]},
-                {
-                    "$set": {
-                        **{k: v for k, v in project.items() if k != "slug"},
-                        "updated_at": datetime.now(timezone.utc).isoformat()
-                    }
-                }
-            )
-            print(f"Updated project: {project['title']}")
-
-    print("Database seeding completed!")
+        project_hashes = {slug: doc.get(SEED_HASH_FIELD) for slug, doc in stored_projects.items()}
+        changed = changed_seeds(SAMPLE_PROJECTS, "slug", project_hashes)
+        project_ops = [seed_upsert(project, "slug", digest, now) for project, digest in changed]
+        if project_ops:
+            await db.projects.bulk_write(project_ops, ordered=False)
+            if facets_ready:
+                await apply_project_changes(db, [
+                    (stored_projects.get(project["slug"]), {**stored_projects.get(project["slug"], {}), **project})
+                    for project, _ in changed
+                ])
+
+        if not facets_ready:
+            await rebuild_facets(db)
+
+    print(f"Database seeding completed: {len(config_ops)} config and {len(project_ops)} project documents written")
+    return {"config": len(config_ops), "projects": len(project_ops)}
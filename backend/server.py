@@ -1,31 +1,88 @@
+# First, so the startup profile's clock includes the imports below
+from services.startup_profile import startup_profile
+
 from dotenv import load_dotenv
 load_dotenv()
 
-from fastapi import FastAPI, APIRouter, HTTPException, Request
+from fastapi import FastAPI, APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
+import asyncio
 import os
 import re
 import logging
+import time
 from pathlib import Path
 from pydantic import BaseModel, Field, ConfigDict, field_validator
-from typing import List, Optional
+from contextlib import asynccontextmanager
+from typing import List, Literal, Optional
 import uuid
 from datetime import datetime, timezone
-import bleach
 
 # Import seed data for projects
-from seed_data import seed_config
+from seed_data import SEED_HASH_FIELD, seed_config
+
+# Modular routers
+from api import config_router
+from api.config_routes import config_store
+from config import settings
+from middleware.rate_limiter import (
+    check_pricing_rate_limit, configure_endpoint_rate_limiter, get_endpoint_rate_limiter,
+    start_sweeper,
+)
+from models.schemas import (
+    PaginatedResponse, PCBQuoteOptions, ProjectListItem, QuoteBatchRequest, QuoteResponse,
+    QuoteAnalysisResponse, QuoteCurveResponse,
+)
+from routers.health import health_check, health_sampler, readiness, router as health_router
+from routers.quote import (
+    router as quote_router, calculate_quote, complete_analysis, calculate_quote_batch,
+    get_quote_curve,
+)
+from services.quote_engine import CURVE_DEFAULT_POINTS, get_quote_engine
+from services.consultation_export import EXPORT_FORMATS, export_consultations
+from services.db_indexes import ensure_indexes
+from services.pagination import DEFAULT_PER_PAGE, MAX_PER_PAGE, InvalidCursor, paginate
+from services.project_facets import get_facet_counts
+from services.project_locale import Locale, field_projection, locale_projection, localize, localize_all
+from services.mongo import mongo
+from services.json_response import RawJSONResponse, conditional_json, render_json
+from services.response_cache import ResponseCache
+from services.sanitizer import sanitize_input
+from services.write_behind import QueueFull, WriteBehindQueue
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
 
-# MongoDB connection
-mongo_url = os.environ['MONGO_URL']
-client = AsyncIOMotorClient(mongo_url)
-db = client[os.environ['DB_NAME']]
+# Cache for read-only project routes; invalidate the "projects" tag on any project write
+response_cache = ResponseCache(
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+    redis_url=settings.REDIS_URL,
+    redis_ttl_seconds=settings.RESPONSE_CACHE_REDIS_TTL_SECONDS,
+    redis_retry_seconds=settings.RESPONSE_CACHE_REDIS_RETRY_SECONDS,
+)
+PROJECTS_CACHE_TAG = "projects"
+
+# Consultation submits are acknowledged once journaled; inserts happen in the background
+# (the collection is bound at startup, once the Mongo client exists)
+consultation_queue = WriteBehindQueue(
+    None,
+    journal_dir=settings.CONSULTATION_JOURNAL_DIR,
+    name="consultation_requests",
+    max_size=settings.CONSULTATION_QUEUE_MAX_SIZE,
+    batch_size=settings.CONSULTATION_QUEUE_BATCH_SIZE,
+)
+
+# Quote factor tables come from the config store: rebuild the engine on each version
+config_store.subscribe(lambda snapshot: get_quote_engine.cache_clear())
+
+
+async def invalidate_project_cache() -> None:
+    """Call after any write to the projects collection."""
+    await response_cache.invalidate(PROJECTS_CACHE_TAG)
 
 
 def get_real_client_ip(request: Request) -> str:
@@ -51,11 +108,22 @@ def get_real_client_ip(request: Request) -> str:
 # Rate limiter setup - uses real client IP behind nginx
 limiter = Limiter(key_func=get_real_client_ip)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Worker lifecycle; startup() and shutdown() are at the end of this module"""
+    await startup()
+    try:
+        yield
+    finally:
+        await shutdown()
+
+
 # Create the main app without a prefix
 app = FastAPI(
     title="AICO Elektronik Engineering Portfolio API",
     description="Muhendislik ve Ar-Ge Danismanlik Portfolyosu API",
-    version="3.0.0"
+    version="3.0.0",
+    lifespan=lifespan
 )
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
@@ -87,29 +155,9 @@ class InfoRequest(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 
-# Input sanitization helper using bleach for robust XSS prevention
-def sanitize_input(value: str) -> str:
-    """
-    Sanitize input to prevent XSS and injection attacks using bleach.
-    Strips all HTML tags and attributes for user-provided text fields.
-    """
-    if not value:
-        return value
-
-    # Use bleach.clean with strip=True to remove all HTML tags
-    # No tags or attributes are allowed in user input fields
-    sanitized = bleach.clean(
-        value,
-        tags=[],           # No HTML tags allowed
-        attributes={},     # No attributes allowed
-        strip=True,        # Remove tags entirely (don't escape)
-        strip_comments=True
-    )
-
-    # Normalize whitespace
-    sanitized = ' '.join(sanitized.split())
-
-    return sanitized.strip()
+# Compiled once; the validators below run on every submission
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+PHONE_STRIP_PATTERN = re.compile(r'[^\d+]')
 
 
 class InfoRequestCreate(BaseModel):
@@ -135,8 +183,7 @@ class InfoRequestCreate(BaseModel):
         if not v:
             return v
         # Basic email format validation
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, v):
+        if not isinstance(v, str) or not EMAIL_PATTERN.match(v):
             raise ValueError('Invalid email format')
         return v.lower().strip()
 
@@ -145,12 +192,25 @@ class InfoRequestCreate(BaseModel):
     def validate_phone(cls, v):
         if not v:
             return v
+        if not isinstance(v, str):
+            raise ValueError('Invalid phone number')
         # Remove all non-digit characters except + for international prefix
-        cleaned = re.sub(r'[^\d+]', '', v)
+        cleaned = PHONE_STRIP_PATTERN.sub('', v)
         if len(cleaned) < 7 or len(cleaned) > 20:
             raise ValueError('Invalid phone number length')
         return cleaned
 
+    def to_document(self) -> dict:
+        """
+        Stored (and returned) consultation document. The fields were already
+        validated here, so this skips rebuilding and revalidating an InfoRequest.
+        """
+        return {
+            "id": str(uuid.uuid4()),
+            **self.model_dump(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+
 
 # ============= Project/Case Study Models =============
 class ProjectPhase(BaseModel):
@@ -222,13 +282,13 @@ async def create_status_check(input: StatusCheckCreate):
     doc = status_obj.model_dump()
     doc['timestamp'] = doc['timestamp'].isoformat()
 
-    _ = await db.status_checks.insert_one(doc)
+    _ = await mongo.db.status_checks.insert_one(doc)
     return status_obj
 
 
 @api_router.get("/status", response_model=List[StatusCheck])
 async def get_status_checks():
-    status_checks = await db.status_checks.find({}, {"_id": 0}).to_list(1000)
+    status_checks = await mongo.db.status_checks.find({}, {"_id": 0}).to_list(1000)
 
     for check in status_checks:
         if isinstance(check['timestamp'], str):
@@ -238,56 +298,120 @@ async def get_status_checks():
 
 
 # ============= Config Routes =============
-@api_router.get("/config/{key}")
+# Served from the config store's snapshot, pre-rendered per config version
+@api_router.get("/config/{key}", response_class=RawJSONResponse)
+@conditional_json(settings.CACHE_CONTROL_CONFIG)
 async def get_config(key: str):
     """Get a specific config by key"""
-    config = await db.config.find_one({"key": key}, {"_id": 0})
+    if not config_store.loaded:
+        raise HTTPException(status_code=503, detail="Configuration not loaded yet")
+    config = config_store.snapshot.payloads.get(key)
     if not config:
         raise HTTPException(status_code=404, detail=f"Config '{key}' not found")
     return config
 
 
-@api_router.get("/config")
+@api_router.get("/config", response_class=RawJSONResponse)
+@conditional_json(settings.CACHE_CONTROL_CONFIG)
 async def get_all_configs():
     """Get all configs"""
-    configs = await db.config.find({}, {"_id": 0}).to_list(100)
-    return configs
+    if not config_store.loaded:
+        raise HTTPException(status_code=503, detail="Configuration not loaded yet")
+    return config_store.snapshot.all_payload
 
 
 # ============= Project/Case Study Routes =============
-@api_router.get("/projects")
-async def get_projects(featured: Optional[bool] = None, industry: Optional[str] = None):
+PROJECT_SORT = [("order", 1), ("slug", 1)]
+CONSULTATION_SORT = [("created_at", -1), ("id", -1)]
+CONSULTATION_PROJECTION = {"_id": 0, **{field: 1 for field in InfoRequest.model_fields}}
+
+
+async def fetch_page(collection, query: dict, sort, per_page: int, cursor: Optional[str],
+                     projection: Optional[dict] = None, timestamp: bool = True) -> dict:
     """
-    Get all projects/case studies
-    Optionally filter by featured status or industry
+    Keyset page as a dict; a bad cursor is a 400
+    Pass timestamp=False for cached, ETagged pages so the body (and its
+    ETag) depends on the data only, not on when it was read
     """
+    try:
+        page = await paginate(collection, query, sort, per_page, cursor, projection)
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Dump only the envelope; documents are passed through untouched
+    exclude = {"items"} if timestamp else {"items", "timestamp"}
+    return {**page.model_dump(mode="json", exclude=exclude), "items": page.items}
+
+
+def project_query(featured: Optional[bool], industry: Optional[str]) -> dict:
     query = {}
     if featured is not None:
         query["featured"] = featured
     if industry:
         query["client_industry"] = industry
+    return query
+
 
-    projects = await db.projects.find(query, {"_id": 0}).sort("order", 1).to_list(100)
-    return projects
+def project_projection(locale: Optional[Locale]) -> dict:
+    """Full project documents in `locale`, without seeding bookkeeping"""
+    return {**locale_projection(locale), SEED_HASH_FIELD: 0}
 
 
-@api_router.get("/projects/{slug}")
-async def get_project_by_slug(slug: str):
-    """Get a single project by its slug"""
-    project = await db.projects.find_one({"slug": slug}, {"_id": 0})
+@api_router.get("/projects", response_model=PaginatedResponse, response_class=RawJSONResponse)
+@conditional_json(settings.CACHE_CONTROL_PROJECTS)
+@response_cache.cached(PROJECTS_CACHE_TAG)
+@render_json
+async def get_projects(
+    featured: Optional[bool] = None,
+    industry: Optional[str] = None,
+    per_page: int = Query(DEFAULT_PER_PAGE, ge=1, le=MAX_PER_PAGE),
+    cursor: Optional[str] = None,
+    locale: Optional[Locale] = None,
+):
+    """
+    Get projects/case studies ordered by (order, slug), one page at a time
+    Optionally filter by featured status or industry; pass next_cursor back as cursor
+    Returns ProjectListItem fields only; full documents come from /projects/{slug}
+    With locale, only that language's text is returned, under the base field names
+    """
+    page = await fetch_page(mongo.db.projects, project_query(featured, industry), PROJECT_SORT, per_page, cursor,
+                            field_projection(ProjectListItem.model_fields, locale), timestamp=False)
+    localize_all(page["items"], locale)
+    return page
+
+
+@conditional_json(settings.CACHE_CONTROL_PROJECTS)
+@response_cache.cached(PROJECTS_CACHE_TAG)
+@render_json
+async def get_full_projects(featured: Optional[bool] = None, industry: Optional[str] = None):
+    """Full project documents, first MAX_PER_PAGE in (order, slug) order; legacy /api/projects only"""
+    return await mongo.db.projects.find(
+        project_query(featured, industry), project_projection(None)
+    ).sort(PROJECT_SORT).to_list(MAX_PER_PAGE)
+
+
+@api_router.get("/projects/{slug}", response_class=RawJSONResponse)
+@conditional_json(settings.CACHE_CONTROL_PROJECTS)
+@response_cache.cached(PROJECTS_CACHE_TAG)
+@render_json
+async def get_project_by_slug(slug: str, locale: Optional[Locale] = None):
+    """Get a single project by its slug, optionally in one locale"""
+    project = await mongo.db.projects.find_one({"slug": slug}, project_projection(locale))
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
-    return project
+    return localize(project, locale)
 
 
-@api_router.get("/projects/industry/{industry}")
-async def get_projects_by_industry(industry: str):
-    """Get projects filtered by industry"""
-    projects = await db.projects.find(
+@api_router.get("/projects/industry/{industry}", response_class=RawJSONResponse)
+@conditional_json(settings.CACHE_CONTROL_PROJECTS)
+@response_cache.cached(PROJECTS_CACHE_TAG)
+@render_json
+async def get_projects_by_industry(industry: str, locale: Optional[Locale] = None):
+    """Get projects filtered by industry, optionally in one locale"""
+    projects = await mongo.db.projects.find(
         {"client_industry": industry},
-        {"_id": 0}
+        project_projection(locale)
     ).sort("order", 1).to_list(100)
-    return projects
+    return localize_all(projects, locale)
 
 
 # ============= Contact/Consultation Request Routes =============
@@ -297,27 +421,17 @@ async def create_consultation_request(request: Request, info_request: InfoReques
     """
     Submit a project consultation request
     Rate limited: 5 requests per minute
+    Persisted asynchronously through the write-behind queue
     """
     try:
-        info_obj = InfoRequest(
-            name=info_request.name,
-            email=info_request.email,
-            phone=info_request.phone,
-            company=info_request.company,
-            project_type=info_request.project_type,
-            budget_range=info_request.budget_range,
-            timeline=info_request.timeline,
-            message=info_request.message
-        )
-
-        info_dict = info_obj.model_dump()
-        info_dict['created_at'] = info_dict['created_at'].isoformat()
-
-        await db.consultation_requests.insert_one(info_dict)
-
-        logging.info(f"New consultation request for {info_request.project_type} from {info_request.email}")
-        return info_obj
-
+        info_dict = info_request.to_document()
+        consultation_queue.submit(info_dict)
+        # Already validated and JSON-ready: bypass response_model revalidation
+        return JSONResponse(info_dict)
+
+    except QueueFull:
+        logging.error("Consultation queue full, rejecting request")
+        raise HTTPException(status_code=503, detail="Too many pending requests, please retry shortly")
     except HTTPException:
         raise
     except Exception as e:
@@ -325,18 +439,52 @@ async def create_consultation_request(request: Request, info_request: InfoReques
         raise HTTPException(status_code=500, detail=f"Error submitting request: {str(e)}")
 
 
-@api_router.get("/contact/consultations")
-async def get_consultation_requests(project_type: Optional[str] = None):
+@api_router.get("/contact/consultations", response_model=PaginatedResponse)
+async def get_consultation_requests(
+    project_type: Optional[str] = None,
+    per_page: int = Query(DEFAULT_PER_PAGE, ge=1, le=MAX_PER_PAGE),
+    cursor: Optional[str] = None,
+):
     """
-    Get all consultation requests (admin only - add auth later)
-    Optionally filter by project type
+    Get consultation requests, newest first, one page at a time (admin only - add auth later)
+    Optionally filter by project type; pass next_cursor back as cursor
     """
     query = {}
     if project_type:
         query["project_type"] = project_type
 
-    requests = await db.consultation_requests.find(query, {"_id": 0}).sort("created_at", -1).to_list(100)
-    return requests
+    return await fetch_page(mongo.db.consultation_requests, query, CONSULTATION_SORT, per_page, cursor,
+                            CONSULTATION_PROJECTION)
+
+
+@api_router.get("/contact/consultations/export")
+async def export_consultation_requests(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[str] = Query(
+        None, description="X-Export-Watermark of the previous export, or an ISO timestamp of insertion time"
+    ),
+    project_type: Optional[str] = None,
+    batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=10000),
+):
+    """
+    Stream every consultation request in insertion order (admin only - add auth later)
+    For incremental pulls pass the X-Export-Watermark response header back as since
+    """
+    try:
+        chunks, watermark = export_consultations(
+            mongo.db.consultation_requests, format, list(InfoRequest.model_fields), batch_size,
+            since=since, project_type=project_type, settle_seconds=settings.EXPORT_SETTLE_SECONDS,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid since watermark: {since}")
+    return StreamingResponse(
+        chunks,
+        media_type=EXPORT_FORMATS[format],
+        headers={
+            "Content-Disposition": f'attachment; filename="consultations.{format}"',
+            "X-Export-Watermark": watermark,
+        },
+    )
 
 
 # Legacy contact endpoint for backward compatibility
@@ -350,31 +498,34 @@ async def create_info_request(request: Request, info_request: InfoRequestCreate)
 
 
 # ============= Technologies/Capabilities Routes =============
-@api_router.get("/technologies")
+@api_router.get("/technologies", response_class=RawJSONResponse)
+@conditional_json(settings.CACHE_CONTROL_PROJECTS)
+@response_cache.cached(PROJECTS_CACHE_TAG)
+@render_json
 async def get_technologies():
     """Get all technologies used across projects"""
-    projects = await db.projects.find({}, {"technologies": 1, "_id": 0}).to_list(100)
-
-    # Aggregate unique technologies
-    all_techs = set()
-    for project in projects:
-        if project.get("technologies"):
-            all_techs.update(project["technologies"])
+    return [facet["value"] for facet in await get_facet_counts(mongo.db, "technology")]
 
-    return sorted(list(all_techs))
 
-
-@api_router.get("/industries")
+@api_router.get("/industries", response_class=RawJSONResponse)
+@conditional_json(settings.CACHE_CONTROL_PROJECTS)
+@response_cache.cached(PROJECTS_CACHE_TAG)
+@render_json
 async def get_industries():
     """Get all industries served"""
-    projects = await db.projects.find({}, {"client_industry": 1, "_id": 0}).to_list(100)
+    return [facet["value"] for facet in await get_facet_counts(mongo.db, "industry")]
 
-    industries = set()
-    for project in projects:
-        if project.get("client_industry"):
-            industries.add(project["client_industry"])
 
-    return sorted(list(industries))
+@api_router.get("/facets", response_class=RawJSONResponse)
+@conditional_json(settings.CACHE_CONTROL_PROJECTS)
+@response_cache.cached(PROJECTS_CACHE_TAG)
+@render_json
+async def get_facets():
+    """Get technologies and industries with project counts"""
+    return {
+        "technologies": await get_facet_counts(mongo.db, "technology"),
+        "industries": await get_facet_counts(mongo.db, "industry"),
+    }
 
 
 # ============= Legacy Compatibility Routes =============
@@ -385,17 +536,18 @@ async def get_industries():
 async def legacy_root():
     return await root()
 
+# Legacy list routes keep their bare-list shape: the first MAX_PER_PAGE rows
 @legacy_router.get("/projects")
-async def legacy_get_projects(featured: Optional[bool] = None, industry: Optional[str] = None):
-    return await get_projects(featured, industry)
+async def legacy_get_projects(request: Request, featured: Optional[bool] = None, industry: Optional[str] = None):
+    return await get_full_projects(featured, industry, request=request)
 
 @legacy_router.get("/projects/{slug}")
-async def legacy_get_project_by_slug(slug: str):
-    return await get_project_by_slug(slug)
+async def legacy_get_project_by_slug(request: Request, slug: str):
+    return await get_project_by_slug(slug, request=request)
 
 @legacy_router.get("/projects/industry/{industry}")
-async def legacy_get_projects_by_industry(industry: str):
-    return await get_projects_by_industry(industry)
+async def legacy_get_projects_by_industry(request: Request, industry: str):
+    return await get_projects_by_industry(industry, request=request)
 
 @legacy_router.post("/contact/consultation", response_model=InfoRequest)
 @limiter.limit("5/minute")
@@ -404,7 +556,16 @@ async def legacy_create_consultation(request: Request, info_request: InfoRequest
 
 @legacy_router.get("/contact/consultations")
 async def legacy_get_consultations(project_type: Optional[str] = None):
-    return await get_consultation_requests(project_type)
+    return (await get_consultation_requests(project_type, MAX_PER_PAGE, None))["items"]
+
+@legacy_router.get("/contact/consultations/export")
+async def legacy_export_consultations(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[str] = None,
+    project_type: Optional[str] = None,
+    batch_size: int = Query(settings.EXPORT_BATCH_SIZE, ge=1, le=10000),
+):
+    return await export_consultation_requests(format, since, project_type, batch_size)
 
 @legacy_router.post("/contact/request-info", response_model=InfoRequest)
 @limiter.limit("5/minute")
@@ -412,12 +573,16 @@ async def legacy_create_info_request(request: Request, info_request: InfoRequest
     return await create_consultation_request(request, info_request)
 
 @legacy_router.get("/technologies")
-async def legacy_get_technologies():
-    return await get_technologies()
+async def legacy_get_technologies(request: Request):
+    return await get_technologies(request=request)
 
 @legacy_router.get("/industries")
-async def legacy_get_industries():
-    return await get_industries()
+async def legacy_get_industries(request: Request):
+    return await get_industries(request=request)
+
+@legacy_router.get("/facets")
+async def legacy_get_facets(request: Request):
+    return await get_facets(request=request)
 
 @legacy_router.post("/status", response_model=StatusCheck)
 async def legacy_create_status(input: StatusCheckCreate):
@@ -427,18 +592,48 @@ async def legacy_create_status(input: StatusCheckCreate):
 async def legacy_get_status():
     return await get_status_checks()
 
+@legacy_router.post("/quote/calculate", response_model=QuoteResponse,
+                    dependencies=[Depends(check_pricing_rate_limit)])
+async def legacy_calculate_quote(options: PCBQuoteOptions):
+    return await calculate_quote(options, get_quote_engine())
+
+@legacy_router.post("/quote/complete-analysis", response_model=QuoteAnalysisResponse,
+                    dependencies=[Depends(check_pricing_rate_limit)])
+async def legacy_complete_analysis(options: PCBQuoteOptions):
+    return await complete_analysis(options, get_quote_engine())
+
+@legacy_router.post("/quote/calculate-batch", dependencies=[Depends(check_pricing_rate_limit)])
+async def legacy_calculate_quote_batch(batch: QuoteBatchRequest):
+    return await calculate_quote_batch(batch, get_quote_engine())
+
+@legacy_router.post("/quote/curve", response_model=QuoteCurveResponse,
+                    dependencies=[Depends(check_pricing_rate_limit)])
+async def legacy_get_quote_curve(options: PCBQuoteOptions,
+                                 points: int = Query(CURVE_DEFAULT_POINTS, ge=10, le=2000)):
+    return await get_quote_curve(options, points, get_quote_engine())
+
 @legacy_router.get("/config/{key}")
-async def legacy_get_config(key: str):
-    return await get_config(key)
+async def legacy_get_config(request: Request, key: str):
+    return await get_config(key, request=request)
 
 @legacy_router.get("/config")
-async def legacy_get_all_configs():
-    return await get_all_configs()
+async def legacy_get_all_configs(request: Request):
+    return await get_all_configs(request=request)
 
 
 # Include both routers in the main app
+# config_router first: its static /config/* paths must win over /config/{key}
+app.include_router(config_router)
 app.include_router(api_router)
 app.include_router(legacy_router)
+app.include_router(quote_router)
+app.include_router(health_router)
+
+
+# Unversioned alias for the container HEALTHCHECK (see Dockerfile)
+@app.get("/health", include_in_schema=False)
+async def root_health_check():
+    return await health_check()
 
 # CORS Configuration - Security hardened
 # In production, CORS_ORIGINS environment variable MUST be set
@@ -476,12 +671,95 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    client.close()
+async def run_warm_up_step(name: str, step, delay: float = 1.0) -> None:
+    """
+    Run a warm-up step until it succeeds, backing off from `delay` seconds
+    between attempts. The startup profile records the first failure and the
+    final success.
+    """
+    attempt = 1
+    while True:
+        started = time.perf_counter()
+        try:
+            await step()
+        except Exception as e:
+            if attempt == 1:
+                startup_profile.record(name, started, e)
+            logger.warning(f"Startup step {name} failed (attempt {attempt}, retry in {delay:.0f}s): {e}")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.WARMUP_RETRY_MAX_SECONDS)
+            attempt += 1
+            continue
+        startup_profile.record(name if attempt == 1 else f"{name} (attempt {attempt})", started)
+        return
+
+
+async def warm_up() -> None:
+    """
+    Mongo-bound startup work, run in the background once the worker serves
+    requests: the health check must not wait on index builds, seeding or a
+    slow primary. Steps run in order, each retried with backoff until it
+    succeeds; the pool step goes first, so while Mongo is unreachable only
+    it is retried instead of every step waiting out its own server
+    selection timeout. Config routes answer 503 until the config store has
+    loaded.
+    """
+    steps = [
+        ("mongo_pool", mongo.warm),
+        ("ensure_indexes", lambda: ensure_indexes(mongo.db)),
+        ("seed_config", lambda: seed_config(mongo.db)),
+        ("config_store", lambda: config_store.start(mongo.db.config)),
+        ("invalidate_project_cache", invalidate_project_cache),
+    ]
+    for name, step in steps:
+        await run_warm_up_step(name, step)
 
 
-@app.on_event("startup")
-async def startup_db():
-    """Initialize database with seed data"""
-    await seed_config(db)
+async def wait_warm(timeout: Optional[float] = None) -> bool:
+    """
+    Wait for warm_up() to finish (e.g. in tests and the startup profiler);
+    False if it is still retrying after `timeout` seconds.
+    """
+    warmup = getattr(app.state, "warmup", None)
+    if warmup:
+        try:
+            await asyncio.wait_for(asyncio.shield(warmup), timeout)
+        except asyncio.TimeoutError:
+            return False
+    return True
+
+
+async def startup() -> None:
+    """
+    Blocking startup, then warm Mongo-backed state in the background.
+    Creating the Mongo client does no I/O, and the consultation queue needs
+    only local disk, so submits are accepted (and journaled) even if Mongo
+    is down at boot.
+    """
+    async with startup_profile.phase("mongo_client"):
+        mongo.open()
+    async with startup_profile.phase("consultation_queue"):
+        await consultation_queue.start(mongo.db.consultation_requests)
+    async with startup_profile.phase("rate_limiting"):
+        # Shared endpoint limiter registry and the idle-key sweeper
+        configure_endpoint_rate_limiter(
+            settings.REDIS_URL, max_keys=settings.RATE_LIMIT_MAX_KEYS, approximate=settings.RATE_LIMIT_APPROXIMATE
+        )
+        app.state.rate_limit_sweeper = start_sweeper(settings.RATE_LIMIT_SWEEP_INTERVAL_SECONDS)
+    readiness.start()
+    health_sampler.start()
+    app.state.warmup = asyncio.create_task(warm_up())
+    startup_profile.mark_ready()
+
+
+async def shutdown() -> None:
+    """Stop background work, flush the consultation queue, then close clients."""
+    app.state.warmup.cancel()
+    app.state.rate_limit_sweeper.cancel()
+    await consultation_queue.stop()
+    await config_store.stop()
+    await readiness.stop()
+    await health_sampler.stop()
+    mongo.close()
+    await response_cache.close()
+    await get_endpoint_rate_limiter().close()
@@ -0,0 +1,182 @@
+"""
+In-memory, versioned snapshot of the Mongo `config` collection.
+
+The collection is small (a handful of documents keyed by `key`), so the
+store always reloads all of it and publishes an immutable ConfigSnapshot:
+the documents, and each one pre-rendered (see services/json_response.py)
+for the config routes. Reads are a dict lookup on the current snapshot;
+a reload builds a new snapshot and swaps the reference, so a request
+never sees half an update.
+
+Reloads are triggered by a change stream on the collection where the
+deployment supports one (replica sets), otherwise by polling every
+`poll_interval` seconds. Either way a reload whose content digest matches
+the current snapshot is a no-op, so the version only moves on real
+changes. Subscribers are called with each new snapshot to rebuild state
+derived from it (e.g. the form option payloads in api/config_routes.py).
+"""
+
+import asyncio
+import hashlib
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from services.json_response import dumps, prerendered
+
+logger = logging.getLogger(__name__)
+
+# Server error codes meaning change streams are unavailable on this deployment
+CHANGE_STREAMS_UNSUPPORTED = {40573, 40324}
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """One published state of the config collection. Never mutated."""
+    version: int
+    digest: str
+    docs: Mapping[str, Dict[str, Any]]
+    payloads: Mapping[str, Dict[str, Any]]
+    all_payload: Dict[str, Any]
+    loaded_at: Optional[datetime] = None
+
+    def data(self, key: str, default: Any = None) -> Any:
+        """`data` of the document stored under `key`, or `default`."""
+        doc = self.docs.get(key)
+        return doc.get("data", default) if doc else default
+
+
+def build_snapshot(docs: List[Dict[str, Any]], version: int) -> ConfigSnapshot:
+    docs = sorted(docs, key=lambda doc: str(doc.get("key")))
+    body = dumps(docs)
+    return ConfigSnapshot(
+        version=version,
+        digest=hashlib.blake2b(body, digest_size=16).hexdigest(),
+        docs={doc["key"]: doc for doc in docs},
+        payloads={doc["key"]: prerendered(doc) for doc in docs},
+        all_payload=prerendered(docs),
+        loaded_at=datetime.now(timezone.utc),
+    )
+
+
+class ConfigStore:
+    """Holds the current ConfigSnapshot and keeps it in sync with Mongo."""
+
+    def __init__(
+        self,
+        poll_interval: float = 30.0,
+        change_streams: bool = True,
+        hidden_fields: Sequence[str] = (),
+    ) -> None:
+        self._poll_interval = poll_interval
+        self._change_streams = change_streams
+        self._projection = {"_id": 0, **{field: 0 for field in hidden_fields}}
+        self._collection = None
+        self._snapshot = build_snapshot([], version=0)
+        self._listeners: List[Callable[[ConfigSnapshot], None]] = []
+        self._task: Optional[asyncio.Task] = None
+        self.mode = "static"
+        self.reloads = 0
+
+    @property
+    def snapshot(self) -> ConfigSnapshot:
+        return self._snapshot
+
+    @property
+    def loaded(self) -> bool:
+        """Whether a snapshot has been read from the database yet."""
+        return self._snapshot.version > 0
+
+    def subscribe(self, listener: Callable[[ConfigSnapshot], None]) -> None:
+        """Call `listener` with every new snapshot, right after it is published."""
+        self._listeners.append(listener)
+
+    # ---------- publishing ----------
+
+    def publish(self, docs: List[Dict[str, Any]]) -> bool:
+        """Swap in a snapshot of `docs` unless nothing changed. Returns whether it did."""
+        snapshot = build_snapshot(docs, version=self._snapshot.version + 1)
+        if self.loaded and snapshot.digest == self._snapshot.digest:
+            return False
+        self._snapshot = snapshot
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception:
+                logger.exception(f"Config listener {listener!r} failed on version {snapshot.version}")
+        logger.info(f"Config snapshot version {snapshot.version} ({len(snapshot.docs)} documents)")
+        return True
+
+    async def refresh(self) -> bool:
+        """Reload the whole collection and publish it if it changed."""
+        docs = await self._collection.find({"key": {"$exists": True}}, self._projection).to_list(None)
+        self.reloads += 1
+        return self.publish(docs)
+
+    # ---------- lifecycle ----------
+
+    async def start(self, collection) -> None:
+        """Load `collection` and keep following it until stop()."""
+        self._collection = collection
+        try:
+            await self.refresh()
+        except PyMongoError as e:
+            logger.error(f"Initial config load failed ({e}); retrying in the background")
+        self._task = asyncio.create_task(self._follow())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _follow(self) -> None:
+        if self._change_streams:
+            await self._watch()  # only returns if change streams are unsupported
+        self.mode = "polling"
+        while True:
+            await asyncio.sleep(self._poll_interval)
+            try:
+                await self.refresh()
+            except PyMongoError as e:
+                logger.warning(f"Config poll failed: {e}")
+
+    async def _watch(self) -> None:
+        """
+        Reload on every change stream event. Returns if the deployment has
+        no change streams; other errors reopen the stream after a pause.
+        """
+        while True:
+            try:
+                async with self._collection.watch() as stream:
+                    self.mode = "change_stream"
+                    await self.refresh()  # changes made before the stream opened
+                    async for _ in stream:
+                        await self.refresh()
+            except OperationFailure as e:
+                if e.code in CHANGE_STREAMS_UNSUPPORTED:
+                    logger.info("Change streams unsupported; polling the config collection")
+                    return
+                logger.warning(f"Config change stream failed: {e}")
+            except PyMongoError as e:
+                logger.warning(f"Config change stream failed: {e}")
+            await asyncio.sleep(self._poll_interval)
+
+    def stats(self) -> Dict[str, Any]:
+        """Snapshot version and reload counters for monitoring."""
+        snapshot = self._snapshot
+        return {
+            "version": snapshot.version,
+            "digest": snapshot.digest,
+            "documents": len(snapshot.docs),
+            "mode": self.mode,
+            "reloads": self.reloads,
+            "loaded_at": snapshot.loaded_at.isoformat() if self.loaded else None,
+        }
@@ -0,0 +1,131 @@
+"""
+Streaming export of consultation requests (NDJSON or CSV).
+
+Rows are read from a Motor cursor with a fixed batch_size and flushed one
+batch at a time, so memory stays at one batch however large the
+collection is.
+
+Exports run in _id order, i.e. by when a request was inserted, not when
+it was submitted: write-behind can insert a request well after its
+created_at (queue delay, retries, journal replay), so a created_at
+watermark would skip it for good. Each export covers _ids up to a
+watermark `settle_seconds` in the past, giving in-flight inserts time to
+land, and returns that watermark; pass it back as `since` to fetch only
+requests inserted after it.
+"""
+
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+EXPORT_SORT = [("_id", 1)]
+
+# Cells starting with these are evaluated as formulas by spreadsheets
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def normalize_watermark(since: str) -> ObjectId:
+    """
+    `since` as an _id lower bound: the watermark of a previous export, or
+    an ISO timestamp of insertion time (naive means UTC).
+    Raises ValueError for an unparseable value.
+    """
+    if len(since) == 24 and ObjectId.is_valid(since):
+        return ObjectId(since)
+    parsed = datetime.fromisoformat(since.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return ObjectId.from_datetime(parsed)
+
+
+def export_watermark(settle_seconds: float, now: Optional[datetime] = None) -> ObjectId:
+    """Upper _id bound of an export started at `now`."""
+    now = now or datetime.now(timezone.utc)
+    return ObjectId.from_datetime(now - timedelta(seconds=settle_seconds))
+
+
+def export_query(
+    since: Optional[str] = None,
+    project_type: Optional[str] = None,
+    until: Optional[ObjectId] = None,
+) -> Dict[str, Any]:
+    query: Dict[str, Any] = {}
+    id_range: Dict[str, ObjectId] = {}
+    if since:
+        id_range["$gte"] = normalize_watermark(since)
+    if until is not None:
+        id_range["$lt"] = until
+    if id_range:
+        query["_id"] = id_range
+    if project_type:
+        query["project_type"] = project_type
+    return query
+
+
+def csv_safe(value: Any) -> Any:
+    """Neutralize a cell a spreadsheet would run as a formula (CSV injection)."""
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+async def _batches(cursor, batch_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+    batch: List[Dict[str, Any]] = []
+    async for doc in cursor:
+        batch.append(doc)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+async def stream_ndjson(cursor, batch_size: int) -> AsyncIterator[str]:
+    """One JSON object per line, one chunk per batch."""
+    async for batch in _batches(cursor, batch_size):
+        yield "".join(json.dumps(doc, default=str, ensure_ascii=False) + "\n" for doc in batch)
+
+
+async def stream_csv(cursor, fields: List[str], batch_size: int) -> AsyncIterator[str]:
+    """Header row, then one chunk of rows per batch."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue()
+    async for batch in _batches(cursor, batch_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows({field: csv_safe(value) for field, value in doc.items()} for doc in batch)
+        yield buffer.getvalue()
+
+
+def export_consultations(
+    collection,
+    fmt: str,
+    fields: List[str],
+    batch_size: int,
+    since: Optional[str] = None,
+    project_type: Optional[str] = None,
+    settle_seconds: float = 60.0,
+) -> Tuple[AsyncIterator[str], str]:
+    """
+    Chunk iterator for a StreamingResponse and the watermark to pass as the
+    next export's `since`. Raises ValueError for a bad `since`.
+    """
+    until = export_watermark(settle_seconds)
+    projection = {"_id": 0, **{field: 1 for field in fields}}
+    cursor = collection.find(
+        export_query(since, project_type, until), projection, batch_size=batch_size
+    ).sort(EXPORT_SORT)
+    if fmt == "csv":
+        return stream_csv(cursor, fields, batch_size), str(until)
+    return stream_ndjson(cursor, batch_size), str(until)
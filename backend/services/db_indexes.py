@@ -0,0 +1,120 @@
+"""
+MongoDB index bootstrap and query plan checks.
+
+INDEXES mirrors the query shapes the routes issue; QUERY_SHAPES lists
+one representative query per shape so explain() can confirm each one is
+served by an index rather than a collection scan.
+
+Usage (from backend/, against MONGO_URL/DB_NAME):
+    python -m services.db_indexes            # create indexes, report scans
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "projects": [
+        IndexModel([("slug", ASCENDING)], unique=True, name="slug_unique"),
+        IndexModel([("order", ASCENDING), ("slug", ASCENDING)], name="order_slug"),
+        IndexModel([("featured", ASCENDING), ("order", ASCENDING), ("slug", ASCENDING)], name="featured_order_slug"),
+        IndexModel([("client_industry", ASCENDING), ("order", ASCENDING), ("slug", ASCENDING)], name="industry_order_slug"),
+    ],
+    "config": [
+        IndexModel([("key", ASCENDING)], unique=True, name="key_unique"),
+    ],
+    "consultation_requests": [
+        IndexModel([("id", ASCENDING)], unique=True, name="id_unique"),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)], name="created_at_id"),
+        IndexModel([("project_type", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)], name="project_type_created_at_id"),
+        IndexModel([("project_type", ASCENDING), ("_id", ASCENDING)], name="project_type_insertion"),
+    ],
+    "project_facets": [
+        IndexModel([("facet", ASCENDING), ("value", ASCENDING)], unique=True, name="facet_value_unique"),
+    ],
+}
+
+# (collection, filter, sort) — one per query shape used by the API
+QUERY_SHAPES: List[Tuple[str, Dict[str, Any], Optional[List[Tuple[str, int]]]]] = [
+    ("projects", {"slug": "example"}, None),
+    ("projects", {}, [("order", ASCENDING), ("slug", ASCENDING)]),
+    ("projects", {"featured": True}, [("order", ASCENDING), ("slug", ASCENDING)]),
+    ("projects", {"client_industry": "example"}, [("order", ASCENDING)]),
+    ("config", {"key": "site.config"}, None),
+    ("consultation_requests", {}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("consultation_requests", {"_id": {"$gte": ObjectId("65920080" + "0" * 16)}}, [("_id", ASCENDING)]),
+    ("consultation_requests", {"project_type": "example", "_id": {"$gte": ObjectId("65920080" + "0" * 16)}},
+     [("_id", ASCENDING)]),
+    ("consultation_requests", {"project_type": "example"}, [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("project_facets", {"facet": "technology", "count": {"$gt": 0}}, [("value", ASCENDING)]),
+]
+
+
+async def ensure_indexes(db) -> Dict[str, List[str]]:
+    """
+    Create every index in INDEXES. Idempotent, so concurrent workers may
+    all run it. A failing index (e.g. duplicates blocking a unique index)
+    is logged and skipped rather than blocking startup.
+    """
+    created: Dict[str, List[str]] = {}
+    for collection, models in INDEXES.items():
+        created[collection] = []
+        for model in models:
+            try:
+                created[collection] += await db[collection].create_indexes([model])
+            except OperationFailure as e:
+                logger.error(f"Index {model.document['name']} on {collection} failed: {e}")
+    return created
+
+
+def _plan_stages(plan: Dict[str, Any]) -> List[str]:
+    """All stage names in a (possibly nested) query plan."""
+    stages = [plan["stage"]] if "stage" in plan else []
+    for child_key in ("inputStage", "queryPlan"):
+        if child_key in plan:
+            stages += _plan_stages(plan[child_key])
+    for child in plan.get("inputStages", []):
+        stages += _plan_stages(child)
+    return stages
+
+
+async def find_collection_scans(db) -> List[Dict[str, Any]]:
+    """Explain every QUERY_SHAPES entry and return those whose winning plan has a COLLSCAN."""
+    scans = []
+    for collection, query, sort in QUERY_SHAPES:
+        cursor = db[collection].find(query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        stages = _plan_stages(explain["queryPlanner"]["winningPlan"])
+        if "COLLSCAN" in stages:
+            scans.append({"collection": collection, "filter": query, "sort": sort, "stages": stages})
+    return scans
+
+
+async def _main() -> None:
+    import os
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    db = client[os.environ.get("DB_NAME", "aico_db")]
+    try:
+        for collection, names in (await ensure_indexes(db)).items():
+            print(f"{collection}: {', '.join(names) or '-'}")
+        scans = await find_collection_scans(db)
+        for scan in scans:
+            print(f"COLLSCAN {scan['collection']} filter={scan['filter']} sort={scan['sort']}")
+        print(f"{len(QUERY_SHAPES) - len(scans)}/{len(QUERY_SHAPES)} query shapes use an index")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    import asyncio
+    asyncio.run(_main())
@@ -0,0 +1,132 @@
+"""
+Background sampler for the detailed health check.
+
+Reading system metrics on request blocked the event loop:
+psutil.cpu_percent(interval=0.1) sleeps 100 ms, and disk_usage is a
+synchronous statvfs that can stall on a slow volume. Instead one task
+samples every `interval` seconds, with the psutil calls in a worker
+thread, into a ring buffer of the last `window` samples. The endpoint
+serves the latest sample and window aggregates without doing any I/O.
+
+CPU percentages are deltas since the previous sample (psutil's
+non-blocking mode), so they cover the whole interval rather than a
+100 ms slice. Event-loop lag is how late the sampler's own sleep wakes
+up: time the loop spent running something else that would not yield.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from services.mongo import percentile
+
+logger = logging.getLogger(__name__)
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+
+class HealthSampler:
+    """Ring buffer of system and process samples, filled in the background."""
+
+    def __init__(self, interval: float = 5.0, window: int = 60, disk_path: str = "/") -> None:
+        self.interval = interval
+        self.disk_path = disk_path
+        self.samples: Deque[Dict[str, Any]] = deque(maxlen=window)
+        self._process = None
+        self._task: Optional[asyncio.Task] = None
+
+    def _sample(self) -> Dict[str, Any]:
+        """Read system and process metrics (blocking; runs in a worker thread)."""
+        import psutil  # only the sampler needs it; keep it off the startup path
+
+        if self._process is None:
+            self._process = psutil.Process()
+            # First non-blocking reading is meaningless; it starts the interval
+            psutil.cpu_percent(interval=None)
+            self._process.cpu_percent(interval=None)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage(self.disk_path)
+        process = self._process
+        with process.oneshot():
+            rss = process.memory_info().rss
+            process_cpu = process.cpu_percent(interval=None)
+            open_files = process.num_fds() if hasattr(process, "num_fds") else len(process.open_files())
+        return {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_total_gb": round(memory.total / GB, 2),
+            "memory_available_gb": round(memory.available / GB, 2),
+            "memory_used_percent": memory.percent,
+            "disk_total_gb": round(disk.total / GB, 2),
+            "disk_free_gb": round(disk.free / GB, 2),
+            "disk_used_percent": round((disk.used / disk.total) * 100, 1),
+            "process_rss_mb": round(rss / MB, 1),
+            "process_cpu_percent": process_cpu,
+            "open_files": open_files,
+        }
+
+    def record(self, sample: Dict[str, Any], loop_lag_ms: float) -> None:
+        self.samples.append({**sample, "loop_lag_ms": round(loop_lag_ms, 3), "at": time.time()})
+
+    async def sample_once(self, loop_lag_ms: float = 0.0) -> None:
+        self.record(await asyncio.to_thread(self._sample), loop_lag_ms)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        lag_ms = 0.0
+        while True:
+            try:
+                await self.sample_once(lag_ms)
+            except Exception:
+                logger.exception("Health sample failed")
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, loop.time() - expected) * 1000
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def latest(self) -> Optional[Dict[str, Any]]:
+        return self.samples[-1] if self.samples else None
+
+    def aggregates(self) -> Dict[str, Any]:
+        """Min/avg/max of each metric over the buffered window, p95 for loop lag."""
+        samples = list(self.samples)
+        if not samples:
+            return {"samples": 0}
+        result: Dict[str, Any] = {
+            "samples": len(samples),
+            "seconds": round(samples[-1]["at"] - samples[0]["at"], 1),
+        }
+        for field in ("cpu_percent", "memory_used_percent", "disk_used_percent",
+                      "process_rss_mb", "process_cpu_percent", "open_files", "loop_lag_ms"):
+            values = [sample[field] for sample in samples]
+            result[field] = {
+                "min": min(values),
+                "avg": round(sum(values) / len(values), 2),
+                "max": max(values),
+            }
+        result["loop_lag_ms"]["p95"] = percentile(sorted(s["loop_lag_ms"] for s in samples), 0.95)
+        return result
+
+    def report(self) -> Dict[str, Any]:
+        """Sampling state and window aggregates (the latest sample is `latest`)."""
+        latest = self.latest
+        return {
+            "interval_s": self.interval,
+            "sampled_s_ago": round(time.time() - latest["at"], 1) if latest else None,
+            "window": self.aggregates(),
+        }
@@ -0,0 +1,109 @@
+"""
+orjson responses with ETag / If-None-Match support for read routes.
+
+FastAPI passes a route's return value through jsonable_encoder, which
+rebuilds every nested dict and list in Python before the response class
+serializes it. Project and config documents are already JSON-shaped, so
+read routes are stacked as
+
+    @router.get(..., response_class=RawJSONResponse)
+    @conditional_json(cache_control)     # 304 / headers, per request
+    @response_cache.cached(tag)          # optional
+    @render_json                         # data -> {"body", "etag"}, per data version
+    async def route(...): ...
+
+render_json serializes with orjson once and hashes the bytes into a
+strong ETag. When the response cache sits in between, both are stored
+with the cached entry, so a hit costs neither serialization nor hashing
+and the ETag only changes when the cached data does. conditional_json
+answers 304 when If-None-Match matches and sets ETag and Cache-Control
+on every response. Returning a Response skips response_model
+validation; the model still documents the route in OpenAPI.
+
+Types orjson does not know (e.g. ObjectId, Decimal) fall back to str(),
+like json.dumps(default=str) elsewhere in the app.
+"""
+
+import hashlib
+import inspect
+from functools import wraps
+from typing import Any, Callable, Dict
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+
+def _default(value: Any) -> str:
+    return str(value)
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class RawJSONResponse(ORJSONResponse):
+    """ORJSONResponse tolerating non-JSON scalars and non-string keys"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def etag_for(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def rendered(content: Any) -> Dict[str, str]:
+    """Serialized body and its ETag; JSON-safe so the response cache can store it."""
+    body = dumps(content)
+    return {"body": body.decode(), "etag": etag_for(body)}
+
+
+def prerendered(content: Any) -> Dict[str, Any]:
+    """rendered() keeping the body as bytes, for payloads built once and served as-is."""
+    body = dumps(content)
+    return {"body": body, "etag": etag_for(body)}
+
+
+def render_json(func: Callable) -> Callable:
+    """Decorator turning a coroutine's result into rendered(result)."""
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        return rendered(await func(*args, **kwargs))
+
+    return wrapper
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match header, as GET requires."""
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def conditional_json(cache_control: str) -> Callable:
+    """
+    Route decorator for coroutines returning rendered() or prerendered()
+    entries: 304 when the client's ETag is current, otherwise the body;
+    both carry ETag and `cache_control`. Adds a `request` parameter for FastAPI to inject;
+    direct callers must pass request=.
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        request_param = inspect.Parameter("request", inspect.Parameter.KEYWORD_ONLY, annotation=Request)
+
+        @wraps(func)
+        async def wrapper(*args, request: Request, **kwargs):
+            entry = await func(*args, **kwargs)
+            headers = {"ETag": entry["etag"], "Cache-Control": cache_control}
+            if etag_matches(request.headers.get("if-none-match", ""), entry["etag"]):
+                return Response(status_code=304, headers=headers)
+            body = entry["body"]
+            if isinstance(body, str):
+                body = body.encode()
+            return Response(body, media_type="application/json", headers=headers)
+
+        wrapper.__signature__ = signature.replace(parameters=[*signature.parameters.values(), request_param])
+        return wrapper
+    return decorator
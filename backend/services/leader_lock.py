@@ -0,0 +1,76 @@
+"""
+Best-effort leader lock on a Mongo collection.
+
+Lets one of several workers run a startup job (e.g. seeding) while the
+others skip it. A lock is one document, `{"_id": name, "owner",
+"expires_at"}`: inserting it takes the lock, the unique `_id` makes a
+concurrent insert fail, and an expired lock (its holder died mid-job) is
+taken over with a conditional update. Release deletes the document only
+if this worker still owns it. Workers that lose can wait_released() for
+the job to finish before relying on its results.
+
+The TTL bounds how long a crashed holder blocks the job; it is not a
+fencing token, so jobs run under it must be idempotent.
+"""
+
+import asyncio
+import logging
+import uuid
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator
+
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+LOCKS_COLLECTION = "locks"
+
+
+async def acquire(collection, name: str, ttl_seconds: float) -> str:
+    """Take lock `name`; returns an owner token, or "" if another worker holds it."""
+    owner = uuid.uuid4().hex
+    now = datetime.now(timezone.utc)
+    expires_at = now + timedelta(seconds=ttl_seconds)
+    try:
+        await collection.insert_one({"_id": name, "owner": owner, "expires_at": expires_at})
+        return owner
+    except DuplicateKeyError:
+        pass
+    result = await collection.update_one(
+        {"_id": name, "expires_at": {"$lt": now}},
+        {"$set": {"owner": owner, "expires_at": expires_at}},
+    )
+    if result.modified_count:
+        logger.warning(f"Took over expired lock {name}")
+        return owner
+    return ""
+
+
+async def release(collection, name: str, owner: str) -> None:
+    await collection.delete_one({"_id": name, "owner": owner})
+
+
+async def wait_released(db, name: str, poll_seconds: float = 0.5) -> None:
+    """Wait until lock `name` is released, or has expired (its holder died)."""
+    collection = db[LOCKS_COLLECTION]
+    while await collection.find_one({"_id": name, "expires_at": {"$gt": datetime.now(timezone.utc)}}, {"_id": 1}):
+        await asyncio.sleep(poll_seconds)
+
+
+@asynccontextmanager
+async def leader_lock(db, name: str, ttl_seconds: float = 300.0) -> AsyncIterator[bool]:
+    """
+    Async context yielding whether this worker holds lock `name`:
+
+        async with leader_lock(db, "seed") as leader:
+            if leader:
+                ...
+    """
+    collection = db[LOCKS_COLLECTION]
+    owner = await acquire(collection, name, ttl_seconds)
+    try:
+        yield bool(owner)
+    finally:
+        if owner:
+            await release(collection, name, owner)
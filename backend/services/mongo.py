@@ -0,0 +1,202 @@
+"""
+Lifespan-managed Motor client and connection pool metrics.
+
+The client is created when the worker starts (server.py lifespan), not
+at import, so each uvicorn worker builds its pool inside its own event
+loop, with the pool options from config.Settings, and closes it on
+shutdown. Until open() the database is unavailable.
+
+Pool sizing: each worker owns a pool of up to MONGO_MAX_POOL_SIZE
+connections, so the deployment opens up to workers x that many against
+the primary. Requests that find the pool exhausted queue for up to
+MONGO_WAIT_QUEUE_TIMEOUT_MS. PoolMetrics records how long every checkout
+waited and how many timed out: sustained p95 waits or timeouts mean the
+pool is too small for the load, an idle pool near zero in-use means it
+can shrink.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import monitoring
+
+from config import settings
+
+# Checkout waits kept for percentiles
+WAIT_SAMPLES = 2048
+
+
+def percentile(ordered, q: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (0 for an empty one)."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener recording checkout waits and pool occupancy.
+
+    pymongo runs a checkout synchronously on one thread (Motor's executor),
+    from CheckOutStarted to CheckedOut or CheckOutFailed, so the start time
+    is kept per thread. Handlers only append and count; they run on every
+    operation.
+    """
+
+    def __init__(self, samples: int = WAIT_SAMPLES) -> None:
+        self._started = threading.local()
+        self._lock = threading.Lock()
+        self.waits_ms: Deque[float] = deque(maxlen=samples)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.failures = 0
+        self.in_use = 0
+        self.max_in_use = 0
+        self.open = 0
+
+    def _wait_ms(self) -> float:
+        started = getattr(self._started, "at", None)
+        return (time.perf_counter() - started) * 1000 if started is not None else 0.0
+
+    def connection_check_out_started(self, event) -> None:
+        self._started.at = time.perf_counter()
+
+    def connection_checked_out(self, event) -> None:
+        wait = self._wait_ms()
+        with self._lock:
+            self.waits_ms.append(wait)
+            self.checkouts += 1
+            self.in_use += 1
+            self.max_in_use = max(self.max_in_use, self.in_use)
+
+    def connection_check_out_failed(self, event) -> None:
+        with self._lock:
+            if event.reason == monitoring.ConnectionCheckOutFailedReason.TIMEOUT:
+                self.timeouts += 1
+            else:
+                self.failures += 1
+
+    def connection_checked_in(self, event) -> None:
+        with self._lock:
+            self.in_use -= 1
+
+    def connection_created(self, event) -> None:
+        with self._lock:
+            self.open += 1
+
+    def connection_closed(self, event) -> None:
+        with self._lock:
+            self.open -= 1
+
+    def pool_created(self, event) -> None:
+        pass
+
+    def pool_ready(self, event) -> None:
+        pass
+
+    def pool_cleared(self, event) -> None:
+        pass
+
+    def pool_closed(self, event) -> None:
+        pass
+
+    def connection_ready(self, event) -> None:
+        pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self.waits_ms)
+            counters = {
+                "checkouts": self.checkouts,
+                "checkout_timeouts": self.timeouts,
+                "checkout_failures": self.failures,
+                "connections_open": self.open,
+                "connections_in_use": self.in_use,
+                "max_in_use": self.max_in_use,
+            }
+        return {
+            **counters,
+            "wait_ms": {
+                "samples": len(waits),
+                "p50": round(percentile(waits, 0.50), 3),
+                "p95": round(percentile(waits, 0.95), 3),
+                "p99": round(percentile(waits, 0.99), 3),
+                "max": round(waits[-1], 3) if waits else 0.0,
+            },
+        }
+
+
+class MongoConnection:
+    """Owns the worker's Motor client between open() and close()."""
+
+    def __init__(
+        self,
+        url: str,
+        db_name: str,
+        max_pool_size: int = 100,
+        min_pool_size: int = 0,
+        wait_queue_timeout_ms: Optional[int] = None,
+        compressors: str = "",
+        read_preference: str = "primary",
+    ) -> None:
+        self._url = url
+        self._db_name = db_name
+        self._options: Dict[str, Any] = {
+            "maxPoolSize": max_pool_size,
+            "minPoolSize": min_pool_size,
+            "waitQueueTimeoutMS": wait_queue_timeout_ms,
+            "readPreference": read_preference,
+        }
+        if compressors:
+            self._options["compressors"] = compressors
+        self.min_pool_size = min_pool_size
+        self.metrics = PoolMetrics()
+        self.client: Optional[AsyncIOMotorClient] = None
+
+    @property
+    def db(self) -> AsyncIOMotorDatabase:
+        if self.client is None:
+            raise RuntimeError("MongoDB client not open; it is created in the app lifespan")
+        return self.client[self._db_name]
+
+    def open(self) -> None:
+        """Create the client. No I/O: connections are made on first use or by warm()."""
+        if self.client is None:
+            self.metrics = PoolMetrics()
+            self.client = AsyncIOMotorClient(self._url, event_listeners=[self.metrics], **self._options)
+
+    async def warm(self) -> None:
+        """Ping the deployment and open min_pool_size connections concurrently."""
+        pings = max(1, self.min_pool_size)
+        await asyncio.gather(*(self.client.admin.command("ping") for _ in range(pings)))
+
+    def close(self) -> None:
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool options and checkout metrics for monitoring."""
+        return {
+            "open": self.client is not None,
+            "max_pool_size": self._options["maxPoolSize"],
+            "min_pool_size": self._options["minPoolSize"],
+            "wait_queue_timeout_ms": self._options["waitQueueTimeoutMS"],
+            **self.metrics.stats(),
+        }
+
+
+# The worker's connection; server.py opens and closes it in the app lifespan
+mongo = MongoConnection(
+    settings.MONGO_URL,
+    settings.DB_NAME,
+    max_pool_size=settings.MONGO_MAX_POOL_SIZE,
+    min_pool_size=settings.MONGO_MIN_POOL_SIZE,
+    wait_queue_timeout_ms=settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+    compressors=settings.MONGO_COMPRESSORS,
+    read_preference=settings.MONGO_READ_PREFERENCE,
+)
@@ -0,0 +1,105 @@
+"""
+Keyset (cursor) pagination for Mongo list endpoints.
+
+Pages are fetched with a range filter on the sort keys instead of skip(),
+so each page costs one bounded index scan no matter how deep it is:
+
+    sort [("created_at", -1), ("id", -1)], last row (T, I) ->
+    {"$or": [{"created_at": {"$lt": T}}, {"created_at": T, "id": {"$lt": I}}]}
+
+The last key must be unique so ties on the leading keys never skip or
+repeat rows. Cursors are opaque url-safe base64 JSON holding the last
+row's key values, the next page number and the total, so key values
+must be JSON types (consultation created_at is stored as an ISO string).
+The total is counted once, for the first page, and carried forward:
+counting on every page would scan all matches each time, and a walk
+reports the total as of when it started.
+"""
+
+import base64
+import binascii
+import json
+import math
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from models.schemas import PaginatedResponse
+
+SortKeys = Sequence[Tuple[str, int]]
+
+DEFAULT_PER_PAGE = 20
+MAX_PER_PAGE = 100
+
+
+class InvalidCursor(ValueError):
+    """Cursor could not be decoded or does not match the sort keys"""
+
+
+def encode_cursor(values: List[Any], page: int, total: int) -> str:
+    raw = json.dumps({"v": values, "p": page, "t": total}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: SortKeys) -> Tuple[List[Any], int, int]:
+    """Return (last key values, page number, total) from a cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        data = json.loads(raw)
+        values, page, total = data["v"], int(data["p"]), int(data["t"])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(values, list) or len(values) != len(sort) or page < 2 or total < 0:
+        raise InvalidCursor("Cursor does not match this listing")
+    return values, page, total
+
+
+def keyset_filter(sort: SortKeys, values: List[Any]) -> Dict[str, Any]:
+    """Filter matching rows strictly after `values` in `sort` order."""
+    branches = []
+    for i, (field, direction) in enumerate(sort):
+        branch = {prev: value for (prev, _), value in zip(sort[:i], values)}
+        branch[field] = {"$gt" if direction > 0 else "$lt": values[i]}
+        branches.append(branch)
+    return {"$or": branches}
+
+
+async def paginate(
+    collection,
+    query: Dict[str, Any],
+    sort: SortKeys,
+    per_page: int = DEFAULT_PER_PAGE,
+    cursor: Optional[str] = None,
+    projection: Optional[Dict[str, Any]] = None,
+) -> PaginatedResponse:
+    """
+    Fetch one page of `collection` matching `query`, ordered by `sort`.
+    Raises InvalidCursor for a cursor that cannot be used.
+    """
+    page, total = 1, None
+    find_query = query
+    if cursor:
+        values, page, total = decode_cursor(cursor, sort)
+        after = keyset_filter(sort, values)
+        find_query = {"$and": [query, after]} if query else after
+
+    # Sort keys must come back even if the caller's projection omits them
+    projection = dict(projection or {"_id": 0})
+    if any(v for v in projection.values() if v != 0):
+        projection.update({field: 1 for field, _ in sort})
+
+    # One extra row tells us whether a next page exists without a second query
+    items = await collection.find(find_query, projection).sort(list(sort)).limit(per_page + 1).to_list(per_page + 1)
+    if total is None:
+        total = await collection.count_documents(query)
+    next_cursor = None
+    if len(items) > per_page:
+        items = items[:per_page]
+        next_cursor = encode_cursor([items[-1].get(field) for field, _ in sort], page + 1, total)
+
+    return PaginatedResponse(
+        items=items,
+        total=total,
+        page=page,
+        per_page=per_page,
+        pages=math.ceil(total / per_page),
+        next_cursor=next_cursor,
+    )
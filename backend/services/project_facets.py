@@ -0,0 +1,150 @@
+"""
+Materialized project facets (technologies, industries) with counts.
+
+One document per facet value in the `project_facets` collection:
+    {"facet": "technology", "value": "FPGA", "count": 3}
+
+Project writes apply count deltas with $inc, so reads are a single
+indexed find on (facet, value) (see services/db_indexes.py) instead of a scan over every project.
+Values are stored as documents rather than as keys of one map because
+names such as "Endustri 4.0" contain dots, which Mongo field paths forbid.
+
+If the collection is empty (fresh deploy, manual wipe) reads fall back to
+a $unwind/$group aggregation over projects and rebuild the facets with
+upserts, never by emptying the collection first.
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from pymongo import DeleteMany, UpdateOne
+
+FACETS_COLLECTION = "project_facets"
+
+# facet name -> (project field, is array)
+FACET_FIELDS: Dict[str, Tuple[str, bool]] = {
+    "technology": ("technologies", True),
+    "industry": ("client_industry", False),
+}
+
+
+def _facet_values(project: Optional[Mapping[str, Any]]) -> Counter:
+    """(facet, value) pairs a project contributes, each counted once."""
+    pairs: Counter = Counter()
+    if not project:
+        return pairs
+    for facet, (field, is_array) in FACET_FIELDS.items():
+        raw = project.get(field)
+        values = {v for v in raw or [] if v} if is_array else ({raw} if raw else set())
+        for value in values:
+            pairs[(facet, value)] += 1
+    return pairs
+
+
+def facet_deltas(
+    old: Optional[Mapping[str, Any]],
+    new: Optional[Mapping[str, Any]],
+) -> Dict[Tuple[str, str], int]:
+    """
+    Count changes caused by replacing `old` with `new`.
+    Pass old=None for an insert and new=None for a delete.
+    """
+    deltas = Counter(_facet_values(new))
+    deltas.subtract(_facet_values(old))
+    return {pair: delta for pair, delta in deltas.items() if delta}
+
+
+async def apply_project_change(
+    db,
+    old: Optional[Mapping[str, Any]],
+    new: Optional[Mapping[str, Any]],
+) -> None:
+    """Apply the facet count deltas of one project write."""
+    await apply_project_changes(db, [(old, new)])
+
+
+async def apply_project_changes(
+    db,
+    changes: Iterable[Tuple[Optional[Mapping[str, Any]], Optional[Mapping[str, Any]]]],
+) -> None:
+    """Apply the summed facet count deltas of several (old, new) writes in one bulk_write."""
+    total: Counter = Counter()
+    for old, new in changes:
+        total.update(facet_deltas(old, new))
+    deltas = {pair: delta for pair, delta in total.items() if delta}
+    if not deltas:
+        return
+    await db[FACETS_COLLECTION].bulk_write(
+        [
+            UpdateOne({"facet": facet, "value": value}, {"$inc": {"count": delta}}, upsert=True)
+            for (facet, value), delta in deltas.items()
+        ],
+        ordered=False,
+    )
+
+
+def _aggregation_pipeline(facet: str) -> List[Dict[str, Any]]:
+    field, is_array = FACET_FIELDS[facet]
+    if is_array:
+        # Dedupe within a project before unwinding, matching _facet_values
+        pipeline: List[Dict[str, Any]] = [
+            {"$match": {field: {"$type": "array"}}},
+            {"$project": {"_id": 0, "v": {"$setUnion": [f"${field}", []]}}},
+            {"$unwind": "$v"},
+        ]
+    else:
+        pipeline = [{"$project": {"_id": 0, "v": f"${field}"}}]
+    pipeline += [
+        {"$match": {"v": {"$nin": [None, ""]}}},
+        {"$group": {"_id": "$v", "count": {"$sum": 1}}},
+        {"$sort": {"_id": 1}},
+    ]
+    return pipeline
+
+
+async def aggregate_facet(db, facet: str) -> List[Dict[str, Any]]:
+    """Compute one facet's counts directly from the projects collection."""
+    cursor = db.projects.aggregate(_aggregation_pipeline(facet))
+    return [{"value": doc["_id"], "count": doc["count"]} async for doc in cursor]
+
+
+async def rebuild_facets(db) -> None:
+    """
+    Recompute every facet from projects and replace the materialized documents.
+    Counts are overwritten in place and only then are values no project has
+    any more deleted, so readers never see an empty collection and
+    concurrent rebuilds converge on the same counts.
+    """
+    operations: List[Any] = []
+    for facet in FACET_FIELDS:
+        values = []
+        for entry in await aggregate_facet(db, facet):
+            values.append(entry["value"])
+            operations.append(UpdateOne(
+                {"facet": facet, "value": entry["value"]},
+                {"$set": {"count": entry["count"]}},
+                upsert=True,
+            ))
+        operations.append(DeleteMany({"facet": facet, "value": {"$nin": values}}))
+    await db[FACETS_COLLECTION].bulk_write(operations, ordered=True)
+
+
+async def get_facet_counts(db, facet: str) -> List[Dict[str, Any]]:
+    """
+    Facet values with counts, sorted by value.
+    Served from the materialized collection; falls back to aggregation
+    (and rebuilds) if it has never been populated.
+    """
+    cursor = db[FACETS_COLLECTION].find(
+        {"facet": facet, "count": {"$gt": 0}},
+        {"_id": 0, "value": 1, "count": 1},
+    ).sort("value", 1)
+    counts = await cursor.to_list(None)
+    if counts:
+        return counts
+
+    if await db[FACETS_COLLECTION].estimated_document_count() == 0:
+        counts = await aggregate_facet(db, facet)
+        if counts:
+            await rebuild_facets(db)
+    return counts
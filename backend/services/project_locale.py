@@ -0,0 +1,68 @@
+"""
+Locale projection for project documents.
+
+Projects store Turkish text under the base field names and English text
+under `<field>_en`, at the top level and inside each phase. For `tr`
+the English fields are projected out in Mongo; for `en` English fields
+are renamed onto the base names, so both locales share one response
+shape:
+
+    tr: {"title": "Yuksek Hizli FPGA ...", ...}
+    en: {"title": "High-Speed FPGA ...", ...}
+
+A missing or empty English translation falls back to the Turkish text,
+so required fields are never absent from an `en` response. That is why
+`en` still fetches the Turkish fields.
+"""
+
+from typing import Any, Dict, Iterable, List, Literal, Optional
+
+Locale = Literal["tr", "en"]
+
+TRANSLATION_SUFFIX = "_en"
+LOCALIZED_FIELDS = (
+    "title", "subtitle", "client_industry",
+    "challenge_text", "solution_text", "approach_text", "results_text",
+)
+LOCALIZED_PHASE_FIELDS = ("title", "description")
+
+_PATHS = [*LOCALIZED_FIELDS, *(f"phases.{field}" for field in LOCALIZED_PHASE_FIELDS)]
+
+
+def locale_projection(locale: Optional[Locale]) -> Dict[str, int]:
+    """Exclusion projection dropping English fields for tr (both kept for en, as fallback, and None)."""
+    excluded = [path + TRANSLATION_SUFFIX for path in _PATHS] if locale == "tr" else []
+    return {"_id": 0, **{path: 0 for path in excluded}}
+
+
+def field_projection(fields: Iterable[str], locale: Optional[Locale]) -> Dict[str, int]:
+    """
+    Inclusion projection of `fields`, which may name both a localized
+    field and its `_en` twin; for tr the `_en` twin is dropped.
+    """
+    fields = list(fields)
+    if locale == "tr":
+        fields = [f for f in fields if not (f.endswith(TRANSLATION_SUFFIX) and f[:-len(TRANSLATION_SUFFIX)] in LOCALIZED_FIELDS)]
+    return {"_id": 0, **{field: 1 for field in fields}}
+
+
+def _rename(doc: Dict[str, Any], fields) -> None:
+    for field in fields:
+        translated = doc.pop(field + TRANSLATION_SUFFIX, None)
+        if translated:
+            doc[field] = translated
+
+
+def localize(doc: Dict[str, Any], locale: Optional[Locale]) -> Dict[str, Any]:
+    """Map a document fetched with locale_projection or field_projection onto the base field names."""
+    if locale == "en" and doc:
+        _rename(doc, LOCALIZED_FIELDS)
+        for phase in doc.get("phases") or []:
+            _rename(phase, LOCALIZED_PHASE_FIELDS)
+    return doc
+
+
+def localize_all(docs: List[Dict[str, Any]], locale: Optional[Locale]) -> List[Dict[str, Any]]:
+    for doc in docs:
+        localize(doc, locale)
+    return docs
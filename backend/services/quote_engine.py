@@ -0,0 +1,414 @@
+"""
+Vectorized PCB/SMT quote engine.
+
+Every option set is priced column-wise with NumPy, so a single quote and a
+batch of ten thousand go through the same code path. Factor tables
+(finishes, colors, layers, stencils, lead times, tolerances) are the
+current form options from api/config_routes.py; engine-only base rates
+live at the top of this module.
+
+Pipeline:
+  options -> columns (one ndarray per field) -> cost arrays + rule masks
+          -> per-row result dicts
+"""
+
+import hashlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.config_routes import FORM_LIMITS, current_form_options
+from models.schemas import ConfigOption, PCBQuoteOptions
+
+
+CURRENCY = "TRY"
+
+# =====================================================
+# BASE RATES
+# =====================================================
+
+PCB_SETUP_FEE = 500.0
+PCB_RATE_PER_CM2 = 0.25
+IMPEDANCE_FACTOR = 1.12
+E_TEST_SETUP_FEE = 150.0
+E_TEST_PER_BOARD = 0.5
+
+SMT_SETUP_FEE = 1500.0
+SMT_FEEDER_FEE = 25.0            # per unique part
+SMT_PLACEMENT_COST = 0.35        # per component per board
+SMT_BGA_COST = 12.0              # per BGA per board
+SMT_DOUBLE_SIDE_FACTOR = 1.6
+SMT_01005_FACTOR = 1.3
+AOI_PER_BOARD = 2.0
+XRAY_PER_BOARD = 15.0
+
+THICKNESS_FACTORS = {
+    "0.4": 1.3, "0.6": 1.2, "0.8": 1.1, "1": 1.05,
+    "1.2": 1.0, "1.6": 1.0, "2": 1.1, "2.4": 1.2,
+}
+COPPER_FACTORS = {"0.5": 0.95, "1": 1.0, "2": 1.35, "3": 1.7}
+SOURCING_FACTORS = {"turnkey": 1.0, "consigned": 0.85, "partial": 0.93}
+
+# Quantity price breaks: boards at or above VOLUME_BREAKS[i] get VOLUME_DISCOUNTS[i]
+VOLUME_BREAKS = np.array([1, 10, 50, 100, 500, 1000, 5000, 10000])
+VOLUME_DISCOUNTS = np.array([1.0, 0.92, 0.85, 0.78, 0.70, 0.64, 0.58, 0.52])
+
+# Price-break curves are cached per option hash (quantity excluded)
+CURVE_CACHE_SIZE = 256
+CURVE_DEFAULT_POINTS = 200
+
+
+# =====================================================
+# DFM / WARNING RULES
+# =====================================================
+
+# (code, penalty, message) — masks are computed in QuoteEngine._rule_masks
+RULES: Tuple[Tuple[str, int, str], ...] = (
+    ("ultra_fine_track", 15, "Ultra-fine track/space (<0.10mm) requires HDI processing"),
+    ("tight_track", 5, "Tight track/space (<0.15mm) increases fabrication cost"),
+    ("high_layer_count", 10, "10+ layer stackups need engineering review before fabrication"),
+    ("impedance_controlled", 5, "Impedance control requires stackup confirmation"),
+    ("prototype_high_layers", 5, "Low quantity for an 8+ layer board, setup cost dominates unit price"),
+    ("small_board", 10, "Boards under 20mm need panelization for assembly"),
+    ("micro_components", 15, "01005 components require fine-pitch placement and inspection"),
+    ("bga_without_xray", 15, "BGA assembly without X-ray inspection cannot verify hidden joints"),
+    ("assembly_without_stencil", 10, "SMT assembly without a stencil falls back to manual paste"),
+    ("no_e_test_multilayer", 5, "Electrical test is recommended for 4+ layer boards"),
+    ("unknown_option", 0, "Unknown option value, standard pricing applied"),
+)
+
+
+def _grade(score: int) -> str:
+    """Map a DFM score to a letter grade."""
+    if score >= 90:
+        return "A"
+    if score >= 80:
+        return "B"
+    if score >= 70:
+        return "C"
+    if score >= 60:
+        return "D"
+    return "F"
+
+
+class _FactorTable:
+    """
+    Categorical lookup encoded for NumPy.
+    Unknown values map to index -1, which hits the trailing default factor.
+    """
+
+    def __init__(self, factors: Mapping[str, float], default: float = 1.0) -> None:
+        self.index = {key: i for i, key in enumerate(factors)}
+        self.factors = np.array([*factors.values(), default], dtype=np.float64)
+
+    def encode(self, values: Sequence[str]) -> np.ndarray:
+        index = self.index
+        return np.fromiter((index.get(v, -1) for v in values), dtype=np.int64, count=len(values))
+
+    def lookup(self, codes: np.ndarray) -> np.ndarray:
+        return self.factors[codes]
+
+
+def _option_factors(options: Sequence[ConfigOption], missing: float = 1.0) -> Dict[str, float]:
+    return {
+        o.value: float(o.price_factor) if o.price_factor is not None else missing
+        for o in options
+    }
+
+
+class QuoteEngine:
+    """
+    Prices option sets as NumPy column arrays.
+    Construct once from the factor tables; instances are immutable and
+    safe to share across requests.
+    """
+
+    def __init__(
+        self,
+        finishes: Sequence[ConfigOption],
+        colors: Sequence[ConfigOption],
+        layers: Sequence[ConfigOption],
+        stencils: Sequence[ConfigOption],
+        lead_times: Mapping[str, Mapping[str, Any]],
+        tolerances: Mapping[str, Mapping[str, Any]],
+    ) -> None:
+        self._finish = _FactorTable(_option_factors(finishes))
+        self._color = _FactorTable(_option_factors(colors))
+        self._layers = _FactorTable(_option_factors(layers))
+        self._stencil = _FactorTable(_option_factors(stencils, missing=0.0), default=0.0)
+        self._thickness = _FactorTable(THICKNESS_FACTORS)
+        self._copper = _FactorTable(COPPER_FACTORS)
+        self._sourcing = _FactorTable(SOURCING_FACTORS)
+        self._lead_time = _FactorTable({k: v["factor"] for k, v in lead_times.items()})
+        self._lead_time_days = [v.get("days") for v in lead_times.values()] + [None]
+
+        # Tolerance tiers sorted loosest first: the first tier whose min_mm
+        # the track/space satisfies wins, anything finer gets the last tier.
+        tiers = sorted(tolerances.values(), key=lambda t: t["min_mm"], reverse=True)
+        self._tolerance_mins = np.array([t["min_mm"] for t in tiers], dtype=np.float64)
+        self._tolerance_factors = np.array([t["factor"] for t in tiers], dtype=np.float64)
+
+        self._curve_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    # -------------------------------------------------
+    # Column encoding
+    # -------------------------------------------------
+
+    def to_columns(self, options: Sequence[PCBQuoteOptions]) -> Dict[str, np.ndarray]:
+        """Encode a sequence of option models into one array per field."""
+        n = len(options)
+
+        def num(field: str, dtype=np.float64) -> np.ndarray:
+            return np.fromiter((getattr(o, field) for o in options), dtype=dtype, count=n)
+
+        def text(field: str) -> List[str]:
+            return [getattr(o, field) for o in options]
+
+        def gauge(field: str) -> List[str]:
+            return [f"{getattr(o, field):g}" for o in options]
+
+        return {
+            "quantity": num("quantity", np.int64),
+            "layers": num("layers", np.int64),
+            "layers_code": self._layers.encode([str(o.layers) for o in options]),
+            "thickness_code": self._thickness.encode(gauge("thickness_mm")),
+            "copper_code": self._copper.encode(gauge("copper_oz")),
+            "finish_code": self._finish.encode(text("finish")),
+            "color_code": self._color.encode(text("solder_mask_color")),
+            "min_track_space_mm": num("min_track_space_mm"),
+            "impedance_controlled": num("impedance_controlled", bool),
+            "e_test": num("e_test", bool),
+            "board_width_mm": num("board_width_mm"),
+            "board_height_mm": num("board_height_mm"),
+            "assembly_required": num("assembly_required", bool),
+            "double_sided": np.fromiter((o.sides == "double" for o in options), dtype=bool, count=n),
+            "component_count": num("component_count"),
+            "unique_parts": num("unique_parts"),
+            "bga_count": num("bga_count"),
+            "uses_01005": num("uses_01005", bool),
+            "stencil_code": self._stencil.encode(text("stencil")),
+            "inspection_aoi": num("inspection_aoi", bool),
+            "inspection_xray": num("inspection_xray", bool),
+            "sourcing_code": self._sourcing.encode(text("sourcing")),
+            "lead_time_code": self._lead_time.encode(text("lead_time")),
+        }
+
+    # -------------------------------------------------
+    # Pricing
+    # -------------------------------------------------
+
+    def _tolerance_factor(self, track: np.ndarray) -> np.ndarray:
+        # Number of tiers the track fails; clipped so the finest tier absorbs the rest
+        tier = np.sum(track[..., None] < self._tolerance_mins, axis=-1)
+        return self._tolerance_factors[np.minimum(tier, len(self._tolerance_factors) - 1)]
+
+    def price_columns(self, cols: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """
+        Price encoded columns. All inputs broadcast against each other, so a
+        single option set can be priced across a quantity vector unchanged.
+        """
+        qty = cols["quantity"]
+        area_cm2 = cols["board_width_mm"] * cols["board_height_mm"] / 100.0
+
+        board_rate = (
+            area_cm2 * PCB_RATE_PER_CM2
+            * self._layers.lookup(cols["layers_code"])
+            * self._finish.lookup(cols["finish_code"])
+            * self._color.lookup(cols["color_code"])
+            * self._thickness.lookup(cols["thickness_code"])
+            * self._copper.lookup(cols["copper_code"])
+            * self._tolerance_factor(cols["min_track_space_mm"])
+            * np.where(cols["impedance_controlled"], IMPEDANCE_FACTOR, 1.0)
+        )
+        volume = VOLUME_DISCOUNTS[np.searchsorted(VOLUME_BREAKS, qty, side="right") - 1]
+        e_test = np.where(cols["e_test"], E_TEST_SETUP_FEE + E_TEST_PER_BOARD * qty, 0.0)
+        pcb = PCB_SETUP_FEE + board_rate * volume * qty + e_test
+
+        assembly = cols["assembly_required"]
+        double = cols["double_sided"]
+        smt_setup = (SMT_SETUP_FEE + SMT_FEEDER_FEE * cols["unique_parts"]) * np.where(
+            double, SMT_DOUBLE_SIDE_FACTOR, 1.0
+        )
+        per_board = (
+            cols["component_count"] * SMT_PLACEMENT_COST
+            * np.where(cols["uses_01005"], SMT_01005_FACTOR, 1.0)
+            + cols["bga_count"] * SMT_BGA_COST
+            + np.where(cols["inspection_aoi"], AOI_PER_BOARD, 0.0)
+            + np.where(cols["inspection_xray"], XRAY_PER_BOARD, 0.0)
+        )
+        smt = np.where(
+            assembly,
+            (smt_setup + per_board * volume * qty) * self._sourcing.lookup(cols["sourcing_code"]),
+            0.0,
+        )
+        stencil = np.where(assembly, self._stencil.lookup(cols["stencil_code"]), 0.0)
+
+        subtotal = pcb + smt + stencil
+        lead_time = subtotal * (self._lead_time.lookup(cols["lead_time_code"]) - 1.0)
+        total = subtotal + lead_time
+
+        return {
+            "pcb": pcb,
+            "smt": smt,
+            "stencil": stencil,
+            "lead_time": lead_time,
+            "total": total,
+            "unit_price": total / qty,
+        }
+
+    def _rule_masks(self, cols: Mapping[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Boolean mask per rule code, aligned with RULES."""
+        track = cols["min_track_space_mm"]
+        layers = cols["layers"]
+        assembly = cols["assembly_required"]
+        fine_tier = self._tolerance_mins[min(1, len(self._tolerance_mins) - 1)]
+        codes = ("finish_code", "color_code", "stencil_code", "sourcing_code", "lead_time_code")
+
+        return {
+            "ultra_fine_track": track < fine_tier,
+            "tight_track": (track >= fine_tier) & (track < self._tolerance_mins[0]),
+            "high_layer_count": layers >= 10,
+            "impedance_controlled": cols["impedance_controlled"],
+            "prototype_high_layers": (layers >= 8) & (cols["quantity"] < 5),
+            "small_board": (cols["board_width_mm"] < 20) | (cols["board_height_mm"] < 20),
+            "micro_components": assembly & cols["uses_01005"],
+            "bga_without_xray": assembly & (cols["bga_count"] > 0) & ~cols["inspection_xray"],
+            "assembly_without_stencil": assembly & (self._stencil.lookup(cols["stencil_code"]) == 0),
+            "no_e_test_multilayer": (layers >= 4) & ~cols["e_test"],
+            "unknown_option": np.logical_or.reduce([cols[c] < 0 for c in codes]),
+        }
+
+    def analyze_columns(self, cols: Mapping[str, np.ndarray], n: int) -> Tuple[List[List[str]], np.ndarray]:
+        """Return per-row warning messages and DFM scores."""
+        masks = self._rule_masks(cols)
+        warnings: List[List[str]] = [[] for _ in range(n)]
+        penalty = np.zeros(n, dtype=np.int64)
+        for code, rule_penalty, message in RULES:
+            mask = np.broadcast_to(masks[code], (n,))
+            for i in np.flatnonzero(mask).tolist():
+                warnings[i].append(message)
+            penalty += mask * rule_penalty
+        return warnings, np.maximum(0, 100 - penalty)
+
+    # -------------------------------------------------
+    # Public API
+    # -------------------------------------------------
+
+    def quote_many(self, options: Sequence[PCBQuoteOptions], analysis: bool = False) -> List[Dict[str, Any]]:
+        """Price a batch of option sets. Results are returned in input order."""
+        n = len(options)
+        if n == 0:
+            return []
+        cols = self.to_columns(options)
+        costs = {k: np.round(v, 2).tolist() for k, v in self.price_columns(cols).items()}
+        warnings, scores = self.analyze_columns(cols, n)
+        days = [self._lead_time_days[c] for c in cols["lead_time_code"].tolist()]
+        quantities = cols["quantity"].tolist()
+
+        results = []
+        for i in range(n):
+            result = {
+                "total": costs["total"][i],
+                "unit_price": costs["unit_price"][i],
+                "quantity": quantities[i],
+                "currency": CURRENCY,
+                "lead_time_days": days[i],
+                "breakdown": {
+                    "pcb": costs["pcb"][i],
+                    "smt": costs["smt"][i],
+                    "stencil": costs["stencil"][i],
+                    "lead_time": costs["lead_time"][i],
+                },
+                "warnings": warnings[i],
+            }
+            if analysis:
+                score = int(scores[i])
+                result["dfm_analysis"] = {"score": score, "grade": _grade(score), "issues": warnings[i]}
+            results.append(result)
+        return results
+
+    def quote(self, options: PCBQuoteOptions, analysis: bool = False) -> Dict[str, Any]:
+        """Price a single option set."""
+        return self.quote_many([options], analysis=analysis)[0]
+
+    def price_curve(self, options: PCBQuoteOptions, points: int = CURVE_DEFAULT_POINTS) -> Dict[str, Any]:
+        """
+        Price one option set across the whole FORM_LIMITS quantity range.
+
+        Sample quantities are log-spaced, plus every volume break and the
+        quantity just below it so each step in the curve is visible. The
+        option set is encoded once and broadcast against the quantity
+        vector. Results are cached by option hash; `options.quantity` is
+        ignored.
+        """
+        key = hashlib.blake2b(
+            f"{points}:{options.model_dump_json(exclude={'quantity'})}".encode(),
+            digest_size=16,
+        ).hexdigest()
+        cached = self._curve_cache.get(key)
+        if cached is not None:
+            self._curve_cache.move_to_end(key)
+            return cached
+
+        limits = FORM_LIMITS["quantity"]
+        quantities = curve_quantities(limits["min"], limits["max"], points)
+        cols = self.to_columns([options])
+        cols["quantity"] = quantities
+        costs = self.price_columns(cols)
+
+        breaks = VOLUME_BREAKS[(VOLUME_BREAKS >= limits["min"]) & (VOLUME_BREAKS <= limits["max"])]
+        break_idx = np.searchsorted(quantities, breaks)
+        curve = {
+            "currency": CURRENCY,
+            "lead_time_days": self._lead_time_days[int(cols["lead_time_code"][0])],
+            "quantities": quantities.tolist(),
+            "total": np.round(costs["total"], 2).tolist(),
+            "unit_price": np.round(costs["unit_price"], 2).tolist(),
+            "price_breaks": [
+                {"quantity": int(q), "unit_price": round(float(costs["unit_price"][i]), 2)}
+                for q, i in zip(breaks, break_idx)
+            ],
+        }
+
+        self._curve_cache[key] = curve
+        if len(self._curve_cache) > CURVE_CACHE_SIZE:
+            self._curve_cache.popitem(last=False)
+        return curve
+
+
+def curve_quantities(q_min: int, q_max: int, points: int) -> np.ndarray:
+    """Sorted unique sample quantities for a price-break curve."""
+    sampled = np.rint(np.geomspace(q_min, q_max, points)).astype(np.int64)
+    quantities = np.unique(np.concatenate([sampled, VOLUME_BREAKS, VOLUME_BREAKS - 1]))
+    return quantities[(quantities >= q_min) & (quantities <= q_max)]
+
+
+def build_quote_engine(
+    finishes: Optional[Sequence[ConfigOption]] = None,
+    colors: Optional[Sequence[ConfigOption]] = None,
+    layers: Optional[Sequence[ConfigOption]] = None,
+    stencils: Optional[Sequence[ConfigOption]] = None,
+    lead_times: Optional[Mapping[str, Mapping[str, Any]]] = None,
+    tolerances: Optional[Mapping[str, Mapping[str, Any]]] = None,
+) -> QuoteEngine:
+    """Build an engine, defaulting every table to the current form options."""
+    current = current_form_options()
+    return QuoteEngine(
+        finishes=finishes or current.finishes,
+        colors=colors or current.colors,
+        layers=layers or current.layers,
+        stencils=stencils or current.stencils,
+        lead_times=lead_times or current.lead_times,
+        tolerances=tolerances or current.tolerances,
+    )
+
+
+@lru_cache()
+def get_quote_engine() -> QuoteEngine:
+    """
+    Get the process-wide engine built from the current form options.
+    server.py clears this cache on every config version.
+    """
+    return build_quote_engine()
@@ -0,0 +1,186 @@
+"""
+Readiness probe: cached dependency pings.
+
+Kubernetes probes readiness every few seconds on every pod. Pinging Mongo
+and Redis inside each probe would put their latency (or a hung server's
+timeout) on the probe and load on the servers in proportion to the probe
+rate. Instead one background task pings every dependency each `interval`,
+concurrently and each under `timeout`, and the endpoint serves the last
+results; they are considered stale (not ready) if the task stops
+reporting.
+
+A ping that outlives its timeout is reported as failed but not cancelled:
+the next round waits on the same attempt rather than starting another,
+so a hung dependency never piles up pings (Motor runs commands on
+executor threads that cancellation does not stop).
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+from services.mongo import percentile
+
+logger = logging.getLogger(__name__)
+
+# Successful ping latencies kept per dependency for percentiles
+LATENCY_SAMPLES = 256
+
+
+class DependencyCheck:
+    """One dependency's ping, its last outcome and recent latencies."""
+
+    def __init__(
+        self,
+        name: str,
+        ping: Callable[[], Awaitable[Any]],
+        required: bool = True,
+        samples: int = LATENCY_SAMPLES,
+    ) -> None:
+        self.name = name
+        self.ping = ping
+        self.required = required
+        self.latencies_ms: Deque[float] = deque(maxlen=samples)
+        self.ok: Optional[bool] = None
+        self.error: Optional[str] = None
+        self.latency_ms: Optional[float] = None
+        self.failures = 0
+        self._inflight: Optional[asyncio.Future] = None
+
+    async def _timed_ping(self) -> float:
+        started = time.perf_counter()
+        await self.ping()
+        return (time.perf_counter() - started) * 1000
+
+    def _fail(self, error: str) -> None:
+        if self.ok is not False:
+            logger.warning(f"Readiness check {self.name} failing: {error}")
+        self.ok, self.error, self.latency_ms = False, error, None
+        self.failures += 1
+
+    async def run(self, timeout: float) -> None:
+        """Ping (or keep waiting on the previous ping) for up to `timeout` seconds."""
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._timed_ping())
+        try:
+            latency = await asyncio.wait_for(asyncio.shield(self._inflight), timeout)
+        except asyncio.TimeoutError:
+            self._fail(f"no response within {timeout:g}s")
+            return
+        except Exception as e:
+            self._inflight = None
+            self._fail(f"{type(e).__name__}: {e}"[:200])
+            return
+        self._inflight = None
+        if self.ok is False:
+            logger.info(f"Readiness check {self.name} recovered")
+        self.ok, self.error, self.latency_ms = True, None, round(latency, 3)
+        self.latencies_ms.append(latency)
+
+    def cancel(self) -> None:
+        if self._inflight is not None:
+            self._inflight.cancel()
+            self._inflight = None
+
+    def report(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "ok": self.ok,
+            "required": self.required,
+            "latency_ms": self.latency_ms,
+            "error": self.error,
+            "failures": self.failures,
+            "latency_percentiles_ms": {
+                "samples": len(latencies),
+                "p50": round(percentile(latencies, 0.50), 3),
+                "p95": round(percentile(latencies, 0.95), 3),
+                "p99": round(percentile(latencies, 0.99), 3),
+            },
+        }
+
+
+class RedisPing:
+    """Ping callable over its own Redis client, created on first use."""
+
+    def __init__(self, url: str, timeout: float) -> None:
+        self._url = url
+        self._timeout = timeout
+        self._redis = None
+
+    async def __call__(self) -> None:
+        if self._redis is None:
+            import redis.asyncio as aioredis
+            self._redis = aioredis.from_url(
+                self._url, socket_connect_timeout=self._timeout, socket_timeout=self._timeout
+            )
+        await self._redis.ping()
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.close()
+            self._redis = None
+
+
+class ReadinessProbe:
+    """Pings registered dependencies in the background; report() never does I/O."""
+
+    def __init__(self, interval: float = 5.0, timeout: float = 1.0) -> None:
+        self.interval = interval
+        self.timeout = timeout
+        self.checks: Dict[str, DependencyCheck] = {}
+        self.checked_at: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def stale_after(self) -> float:
+        """Age after which results no longer count, i.e. the task has stalled."""
+        return 3 * self.interval + self.timeout
+
+    def add(self, name: str, ping: Callable[[], Awaitable[Any]], required: bool = True) -> None:
+        """Register a dependency; an optional one is reported but does not gate readiness."""
+        self.checks[name] = DependencyCheck(name, ping, required)
+
+    async def check(self) -> None:
+        """Run one round of pings, concurrently."""
+        await asyncio.gather(*(check.run(self.timeout) for check in self.checks.values()))
+        self.checked_at = time.monotonic()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.check()
+            except Exception:
+                logger.exception("Readiness check round failed")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for check in self.checks.values():
+            check.cancel()
+            close = getattr(check.ping, "close", None)
+            if close is not None:
+                await close()
+
+    def report(self) -> Dict[str, Any]:
+        """Last results; ready only if they are fresh and every required check passed."""
+        age = None if self.checked_at is None else time.monotonic() - self.checked_at
+        fresh = age is not None and age <= self.stale_after
+        ready = fresh and all(check.ok for check in self.checks.values() if check.required)
+        return {
+            "ready": ready,
+            "checked_s_ago": round(age, 3) if age is not None else None,
+            "interval_s": self.interval,
+            "checks": {name: check.report() for name, check in self.checks.items()},
+        }
@@ -0,0 +1,255 @@
+"""
+Response cache for read-only endpoints.
+
+Two tiers:
+  - In-process: LRU dict with a short TTL, zero I/O on a hit
+  - Redis (optional): shared across workers with a longer TTL
+
+Entries are grouped by tag (e.g. "projects"). Each tag is one Redis hash,
+so invalidate(tag) is a single DEL that every worker observes on its next
+Redis read. Other workers' in-process entries still live out their
+(short) local TTL — keep it small where staleness matters.
+
+Each tag also has a generation, bumped by invalidate(): locally and as a
+Redis counter. cached() reads it before calling the route and stores the
+result only if it is unchanged, so a fill that read Mongo before an
+invalidation cannot put the old data back afterwards.
+
+If Redis cannot be reached, reads and fills skip the Redis tier for
+`redis_retry_seconds` instead of waiting out the connect timeout on
+every miss. Invalidations still try Redis, since a skipped one would
+leave other workers serving stale entries.
+"""
+
+import asyncio
+import inspect
+import json
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+logger = logging.getLogger(__name__)
+
+# Store into the tag's hash only if its generation counter is unchanged.
+# KEYS: tag hash, generation counter; ARGV: expected generation, key, envelope, ttl
+STORE_IF_CURRENT_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[2], ARGV[3])
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[4]))
+return 1
+"""
+
+# (local generation, Redis generation) of a tag, as read before a fill;
+# the Redis one is None if the Redis tier was skipped
+Generation = Tuple[int, Optional[str]]
+
+
+def _is_unreachable(error: Exception) -> bool:
+    """Whether a Redis error means the server could not be reached."""
+    try:
+        from redis.exceptions import ConnectionError, TimeoutError
+    except ImportError:
+        return isinstance(error, (OSError, asyncio.TimeoutError))
+    return isinstance(error, (ConnectionError, TimeoutError, OSError, asyncio.TimeoutError))
+
+
+class ResponseCache:
+    """Two-tier TTL cache for JSON-serializable route results."""
+
+    def __init__(
+        self,
+        ttl_seconds: float = 30.0,
+        max_entries: int = 1024,
+        redis_url: Optional[str] = None,
+        redis_ttl_seconds: int = 300,
+        namespace: str = "resp",
+        redis_retry_seconds: float = 30.0,
+    ) -> None:
+        self._ttl = ttl_seconds
+        self._max_entries = max_entries
+        self._redis_url = redis_url
+        self._redis_ttl = redis_ttl_seconds
+        self._namespace = namespace
+        self._redis_retry = redis_retry_seconds
+        self._redis_down_until = 0.0
+        self._redis = None
+        # (tag, key) -> (expires_at, value)
+        self._local: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = defaultdict(int)
+        self._store_if_current = None
+        self.hits = 0
+        self.misses = 0
+
+    async def _get_redis(self, during_outage: bool = False):
+        """
+        Lazy-initialize Redis; None if not configured or unreachable, or
+        (unless `during_outage`) while cooling down after a failure.
+        """
+        if not self._redis_url:
+            return None
+        if not during_outage and time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(
+                    self._redis_url,
+                    encoding="utf-8",
+                    decode_responses=True,
+                    socket_connect_timeout=2,
+                    socket_timeout=2,
+                )
+            except Exception as e:
+                logger.warning(f"Redis response cache unavailable: {e}")
+                return None
+        return self._redis
+
+    def _redis_failed(self, action: str, error: Exception) -> None:
+        """Log a Redis failure; if Redis is unreachable, skip it for a while."""
+        if not _is_unreachable(error):
+            logger.warning(f"Redis response cache {action} failed: {error}")
+            return
+        if time.monotonic() >= self._redis_down_until:
+            logger.warning(
+                f"Redis response cache {action} failed: {error}; skipping Redis for {self._redis_retry:g}s"
+            )
+        self._redis_down_until = time.monotonic() + self._redis_retry
+
+    def _redis_key(self, tag: str) -> str:
+        return f"{self._namespace}:{tag}"
+
+    def _generation_key(self, tag: str) -> str:
+        return f"{self._namespace}:{tag}:gen"
+
+    def _store_local(self, tag: str, key: str, value: Any) -> None:
+        self._local[(tag, key)] = (time.monotonic() + self._ttl, value)
+        self._local.move_to_end((tag, key))
+        if len(self._local) > self._max_entries:
+            self._local.popitem(last=False)
+
+    async def get(self, tag: str, key: str) -> Optional[Any]:
+        """Look up a cached value, local tier first."""
+        entry = self._local.get((tag, key))
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.monotonic():
+                self._local.move_to_end((tag, key))
+                self.hits += 1
+                return value
+            del self._local[(tag, key)]
+
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                raw = await redis.hget(self._redis_key(tag), key)
+                if raw is not None:
+                    envelope = json.loads(raw)
+                    if envelope["t"] + self._redis_ttl > time.time():
+                        self._store_local(tag, key, envelope["v"])
+                        self.hits += 1
+                        return envelope["v"]
+            except Exception as e:
+                self._redis_failed("read", e)
+
+        self.misses += 1
+        return None
+
+    async def generation(self, tag: str) -> Generation:
+        """The tag's current generation; pass it to set() after computing a value."""
+        redis_generation = None
+        redis = await self._get_redis()
+        if redis is not None:
+            try:
+                redis_generation = await redis.get(self._generation_key(tag)) or "0"
+            except Exception as e:
+                self._redis_failed("read", e)
+        return self._generations[tag], redis_generation
+
+    async def set(self, tag: str, key: str, value: Any, generation: Optional[Generation] = None) -> bool:
+        """
+        Store a value in both tiers. With `generation`, store only if the tag
+        has not been invalidated since it was read; returns whether stored.
+        A generation read while the Redis tier was skipped stores locally only.
+        """
+        if generation is not None and generation[0] != self._generations[tag]:
+            return False
+
+        redis = await self._get_redis()
+        if redis is not None and (generation is None or generation[1] is not None):
+            try:
+                envelope = json.dumps({"t": time.time(), "v": value}, default=str)
+                if generation is None:
+                    pipe = redis.pipeline()
+                    pipe.hset(self._redis_key(tag), key, envelope)
+                    pipe.expire(self._redis_key(tag), self._redis_ttl)
+                    await pipe.execute()
+                else:
+                    if self._store_if_current is None:
+                        self._store_if_current = redis.register_script(STORE_IF_CURRENT_SCRIPT)
+                    stored = await self._store_if_current(
+                        keys=[self._redis_key(tag), self._generation_key(tag)],
+                        args=[generation[1], key, envelope, self._redis_ttl],
+                    )
+                    if not stored:
+                        return False
+            except Exception as e:
+                self._redis_failed("write", e)
+
+        if generation is not None and generation[0] != self._generations[tag]:
+            return False
+        self._store_local(tag, key, value)
+        return True
+
+    async def invalidate(self, tag: str) -> None:
+        """Drop every entry for a tag, locally and in Redis, and bump its generation."""
+        self._generations[tag] += 1
+        for entry in [k for k in self._local if k[0] == tag]:
+            del self._local[entry]
+
+        redis = await self._get_redis(during_outage=True)
+        if redis is not None:
+            try:
+                pipe = redis.pipeline()
+                pipe.delete(self._redis_key(tag))
+                pipe.incr(self._generation_key(tag))
+                await pipe.execute()
+            except Exception as e:
+                self._redis_failed("invalidation", e)
+
+    def cached(self, tag: str) -> Callable:
+        """
+        Decorator caching an async route by function name plus arguments.
+        Route parameters are keyword arguments under FastAPI, so the key
+        covers path and query params. Exceptions (e.g. 404) are not cached.
+        """
+        def decorator(func: Callable) -> Callable:
+            signature = inspect.signature(func)
+
+            @wraps(func)
+            async def wrapper(*args, **kwargs):
+                # Bind so positional (legacy wrapper) and keyword calls share a key
+                bound = signature.bind(*args, **kwargs)
+                params = sorted((k, v) for k, v in bound.arguments.items() if v is not None)
+                key = f"{func.__name__}?{urlencode(params)}" if params else func.__name__
+                value = await self.get(tag, key)
+                if value is None:
+                    generation = await self.generation(tag)
+                    value = await func(*args, **kwargs)
+                    await self.set(tag, key, value, generation)
+                return value
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for monitoring."""
+        return {"entries": len(self._local), "hits": self.hits, "misses": self.misses}
+
+    async def close(self) -> None:
+        """Close the Redis connection."""
+        if self._redis:
+            await self._redis.close()
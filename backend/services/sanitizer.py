@@ -0,0 +1,43 @@
+"""
+Text sanitizer for user-provided form fields.
+
+Strips all HTML with bleach, then collapses whitespace. bleach runs a
+full html5lib parse, but for text without markup its output only differs
+from the input in a small, fixed set of characters: it escapes < > &
+and drops or replaces C0 control characters other than tab, LF and CR.
+Text containing none of those skips the parser, which is the common
+case for names and messages. tests/test_sanitizer.py fuzzes the two
+paths against each other. bleach (and html5lib) is imported on the
+first input that needs it rather than at startup.
+"""
+
+import re
+
+# Characters bleach rewrites in plain text; any of them forces the full parse
+_NEEDS_PARSE = re.compile(r"[<>&\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def clean_html(value: str) -> str:
+    """Full bleach pass: no tags, no attributes, tags and comments stripped."""
+    import bleach
+
+    return bleach.clean(
+        value,
+        tags=[],           # No HTML tags allowed
+        attributes={},     # No attributes allowed
+        strip=True,        # Remove tags entirely (don't escape)
+        strip_comments=True
+    )
+
+
+def sanitize_input(value: str) -> str:
+    """
+    Sanitize input to prevent XSS and injection attacks.
+    Strips all HTML tags and attributes and normalizes whitespace.
+    """
+    if not value:
+        return value
+    if _NEEDS_PARSE.search(value):
+        value = clean_html(value)
+    # split() with no argument also strips leading/trailing whitespace
+    return " ".join(value.split())
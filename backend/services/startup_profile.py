@@ -0,0 +1,146 @@
+"""
+Startup profiling: where cold-start time goes.
+
+Two views:
+  - Import time, per module, from `python -X importtime` in a subprocess
+    (the CLI below), so it covers everything importing server pulls in.
+  - Startup phases timed in-process. server.py wraps each startup step in
+    startup_profile.phase(); the report is served in the health response,
+    so time-to-healthy and time-to-warm can be read off a live worker.
+
+Usage (from backend/):
+    python -m services.startup_profile                 # import breakdown of server
+    python -m services.startup_profile --top 40 --module routers.quote
+    python -m services.startup_profile --lifespan      # also run startup/shutdown
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+class StartupProfile:
+    """Timed startup phases of this worker, relative to `started`."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.phases: List[Dict[str, Any]] = []
+        self.ready_ms: Optional[float] = None
+
+    def _since_start(self) -> float:
+        return round((time.perf_counter() - self.started) * 1000, 1)
+
+    def record(self, name: str, started: float, error: Optional[BaseException] = None) -> None:
+        entry = {
+            "name": name,
+            "at_ms": round((started - self.started) * 1000, 1),
+            "ms": round((time.perf_counter() - started) * 1000, 1),
+            "ok": error is None,
+        }
+        if error is not None:
+            entry["error"] = f"{type(error).__name__}: {error}"[:200]
+        self.phases.append(entry)
+
+    @asynccontextmanager
+    async def phase(self, name: str) -> AsyncIterator[None]:
+        """Time the enclosed startup step; failures are recorded and re-raised."""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(name, started, e)
+            raise
+        self.record(name, started)
+
+    def mark_ready(self) -> None:
+        """Record when the worker started accepting requests."""
+        self.ready_ms = self._since_start()
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "ready_ms": self.ready_ms,
+            "uptime_ms": self._since_start(),
+            "phases": list(self.phases),
+        }
+
+
+# Created when server.py starts importing (it imports this first), so
+# phase offsets include the application's own import time.
+startup_profile = StartupProfile()
+
+
+def import_breakdown(module: str = "server") -> List[Dict[str, Any]]:
+    """
+    Per-module import times of `import module` in a fresh interpreter,
+    slowest cumulative first. Times are microseconds.
+    """
+    env = {**os.environ, "MONGO_URL": os.environ.get("MONGO_URL", "mongodb://localhost:27017"),
+           "DB_NAME": os.environ.get("DB_NAME", "startup_profile")}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return parse_importtime(result.stderr)
+
+
+def parse_importtime(output: str) -> List[Dict[str, Any]]:
+    """Rows of `-X importtime` output, slowest cumulative first."""
+    rows = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append({"module": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us),
+                         "depth": len(indent) // 2})
+    return sorted(rows, key=lambda row: row["cumulative_us"], reverse=True)
+
+
+async def run_lifespan() -> Dict[str, Any]:
+    """Import server, run its startup and shutdown, and return the phase report."""
+    import server
+
+    async with server.app.router.lifespan_context(server.app):
+        # Failed steps retry until they succeed; report what ran so far
+        await server.wait_warm(timeout=60)
+    # server's instance: under -m this module is __main__, a separate copy
+    return server.startup_profile.report()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="server", help="module to import")
+    parser.add_argument("--top", type=int, default=25, help="modules to list")
+    parser.add_argument("--lifespan", action="store_true", help="also time startup phases against MONGO_URL")
+    args = parser.parse_args()
+
+    rows = import_breakdown(args.module)
+    total = rows[0]["cumulative_us"] if rows else 0
+    print(f"import {args.module}: {total / 1000:.0f} ms")
+    print(f"{'cumulative ms':>13} {'self ms':>8}  module")
+    for row in rows[:args.top]:
+        print(f"{row['cumulative_us'] / 1000:>13.1f} {row['self_us'] / 1000:>8.1f}  "
+              f"{'  ' * row['depth']}{row['module']}")
+
+    if args.lifespan:
+        logging.disable(logging.INFO)
+        report = asyncio.run(run_lifespan())
+        print(f"\nready after {report['ready_ms']} ms (from server import)")
+        print(f"{'at ms':>8} {'ms':>8}  phase")
+        for phase in report["phases"]:
+            status = "" if phase["ok"] else f"  FAILED: {phase['error']}"
+            print(f"{phase['at_ms']:>8} {phase['ms']:>8}  {phase['name']}{status}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""
+Write-behind queue for Mongo inserts.
+
+submit() appends the document to an on-disk journal, puts it on a
+bounded asyncio queue and returns; a background task drains the queue
+with insert_many in batches, retrying with capped backoff until Mongo
+accepts them. The request path never waits on the database.
+
+Journal: one NDJSON file per process, `{"add": doc}` on submit and
+`{"ack": [ids]}` once a batch is persisted. Each process holds an
+exclusive flock on its own file, taken before the file gets its
+journal name; at start, any journal whose lock can be taken belongs to
+a dead process and its unacked documents are re-queued. The orphan
+stays locked until it has been re-journaled and unlinked, so two
+workers starting together cannot both replay it. The journal is
+flushed per submit but not fsynced: entries survive a process crash or
+restart, while a host crash or power loss can lose the most recent
+ones. Replays may re-insert a document whose ack was lost; a unique
+index on `id_field` turns that into a duplicate-key error, which is
+treated as success.
+
+Only transient failures (network errors, failover, write concern) are
+retried. A document Mongo rejects for good (e.g. schema validation) is
+appended to `<name>.dead-letter.ndjson` in the journal directory and
+acked, so one bad document cannot stall the queue. Any other error
+while flushing a batch keeps the batch and retries it with backoff.
+"""
+
+import asyncio
+import fcntl
+import json
+import logging
+import os
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo.errors import BulkWriteError, ConnectionFailure, PyMongoError, WriteConcernError
+
+logger = logging.getLogger(__name__)
+
+DUPLICATE_KEY = 11000
+
+
+class QueueFull(Exception):
+    """Write-behind queue is at capacity; the caller should shed load"""
+
+
+class WriteBehindQueue:
+    """Bounded in-process queue flushing documents to a collection in batches."""
+
+    def __init__(
+        self,
+        collection,
+        journal_dir: str,
+        name: str,
+        max_size: int = 10000,
+        batch_size: int = 100,
+        max_retry_delay: float = 30.0,
+        id_field: str = "id",
+    ) -> None:
+        self._collection = collection
+        self._journal_dir = Path(journal_dir)
+        self._name = name
+        self._batch_size = batch_size
+        self._max_retry_delay = max_retry_delay
+        self._id_field = id_field
+        self._max_size = max_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._journal = None
+        self._task: Optional[asyncio.Task] = None
+        self._unacked = 0
+        self.persisted = 0
+        self.retries = 0
+        self.dead_lettered = 0
+        self.failed = 0  # failed flush attempts, retried
+
+    # ---------- journal ----------
+
+    def _write_journal(self, record: Dict[str, Any]) -> None:
+        self._journal.write(json.dumps(record, default=str) + "\n")
+        self._journal.flush()
+
+    def _read_journal(self, path: Path) -> List[Dict[str, Any]]:
+        """Documents added to a journal and never acked, in submit order."""
+        pending: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break  # torn final line from a crash mid-write
+                if "add" in record:
+                    doc = record["add"]
+                    pending[doc[self._id_field]] = doc
+                for acked in record.get("ack", []):
+                    pending.pop(acked, None)
+        return list(pending.values())
+
+    def _recover_orphans(self) -> Tuple[List[Dict[str, Any]], List[Tuple[Path, Any]]]:
+        """
+        Unacked documents from journals no live process holds, and those
+        journals with their files still open and locked; the caller unlinks
+        and then closes them.
+        """
+        recovered, orphans = [], []
+        for path in sorted(self._journal_dir.glob(f"{self._name}-*.ndjson")):
+            try:
+                f = open(path, encoding="utf-8")
+            except FileNotFoundError:
+                continue  # recovered by another worker meanwhile
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                # Another worker may have recovered and unlinked it between our open and flock
+                if os.fstat(f.fileno()).st_ino != os.stat(path).st_ino:
+                    raise FileNotFoundError(path)
+            except (BlockingIOError, FileNotFoundError):
+                f.close()  # owned by a running worker, or already recovered
+                continue
+            recovered += self._read_journal(path)
+            orphans.append((path, f))
+        return recovered, orphans
+
+    # ---------- lifecycle ----------
+
+    async def start(self, collection=None) -> int:
+        """
+        Open this process's journal, re-queue orphaned entries and start
+        flushing, into `collection` if given (for clients created at startup).
+        """
+        if collection is not None:
+            self._collection = collection
+        self._journal_dir.mkdir(parents=True, exist_ok=True)
+        recovered, orphans = self._recover_orphans()
+        self._queue = asyncio.Queue(maxsize=max(self._max_size, len(recovered)))
+
+        # Lock under a name recovery does not match, then rename into place:
+        # a journal recovery can see is always locked by its live owner
+        path = self._journal_dir / f"{self._name}-{os.getpid()}-{uuid.uuid4().hex[:8]}.ndjson"
+        staging = path.with_name(path.name + ".new")
+        self._journal = open(staging, "a", encoding="utf-8")
+        fcntl.flock(self._journal, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        os.rename(staging, path)
+
+        # Re-journal before deleting the orphans so a crash here loses nothing
+        for doc in recovered:
+            self._enqueue(doc)
+        for path, f in orphans:
+            path.unlink(missing_ok=True)
+            f.close()  # releases the flock, only once the journal is gone
+        if recovered:
+            logger.warning(f"Re-queued {len(recovered)} unpersisted {self._name} from journal")
+
+        self._task = asyncio.create_task(self._run())
+        return len(recovered)
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Flush what Mongo will take within `timeout`, then stop. Anything
+        left stays in the journal and is recovered on the next start.
+        """
+        if self._task is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"{self._queue.qsize()} {self._name} left in journal at shutdown")
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._journal.close()  # releases the flock
+
+    # ---------- producer ----------
+
+    def _enqueue(self, doc: Dict[str, Any]) -> None:
+        self._write_journal({"add": doc})
+        self._queue.put_nowait(doc)
+        self._unacked += 1
+
+    def submit(self, doc: Dict[str, Any]) -> None:
+        """Journal and queue a JSON-serializable document. Raises QueueFull at capacity."""
+        if self._journal is None:
+            raise RuntimeError(f"{self._name} write-behind queue not started")
+        if self._queue.full():
+            raise QueueFull(f"{self._name} queue full")
+        self._enqueue(doc)
+
+    # ---------- consumer ----------
+
+    @staticmethod
+    def _is_transient(error: PyMongoError) -> bool:
+        return isinstance(error, (ConnectionFailure, WriteConcernError)) or error.has_error_label("RetryableWriteError")
+
+    def _dead_letter(self, rejected: List[Tuple[Dict[str, Any], Dict[str, Any]]]) -> None:
+        """Set aside documents Mongo will never accept, with the error, for manual replay."""
+        at = datetime.now(timezone.utc).isoformat()
+        with open(self._journal_dir / f"{self._name}.dead-letter.ndjson", "a", encoding="utf-8") as f:
+            for doc, error in rejected:
+                f.write(json.dumps({"doc": doc, "error": error, "at": at}, default=str) + "\n")
+        self.dead_lettered += len(rejected)
+        logger.error(
+            f"Dead-lettered {len(rejected)} {self._name}: "
+            f"{rejected[0][1].get('errmsg') or rejected[0][1].get('code')}"
+        )
+
+    async def _insert(self, batch: List[Dict[str, Any]]) -> int:
+        """
+        insert_many until every document is in Mongo or dead-lettered;
+        returns how many were dead-lettered. Transient failures are retried
+        with capped backoff, duplicate keys from replays count as success,
+        any other per-document error is permanent.
+        """
+        attempt = 0
+        pending = batch
+        dead = 0
+        while pending:
+            try:
+                await self._collection.insert_many([dict(doc) for doc in pending], ordered=False)
+                break
+            except BulkWriteError as e:
+                details = e.details or {}
+                rejected = [err for err in details.get("writeErrors", []) if err.get("code") != DUPLICATE_KEY]
+                if rejected:
+                    self._dead_letter([
+                        (pending[err["index"]], {"code": err.get("code"), "errmsg": err.get("errmsg")})
+                        for err in rejected
+                    ])
+                    dead += len(rejected)
+                if not details.get("writeConcernErrors"):
+                    break
+                # Written but not confirmed: resend the rest, copies that landed come back as duplicates
+                rejected_at = {err["index"] for err in rejected}
+                pending = [doc for index, doc in enumerate(pending) if index not in rejected_at]
+                failure = e
+            except PyMongoError as e:
+                if not self._is_transient(e):
+                    self._dead_letter([(doc, {"errmsg": f"{type(e).__name__}: {e}"}) for doc in pending])
+                    return dead + len(pending)
+                failure = e
+            delay = min(self._max_retry_delay, 0.5 * 2 ** attempt)
+            attempt += 1
+            self.retries += 1
+            logger.warning(f"Persisting {len(pending)} {self._name} failed ({failure}); retry in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        return dead
+
+    async def _run(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            attempt = 0
+            while True:
+                try:
+                    await self._flush(batch)
+                    break
+                except Exception:
+                    # Keep the batch (it is still unacked in the journal) and retry it
+                    delay = min(self._max_retry_delay, 0.5 * 2 ** attempt)
+                    attempt += 1
+                    self.failed += 1
+                    logger.exception(f"Flushing {len(batch)} {self._name} failed; retry in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+            for _ in batch:
+                self._queue.task_done()
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> None:
+        dead = await self._insert(batch)
+        self._write_journal({"ack": [doc[self._id_field] for doc in batch]})
+        self._unacked -= len(batch)
+        self.persisted += len(batch) - dead
+        if self._unacked == 0:
+            self._journal.truncate(0)  # nothing pending; keep the journal small
+        logger.info(f"Persisted {len(batch)} {self._name}")
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and counters for monitoring."""
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "unacked": self._unacked,
+            "persisted": self.persisted,
+            "retries": self.retries,
+            "dead_lettered": self.dead_lettered,
+            "failed": self.failed,
+        }
@@ -22,12 +22,23 @@ def test_client():
     Create a test client for the FastAPI application.
     """
     # Import here to ensure env vars are set first
-    from server import app
+    from server import app, wait_warm
 
     with TestClient(app) as client:
+        client.portal.call(wait_warm, 60)  # indexes, seed data and config loaded
         yield client
 
 
+@pytest.fixture(autouse=True)
+def reset_endpoint_rate_limits():
+    """
+    Give each test fresh endpoint rate limit quotas.
+    The registry is process-wide, so limits would otherwise carry over.
+    """
+    from middleware.rate_limiter import configure_endpoint_rate_limiter
+    configure_endpoint_rate_limiter()
+
+
 @pytest.fixture
 def sample_pcb_options():
     """Sample PCB options for testing"""
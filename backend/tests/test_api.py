@@ -109,6 +109,20 @@ class TestQuoteEndpoints:
         response = test_client.post("/api/quote/calculate", json=max_options)
         assert response.status_code == status.HTTP_200_OK
 
+    def test_calculate_quote_batch(self, test_client, sample_pcb_options, sample_smt_options):
+        """Test batch quote calculation keeps input order"""
+        response = test_client.post(
+            "/api/v1/quote/calculate-batch",
+            json={"items": [sample_pcb_options, sample_smt_options]}
+        )
+        assert response.status_code == status.HTTP_200_OK
+
+        data = response.json()
+        assert data["success"] is True
+        assert data["count"] == 2
+        assert data["items"][0]["breakdown"]["smt"] == 0
+        assert data["items"][1]["breakdown"]["smt"] > 0
+
 
 class TestConfigEndpoints:
     """Test configuration endpoints"""
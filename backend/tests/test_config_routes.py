@@ -0,0 +1,91 @@
+"""
+Config Routes Tests
+Unit tests for the prebuilt form option payloads and their reload.
+"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api import config_routes
+from api.config_routes import (
+    DEFAULT_FORM_OPTIONS, FORM_OPTIONS_KEY, PAYLOADS, SURFACE_FINISHES,
+    apply_snapshot, current_form_options,
+)
+from services.config_store import build_snapshot
+from services.quote_engine import build_quote_engine
+
+
+def make_client() -> TestClient:
+    app = FastAPI()
+    app.include_router(config_routes.router)
+    return TestClient(app)
+
+
+class TestPrebuiltPayloads:
+    """Test routes serve the bytes built at import"""
+
+    def test_payloads_match_models(self):
+        """Test each route returns what its tables dump to"""
+        client = make_client()
+        finishes = client.get("/api/v1/config/finishes")
+        assert finishes.json() == [f.model_dump() for f in SURFACE_FINISHES]
+        assert finishes.content == PAYLOADS["finishes"]["body"]
+        assert finishes.headers["etag"] == PAYLOADS["finishes"]["etag"]
+
+        options = client.get("/api/v1/config/form-options").json()
+        assert options["finishes"] == finishes.json()
+        assert options["updated_at"] == config_routes.OPTIONS_UPDATED_AT.isoformat().replace("+00:00", "Z")
+
+        factors = client.get("/api/v1/config/pricing-factors").json()
+        assert factors["finishes"]["ENIG"] == 1.25
+        assert "green" in factors["colors"]
+
+    def test_not_modified(self):
+        """Test the prebuilt ETag answers If-None-Match"""
+        client = make_client()
+        etag = PAYLOADS["layers"]["etag"]
+        response = client.get("/api/v1/config/layers", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+
+class TestSnapshotReload:
+    """Test a form.options document replaces the defaults"""
+
+    def apply(self, data=None, version=1):
+        docs = [] if data is None else [{"key": FORM_OPTIONS_KEY, "data": data, "updated_at": "2026-03-01T00:00:00+00:00"}]
+        apply_snapshot(build_snapshot(docs, version))
+
+    def teardown_method(self):
+        self.apply()  # back to defaults
+
+    def test_stored_options_served(self):
+        """Test stored tables replace defaults and missing ones are kept"""
+        client = make_client()
+        before = PAYLOADS["finishes"]["etag"]
+        finishes = [{"value": "ENIG", "label": "ENIG", "price_factor": 1.5}]
+        self.apply({"finishes": finishes})
+
+        response = client.get("/api/v1/config/finishes")
+        assert response.json() == [{**finishes[0], "description": None}]
+        assert response.headers["etag"] != before
+        assert client.get("/api/v1/config/pricing-factors").json()["finishes"] == {"ENIG": 1.5}
+        options = client.get("/api/v1/config/form-options").json()
+        assert options["updated_at"] == "2026-03-01T00:00:00Z"
+        assert current_form_options().layers == DEFAULT_FORM_OPTIONS.layers
+
+        self.apply()
+        assert PAYLOADS["finishes"]["etag"] == before
+
+    def test_quote_engine_uses_current_options(self):
+        """Test engines built after a reload price with the stored factors"""
+        self.apply({"layers": [{"value": "2", "label": "2", "price_factor": 2.0}]})
+        layers = build_quote_engine()._layers
+        assert layers.lookup(layers.encode(["2"]))[0] == 2.0
+
+    def test_invalid_document_keeps_previous(self):
+        """Test a malformed document does not replace working options"""
+        self.apply({"finishes": [{"value": "ENIG", "label": "ENIG", "price_factor": 1.5}]})
+        etag = PAYLOADS["finishes"]["etag"]
+        self.apply({"finishes": [{"label": "no value"}]}, version=2)
+        assert PAYLOADS["finishes"]["etag"] == etag
+        assert current_form_options().finishes[0].price_factor == 1.5
@@ -0,0 +1,142 @@
+"""
+Config Store Tests
+Unit tests for snapshot publishing, polling and change stream reloads.
+"""
+
+import asyncio
+
+from pymongo.errors import AutoReconnect, OperationFailure
+
+from services.config_store import ConfigStore
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return [dict(doc) for doc in self.docs]
+
+
+class FakeChangeStream:
+    def __init__(self, events: asyncio.Queue):
+        self.events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        return await self.events.get()
+
+
+class FakeCollection:
+    """Config collection; change streams only when `events` is given"""
+
+    def __init__(self, docs, events=None, down=False):
+        self.docs = docs
+        self.events = events
+        self.down = down
+
+    def find(self, query, projection):
+        if self.down:
+            raise AutoReconnect("no primary")
+        return FakeCursor(self.docs)
+
+    def watch(self):
+        if self.events is None:
+            raise OperationFailure("$changeStream is only supported on replica sets", code=40573)
+        return FakeChangeStream(self.events)
+
+
+SITE = {"key": "site.config", "enabled": True, "data": {"company_name": "AICO"}}
+
+
+class TestPublish:
+    """Test snapshot versioning"""
+
+    def test_version_moves_only_on_change(self):
+        """Test identical reloads keep the snapshot and version"""
+        store = ConfigStore()
+        seen = []
+        store.subscribe(lambda snapshot: seen.append(snapshot.version))
+
+        assert store.publish([SITE])
+        first = store.snapshot
+        assert not store.publish([dict(SITE)])
+        assert store.snapshot is first
+
+        assert store.publish([{**SITE, "data": {"company_name": "AICO Elektronik"}}])
+        assert store.snapshot.version == 2 and seen == [1, 2]
+        assert store.snapshot.data("site.config") == {"company_name": "AICO Elektronik"}
+        assert store.snapshot.payloads["site.config"]["etag"] != first.payloads["site.config"]["etag"]
+
+    def test_failing_listener_does_not_block(self):
+        """Test a listener error is logged, the swap and later listeners still happen"""
+        store = ConfigStore()
+        seen = []
+        store.subscribe(lambda snapshot: 1 / 0)
+        store.subscribe(lambda snapshot: seen.append(snapshot.version))
+        store.publish([SITE])
+        assert store.loaded and seen == [1]
+
+
+class TestFollow:
+    """Test the store tracks the collection"""
+
+    def test_polling_fallback(self):
+        """Test a deployment without change streams is polled"""
+        collection = FakeCollection([SITE])
+
+        async def _run():
+            store = ConfigStore(poll_interval=0.01)
+            await store.start(collection)
+            collection.docs = [SITE, {"key": "form.options", "data": {}}]
+            await asyncio.sleep(0.05)
+            await store.stop()
+            return store
+
+        store = asyncio.run(_run())
+        assert store.mode == "polling"
+        assert set(store.snapshot.docs) == {"site.config", "form.options"}
+        assert store.snapshot.version == 2
+
+    def test_change_stream_reload(self):
+        """Test every change event reloads the collection"""
+        async def _run():
+            collection = FakeCollection([SITE], events=asyncio.Queue())
+            store = ConfigStore(poll_interval=60)
+            await store.start(collection)
+            await asyncio.sleep(0)
+            collection.docs = []
+            collection.events.put_nowait({"operationType": "delete"})
+            await asyncio.sleep(0.01)
+            await store.stop()
+            return store
+
+        store = asyncio.run(_run())
+        assert store.mode == "change_stream"
+        assert store.snapshot.docs == {}
+        assert store.snapshot.version == 2
+
+    def test_unavailable_at_start(self):
+        """Test a failed initial load is retried rather than raised"""
+        collection = FakeCollection([SITE], down=True)
+
+        async def _run():
+            store = ConfigStore(poll_interval=0.01, change_streams=False)
+            await store.start(collection)
+            loaded_at_start = store.loaded
+            collection.down = False
+            await asyncio.sleep(0.05)
+            await store.stop()
+            return loaded_at_start, store
+
+        loaded_at_start, store = asyncio.run(_run())
+        assert not loaded_at_start
+        assert store.loaded and store.stats()["documents"] == 1
@@ -0,0 +1,128 @@
+"""
+Consultation Export Tests
+Unit tests for batched NDJSON/CSV streaming and the insertion watermark.
+"""
+
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+
+from services.consultation_export import (
+    export_consultations, export_query, export_watermark, normalize_watermark, stream_csv, stream_ndjson,
+)
+
+FIELDS = ["id", "name", "created_at"]
+
+
+class FakeCursor:
+    """Async iterator over documents, counting how many were pulled"""
+
+    def __init__(self, count):
+        self.count = count
+        self.pulled = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.pulled >= self.count:
+            raise StopAsyncIteration
+        self.pulled += 1
+        return {"id": str(self.pulled), "name": f"Ada, {self.pulled}", "created_at": "2026-01-01T00:00:00+00:00"}
+
+
+def collect(stream):
+    async def _run():
+        return [chunk async for chunk in stream]
+    return asyncio.run(_run())
+
+
+class TestStreaming:
+    """Test chunking and output formats"""
+
+    def test_ndjson_one_chunk_per_batch(self):
+        """Test NDJSON is flushed per batch with one object per line"""
+        chunks = collect(stream_ndjson(FakeCursor(25), batch_size=10))
+        assert [chunk.count("\n") for chunk in chunks] == [10, 10, 5]
+        assert json.loads(chunks[-1].splitlines()[-1])["id"] == "25"
+
+    def test_csv_header_and_quoting(self):
+        """Test CSV starts with a header and quotes embedded commas"""
+        chunks = collect(stream_csv(FakeCursor(3), FIELDS, batch_size=2))
+        assert len(chunks) == 3
+        rows = list(csv.DictReader(io.StringIO("".join(chunks))))
+        assert [row["name"] for row in rows] == ["Ada, 1", "Ada, 2", "Ada, 3"]
+
+    def test_pulls_lazily(self):
+        """Test the cursor is only advanced as chunks are consumed"""
+        cursor = FakeCursor(1000)
+
+        async def _first():
+            stream = stream_ndjson(cursor, batch_size=50)
+            chunk = await stream.__anext__()
+            await stream.aclose()
+            return chunk
+
+        asyncio.run(_first())
+        assert cursor.pulled == 50
+
+
+    def test_csv_formula_cells_neutralized(self):
+        """Test cells a spreadsheet would evaluate are prefixed in CSV only"""
+        class FormulaCursor(FakeCursor):
+            async def __anext__(self):
+                doc = await super().__anext__()
+                return {**doc, "name": ["=HYPERLINK(\"x\")", "+1", "Ada"][self.pulled - 1]}
+
+        rows = list(csv.DictReader(io.StringIO("".join(collect(stream_csv(FormulaCursor(3), FIELDS, 10))))))
+        assert [row["name"] for row in rows] == ["'=HYPERLINK(\"x\")", "'+1", "Ada"]
+        ndjson = collect(stream_ndjson(FormulaCursor(1), 10))
+        assert json.loads(ndjson[0])["name"] == "=HYPERLINK(\"x\")"
+
+
+class FakeCollection:
+    def __init__(self):
+        self.query = None
+
+    def find(self, query, projection, batch_size):
+        self.query = query
+        return self
+
+    def sort(self, keys):
+        return FakeCursor(0)
+
+
+class TestWatermark:
+    """Test since/until bounds on insertion order"""
+
+    def test_previous_watermark_round_trips(self):
+        """Test the returned watermark is the next export's lower bound"""
+        collection = FakeCollection()
+        _, watermark = export_consultations(collection, "ndjson", FIELDS, 10, settle_seconds=60)
+        assert "$gte" not in collection.query["_id"]
+        export_consultations(collection, "csv", FIELDS, 10, since=watermark, project_type="pcb")
+        assert collection.query["_id"]["$gte"] == ObjectId(watermark)
+        assert collection.query["_id"]["$lt"] >= ObjectId(watermark)
+        assert collection.query["project_type"] == "pcb"
+
+    def test_settle_window(self):
+        """Test the upper bound trails now by settle_seconds"""
+        now = datetime(2026, 3, 1, 0, 1, tzinfo=timezone.utc)
+        assert export_watermark(60, now).generation_time == datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+    def test_timestamps_accepted(self):
+        """Test ISO timestamps map to the first _id of that second, in UTC"""
+        expected = ObjectId.from_datetime(datetime(2026, 3, 1, tzinfo=timezone.utc))
+        assert normalize_watermark("2026-03-01T03:00:00+03:00") == expected
+        assert normalize_watermark("2026-03-01T00:00:00Z") == expected
+        assert export_query("2026-03-01T00:00:00") == {"_id": {"$gte": expected}}
+
+    def test_invalid(self):
+        """Test an unparseable since raises ValueError"""
+        with pytest.raises(ValueError):
+            export_query("yesterday")
@@ -0,0 +1,72 @@
+"""
+Consultation Submission Tests
+Unit tests for the single-pass request validation and submit path.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+from pydantic import ValidationError
+
+import server
+from server import InfoRequest, InfoRequestCreate
+from services.write_behind import WriteBehindQueue
+
+PAYLOAD = {
+    "name": "  Ayşe   <b>Kaya</b> ",
+    "email": "Ayse.Kaya@Example.com",
+    "phone": "+90 (532) 123-45-67",
+    "project_type": "fpga",
+    "message": "Hello",
+}
+
+
+class RecordingCollection:
+    def __init__(self):
+        self.docs = []
+
+    async def insert_many(self, docs, ordered=True):
+        self.docs += docs
+
+
+class TestInfoRequestCreate:
+    """Test validators and document construction"""
+
+    def test_to_document(self):
+        """Test the stored document is sanitized and matches the InfoRequest schema"""
+        doc = InfoRequestCreate.model_validate(PAYLOAD).to_document()
+        assert doc["name"] == "Ayşe Kaya"
+        assert doc["email"] == "ayse.kaya@example.com"
+        assert doc["phone"] == "+905321234567"
+        assert set(doc) == set(InfoRequest.model_fields)
+        assert InfoRequest.model_validate(doc).id == doc["id"]
+
+    @pytest.mark.parametrize("field,value", [("email", "not-an-email"), ("email", 12345), ("phone", "12"), ("phone", 5551234)])
+    def test_invalid_values_rejected(self, field, value):
+        """Test bad and non-string values raise validation errors, not TypeErrors"""
+        with pytest.raises(ValidationError):
+            InfoRequestCreate.model_validate({**PAYLOAD, field: value})
+
+
+class TestSubmitEndpoint:
+    """Test the route returns the same document it queues"""
+
+    def test_response_is_queued_document(self, tmp_path, monkeypatch):
+        """Test the acknowledged body is exactly what gets persisted"""
+        collection = RecordingCollection()
+
+        async def _run():
+            queue = WriteBehindQueue(collection, str(tmp_path), "consultation_requests")
+            monkeypatch.setattr(server, "consultation_queue", queue)
+            await queue.start()
+            transport = httpx.ASGITransport(app=server.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                response = await client.post("/api/v1/contact/consultation", json=PAYLOAD)
+            await queue.stop()
+            return response
+
+        response = asyncio.run(_run())
+        assert response.status_code == 200
+        stored = {k: v for k, v in collection.docs[0].items() if k != "_id"}
+        assert response.json() == stored
@@ -0,0 +1,54 @@
+"""
+Health Sampler Tests
+Unit tests for background system metrics sampling.
+"""
+
+import asyncio
+
+from services.health_sampler import HealthSampler
+
+SAMPLE = {
+    "cpu_percent": 10.0, "memory_used_percent": 40.0, "disk_used_percent": 50.0,
+    "process_rss_mb": 100.0, "process_cpu_percent": 5.0, "open_files": 20,
+}
+
+
+class TestHealthSampler:
+    """Test the ring buffer and its aggregates"""
+
+    def test_empty(self):
+        """Test a sampler with no samples reports nothing yet"""
+        sampler = HealthSampler()
+        assert sampler.latest is None
+        assert sampler.report() == {"interval_s": 5.0, "sampled_s_ago": None, "window": {"samples": 0}}
+
+    def test_window_aggregates(self):
+        """Test min/avg/max over the buffered samples only"""
+        sampler = HealthSampler(window=3)
+        for cpu, lag in ((90.0, 500.0), (10.0, 1.0), (20.0, 2.0), (30.0, 3.0)):
+            sampler.record({**SAMPLE, "cpu_percent": cpu}, loop_lag_ms=lag)
+
+        window = sampler.aggregates()
+        assert window["samples"] == 3
+        assert window["cpu_percent"] == {"min": 10.0, "avg": 20.0, "max": 30.0}
+        assert window["loop_lag_ms"]["max"] == 3.0 and window["loop_lag_ms"]["p95"] == 3.0
+        assert sampler.latest["cpu_percent"] == 30.0
+
+    def test_real_sample(self):
+        """Test a psutil sample has every aggregated field"""
+        sampler = HealthSampler()
+        asyncio.run(sampler.sample_once())
+        latest = sampler.latest
+        assert set(SAMPLE) <= set(latest)
+        assert latest["process_rss_mb"] > 0 and latest["open_files"] > 0
+
+    def test_background_task(self):
+        """Test start samples repeatedly and stop ends the task"""
+        async def _run():
+            sampler = HealthSampler(interval=0.01)
+            sampler.start()
+            await asyncio.sleep(0.2)
+            await sampler.stop()
+            return len(sampler.samples)
+
+        assert asyncio.run(_run()) >= 2
@@ -0,0 +1,85 @@
+"""
+JSON Response Tests
+Unit tests for the orjson response path and conditional requests.
+"""
+
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+
+from seed_data import SAMPLE_PROJECTS, SITE_CONFIG
+from services.json_response import (
+    RawJSONResponse, conditional_json, etag_matches, render_json,
+)
+from services.response_cache import ResponseCache
+
+
+class TestRawJSONResponse:
+    """Test orjson output matches the default encoder"""
+
+    def test_matches_jsonable_encoder(self):
+        """Test seed documents serialize to the same JSON either way"""
+        stamp = datetime(2026, 1, 2, 3, 4, 5, 678000, tzinfo=timezone.utc)
+        for doc in [*SAMPLE_PROJECTS, SITE_CONFIG]:
+            doc = {**doc, "created_at": stamp}
+            raw = json.loads(RawJSONResponse(doc).body)
+            assert raw == jsonable_encoder(doc)
+
+    def test_unknown_types_fall_back_to_str(self):
+        """Test types orjson cannot encode are stringified, not errors"""
+        assert json.loads(RawJSONResponse({"price": Decimal("1.50"), 1: "x"}).body) == {"price": "1.50", "1": "x"}
+
+
+class TestConditionalJson:
+    """Test ETag, 304 and Cache-Control handling"""
+
+    def make_app(self):
+        app = FastAPI()
+        cache = ResponseCache()
+        calls = {"n": 0}
+
+        @app.get("/items/{slug}", response_class=RawJSONResponse)
+        @conditional_json("public, max-age=60")
+        @cache.cached("items")
+        @render_json
+        async def get_item(slug: str, limit: int = 10):
+            calls["n"] += 1
+            return {"slug": slug, "limit": limit}
+
+        return app, calls
+
+    def test_etag_and_not_modified(self):
+        """Test a matching If-None-Match gets an empty 304 with the same headers"""
+        app, _ = self.make_app()
+        client = TestClient(app)
+        first = client.get("/items/fpga?limit=3")
+        assert first.json() == {"slug": "fpga", "limit": 3}
+        assert first.headers["cache-control"] == "public, max-age=60"
+        etag = first.headers["etag"]
+
+        again = client.get("/items/fpga?limit=3", headers={"If-None-Match": f'W/"stale", {etag}'})
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+
+        other = client.get("/items/fpga?limit=4", headers={"If-None-Match": etag})
+        assert other.status_code == 200
+        assert other.headers["etag"] != etag
+
+    def test_rendered_once_per_cached_version(self):
+        """Test cache hits reuse the stored body and ETag"""
+        app, calls = self.make_app()
+        client = TestClient(app)
+        etags = {client.get("/items/x").headers["etag"] for _ in range(3)}
+        assert len(etags) == 1 and calls["n"] == 1
+
+    def test_etag_matching(self):
+        """Test weak comparison and the wildcard"""
+        assert etag_matches('W/"abc"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"abd"', '"abc"')
+        assert not etag_matches("", '"abc"')
@@ -0,0 +1,81 @@
+"""
+Mongo Connection Tests
+Unit tests for connection pool metrics and the lifespan-managed client.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from pymongo import monitoring
+
+from services.mongo import MongoConnection, PoolMetrics, percentile
+
+
+def check_out(metrics: PoolMetrics) -> None:
+    metrics.connection_check_out_started(SimpleNamespace())
+    metrics.connection_checked_out(SimpleNamespace())
+
+
+class TestPoolMetrics:
+    """Test checkout waits and occupancy tracking"""
+
+    def test_checkouts_and_occupancy(self):
+        """Test in-use follows checkouts and check-ins, with its high-water mark"""
+        metrics = PoolMetrics()
+        for _ in range(3):
+            metrics.connection_created(SimpleNamespace())
+            check_out(metrics)
+        metrics.connection_checked_in(SimpleNamespace())
+
+        stats = metrics.stats()
+        assert stats["checkouts"] == 3
+        assert stats["connections_open"] == 3
+        assert stats["connections_in_use"] == 2
+        assert stats["max_in_use"] == 3
+        assert stats["wait_ms"]["samples"] == 3
+
+    def test_failed_checkouts(self):
+        """Test wait-queue timeouts are counted apart from other failures"""
+        metrics = PoolMetrics()
+        reasons = monitoring.ConnectionCheckOutFailedReason
+        for reason in (reasons.TIMEOUT, reasons.TIMEOUT, reasons.CONN_ERROR):
+            metrics.connection_check_out_started(SimpleNamespace())
+            metrics.connection_check_out_failed(SimpleNamespace(reason=reason))
+
+        stats = metrics.stats()
+        assert (stats["checkout_timeouts"], stats["checkout_failures"], stats["checkouts"]) == (2, 1, 0)
+
+    def test_wait_samples_bounded(self):
+        """Test only the most recent waits are kept"""
+        metrics = PoolMetrics(samples=4)
+        for _ in range(10):
+            check_out(metrics)
+        assert metrics.stats()["wait_ms"]["samples"] == 4
+
+    def test_percentile(self):
+        """Test nearest-rank percentiles"""
+        ordered = list(range(1, 101))
+        assert percentile(ordered, 0.50) == 51
+        assert percentile(ordered, 0.99) == 100
+        assert percentile([], 0.95) == 0.0
+
+
+class TestMongoConnection:
+    """Test the client exists only between open and close"""
+
+    def test_db_before_open(self):
+        """Test using the database before startup fails clearly"""
+        with pytest.raises(RuntimeError):
+            MongoConnection("mongodb://localhost:27017", "test").db
+
+    def test_open_close(self):
+        """Test open applies the pool options and close drops the client"""
+        connection = MongoConnection("mongodb://localhost:27017", "test", max_pool_size=7, min_pool_size=2)
+        connection.open()
+        try:
+            assert connection.db.name == "test"
+            assert connection.client.options.pool_options.max_pool_size == 7
+            assert connection.stats()["open"]
+        finally:
+            connection.close()
+        assert connection.client is None
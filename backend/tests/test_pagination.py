@@ -0,0 +1,140 @@
+"""
+Pagination Tests
+Unit tests for keyset cursors and page walking.
+"""
+
+import asyncio
+import operator
+
+import pytest
+
+from services.pagination import (
+    InvalidCursor, decode_cursor, encode_cursor, keyset_filter, paginate,
+)
+
+CONSULTATION_SORT = [("created_at", -1), ("id", -1)]
+OPERATORS = {"$gt": operator.gt, "$lt": operator.lt}
+
+
+def matches(doc, query):
+    """Evaluate the subset of Mongo query syntax keyset pagination emits"""
+    for field, condition in query.items():
+        if field == "$or":
+            if not any(matches(doc, branch) for branch in condition):
+                return False
+        elif field == "$and":
+            if not all(matches(doc, branch) for branch in condition):
+                return False
+        elif isinstance(condition, dict):
+            if not all(OPERATORS[op](doc[field], value) for op, value in condition.items()):
+                return False
+        elif doc.get(field) != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, keys):
+        for field, direction in reversed(keys):
+            self._docs.sort(key=lambda d: d[field], reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self._docs = self._docs[:n]
+        return self
+
+    async def to_list(self, length):
+        return self._docs[:length]
+
+
+class FakeCollection:
+    """In-memory collection supporting find/sort/limit/count_documents"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.counts = 0
+
+    def find(self, query, projection):
+        return FakeCursor([dict(d) for d in self.docs if matches(d, query)])
+
+    async def count_documents(self, query):
+        self.counts += 1
+        return sum(1 for d in self.docs if matches(d, query))
+
+
+class TestCursor:
+    """Test cursor encoding and the keyset filter"""
+
+    def test_round_trip(self):
+        """Test a cursor decodes to the values, page and total it was built from"""
+        cursor = encode_cursor(["2026-01-01T00:00:00+00:00", "abc"], 3, 42)
+        assert decode_cursor(cursor, CONSULTATION_SORT) == (["2026-01-01T00:00:00+00:00", "abc"], 3, 42)
+
+    @pytest.mark.parametrize("cursor", [
+        "not-base64!", encode_cursor(["only-one"], 2, 5), encode_cursor(["a", "b"], 1, 5), encode_cursor(["a", "b"], 2, -1),
+    ])
+    def test_invalid(self, cursor):
+        """Test malformed or mismatched cursors are rejected"""
+        with pytest.raises(InvalidCursor):
+            decode_cursor(cursor, CONSULTATION_SORT)
+
+    def test_filter_follows_sort_direction(self):
+        """Test each branch ties earlier keys and ranges on the next"""
+        assert keyset_filter([("order", 1), ("slug", 1)], [2, "b"]) == {
+            "$or": [{"order": {"$gt": 2}}, {"order": 2, "slug": {"$gt": "b"}}],
+        }
+        assert keyset_filter(CONSULTATION_SORT, ["t", "i"])["$or"][1] == {"created_at": "t", "id": {"$lt": "i"}}
+
+
+class TestPaginate:
+    """Test walking every page of a listing"""
+
+    def test_walk_visits_each_row_once(self):
+        """Test pages cover all rows in order, including ties on created_at"""
+        docs = [
+            {"id": f"{i:03d}", "created_at": f"2026-01-0{i % 3 + 1}", "project_type": "pcb" if i % 2 else "fpga"}
+            for i in range(25)
+        ]
+        collection = FakeCollection(docs)
+
+        async def _walk(query):
+            seen, cursor, pages = [], None, []
+            while True:
+                page = await paginate(collection, query, CONSULTATION_SORT, per_page=4, cursor=cursor)
+                seen += [doc["id"] for doc in page.items]
+                pages.append(page.page)
+                cursor = page.next_cursor
+                if cursor is None:
+                    return seen, pages, page
+
+        seen, pages, last = asyncio.run(_walk({}))
+        expected = [d["id"] for d in sorted(docs, key=lambda d: (d["created_at"], d["id"]), reverse=True)]
+        assert seen == expected
+        assert pages == list(range(1, 8))
+        assert (last.total, last.pages) == (25, 7)
+        assert collection.counts == 1  # counted for the first page only
+
+        seen, _, last = asyncio.run(_walk({"project_type": "pcb"}))
+        assert len(seen) == len(set(seen)) == last.total == 12
+
+
+class TestFetchPage:
+    """Test page envelopes served behind ETags"""
+
+    def test_cacheable_page_etag_stable(self):
+        """Test a page without timestamp renders the same ETag on every read"""
+        from server import fetch_page
+        from services.json_response import rendered
+
+        collection = FakeCollection([{"id": f"{i:03d}", "created_at": "2026-01-01"} for i in range(5)])
+
+        async def _read(timestamp):
+            return await fetch_page(collection, {}, CONSULTATION_SORT, 2, None, timestamp=timestamp)
+
+        first, second = asyncio.run(_read(False)), asyncio.run(_read(False))
+        assert "timestamp" not in first
+        assert rendered(first)["etag"] == rendered(second)["etag"]
+        assert "timestamp" in asyncio.run(_read(True))
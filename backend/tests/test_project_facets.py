@@ -0,0 +1,105 @@
+"""
+Project Facet Tests
+Unit tests for incremental facet count maintenance.
+"""
+
+import asyncio
+
+from pymongo import DeleteMany, UpdateOne
+
+from services.project_facets import FACETS_COLLECTION, facet_deltas, rebuild_facets, _aggregation_pipeline
+
+
+class FakeAggregation:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __aiter__(self):
+        return self._iter()
+
+    async def _iter(self):
+        for row in self.rows:
+            yield row
+
+
+class FakeProjects:
+    def __init__(self, counts):
+        self.counts = counts
+
+    def aggregate(self, pipeline):
+        field = "technology" if any("$unwind" in stage for stage in pipeline) else "industry"
+        return FakeAggregation([{"_id": value, "count": n} for value, n in self.counts[field].items()])
+
+
+class FakeFacets:
+    """Facet collection applying bulk upserts and deletes in order"""
+
+    def __init__(self, docs):
+        self.docs = docs
+        self.snapshots = []
+
+    async def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            query = op._filter
+            if isinstance(op, UpdateOne):
+                self.docs[(query["facet"], query["value"])] = op._doc["$set"]["count"]
+            elif isinstance(op, DeleteMany):
+                for key in [k for k in self.docs if k[0] == query["facet"] and k[1] not in query["value"]["$nin"]]:
+                    del self.docs[key]
+            self.snapshots.append(dict(self.docs))
+
+
+class FakeDb(dict):
+    def __getattr__(self, name):
+        return self[name]
+
+
+class TestFacetDeltas:
+    """Test count deltas for project writes"""
+
+    def test_insert(self):
+        """Test an insert increments every technology and the industry"""
+        project = {"technologies": ["FPGA", "DDR4"], "client_industry": "Endustri 4.0"}
+        assert facet_deltas(None, project) == {
+            ("technology", "FPGA"): 1,
+            ("technology", "DDR4"): 1,
+            ("industry", "Endustri 4.0"): 1,
+        }
+
+    def test_update_only_changes(self):
+        """Test an update touches only added and removed values"""
+        old = {"technologies": ["FPGA", "DDR4"], "client_industry": "Medikal"}
+        new = {"technologies": ["FPGA", "SerDes"], "client_industry": "Medikal"}
+        assert facet_deltas(old, new) == {
+            ("technology", "DDR4"): -1,
+            ("technology", "SerDes"): 1,
+        }
+
+    def test_unchanged_and_delete(self):
+        """Test reseeding an unchanged project is a no-op and deletes decrement"""
+        project = {"technologies": ["FPGA", "FPGA", ""], "client_industry": None}
+        assert facet_deltas(project, dict(project)) == {}
+        assert facet_deltas(project, None) == {("technology", "FPGA"): -1}
+
+    def test_aggregation_fallback_shape(self):
+        """Test the fallback pipeline unwinds arrays and groups scalars"""
+        tech_stages = [next(iter(stage)) for stage in _aggregation_pipeline("technology")]
+        industry_stages = [next(iter(stage)) for stage in _aggregation_pipeline("industry")]
+        assert "$unwind" in tech_stages
+        assert "$unwind" not in industry_stages
+        assert tech_stages[-2:] == industry_stages[-2:] == ["$group", "$sort"]
+
+
+class TestRebuildFacets:
+    """Test rebuilding replaces counts without emptying the collection"""
+
+    def test_upserts_then_prunes(self):
+        """Test counts are overwritten, stale values dropped, and no write leaves it empty"""
+        facets = FakeFacets({("technology", "FPGA"): 7, ("technology", "Gone"): 1, ("industry", "Medikal"): 2})
+        db = FakeDb({
+            "projects": FakeProjects({"technology": {"FPGA": 2, "DDR4": 1}, "industry": {"Medikal": 3}}),
+            FACETS_COLLECTION: facets,
+        })
+        asyncio.run(rebuild_facets(db))
+        assert facets.docs == {("technology", "FPGA"): 2, ("technology", "DDR4"): 1, ("industry", "Medikal"): 3}
+        assert all(facets.snapshots)
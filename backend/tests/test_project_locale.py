@@ -0,0 +1,92 @@
+"""
+Project Locale Tests
+Unit tests for locale projections and field mapping.
+"""
+
+import copy
+
+from models.schemas import ProjectListItem
+from seed_data import SAMPLE_PROJECTS
+from services.project_locale import field_projection, locale_projection, localize
+
+FPGA = SAMPLE_PROJECTS[0]
+
+
+def project(doc, projection):
+    """Apply an exclusion projection the way Mongo would (top level and phases.*)"""
+    doc = copy.deepcopy(doc)
+    for path, value in projection.items():
+        if value != 0:
+            continue
+        if path.startswith("phases."):
+            for phase in doc.get("phases", []):
+                phase.pop(path.split(".", 1)[1], None)
+        else:
+            doc.pop(path, None)
+    return doc
+
+
+def has_translation_keys(doc):
+    return any(k.endswith("_en") for k in doc) or any(
+        k.endswith("_en") for phase in doc.get("phases", []) for k in phase
+    )
+
+
+class TestLocaleProjection:
+    """Test each locale fetches one language under the base field names"""
+
+    def test_turkish(self):
+        """Test tr drops English fields and keeps Turkish text"""
+        doc = localize(project(FPGA, locale_projection("tr")), "tr")
+        assert doc["title"] == FPGA["title"]
+        assert doc["phases"][0]["description"] == FPGA["phases"][0]["description"]
+        assert not has_translation_keys(doc)
+
+    def test_english(self):
+        """Test en maps *_en onto base names in place of the Turkish text"""
+        doc = localize(project(FPGA, locale_projection("en")), "en")
+        assert doc["title"] == FPGA["title_en"]
+        assert doc["challenge_text"] == FPGA["challenge_text_en"]
+        assert doc["phases"][1]["title"] == FPGA["phases"][1]["title_en"]
+        assert not has_translation_keys(doc)
+        assert doc["technologies"] == FPGA["technologies"]
+
+    def test_english_falls_back_to_turkish(self):
+        """Test a missing or empty translation keeps the Turkish text"""
+        partial = copy.deepcopy(FPGA)
+        del partial["title_en"]
+        partial["subtitle_en"] = ""
+        del partial["phases"][0]["description_en"]
+        doc = localize(project(partial, locale_projection("en")), "en")
+        assert doc["title"] == FPGA["title"] and doc["subtitle"] == FPGA["subtitle"]
+        assert doc["phases"][0]["description"] == FPGA["phases"][0]["description"]
+        assert doc["challenge_text"] == FPGA["challenge_text_en"]
+        assert not has_translation_keys(doc)
+        ProjectListItem.model_validate({"id": "p1", **doc})
+
+    def test_same_shape_and_smaller(self):
+        """Test both locales share field names and shrink the payload"""
+        tr = localize(project(FPGA, locale_projection("tr")), "tr")
+        en = localize(project(FPGA, locale_projection("en")), "en")
+        assert set(tr) == set(en)
+        assert len(str(en)) < 0.75 * len(str(FPGA))
+
+    def test_no_locale_keeps_both(self):
+        """Test omitting locale keeps the bilingual document"""
+        assert locale_projection(None) == {"_id": 0}
+        assert localize(copy.deepcopy(FPGA), None) == FPGA
+
+
+class TestListProjection:
+    """Test the ProjectListItem projection used by the project list"""
+
+    def test_list_fields_per_locale(self):
+        """Test tr keeps one language of each list field and en keeps both"""
+        bilingual = field_projection(ProjectListItem.model_fields, None)
+        assert {"title", "title_en", "slug", "order"} <= set(bilingual)
+        assert "challenge_text" not in bilingual and "phases" not in bilingual
+
+        assert field_projection(ProjectListItem.model_fields, "en") == bilingual
+        tr = field_projection(ProjectListItem.model_fields, "tr")
+        assert "title" in tr and "title_en" not in tr
+        assert set(bilingual) - set(tr) == {"title_en", "subtitle_en", "client_industry_en"}
@@ -0,0 +1,91 @@
+"""
+Quote Engine Tests
+Unit tests for the vectorized pricing engine (no database required).
+"""
+
+import pytest
+
+from models.schemas import PCBQuoteOptions
+from services.quote_engine import build_quote_engine
+
+
+@pytest.fixture(scope="module")
+def engine():
+    return build_quote_engine()
+
+
+class TestQuoteEngine:
+    """Test single and batch pricing"""
+
+    def test_single_quote_totals(self, engine, sample_pcb_options):
+        """Test breakdown components add up to the total"""
+        result = engine.quote(PCBQuoteOptions(**sample_pcb_options))
+        breakdown = result["breakdown"]
+        assert result["total"] > 0
+        assert result["total"] == pytest.approx(sum(breakdown.values()), abs=0.05)
+        assert result["unit_price"] == pytest.approx(result["total"] / 50, abs=0.01)
+        assert breakdown["smt"] == 0
+
+    def test_batch_matches_single(self, engine, sample_pcb_options, sample_smt_options, extreme_pcb_options):
+        """Test batch pricing returns the same results as one-by-one pricing"""
+        options = [
+            PCBQuoteOptions(**o)
+            for o in (sample_pcb_options, sample_smt_options, extreme_pcb_options)
+        ]
+        batch = engine.quote_many(options)
+        assert batch == [engine.quote(o) for o in options]
+
+    def test_lead_time_factor(self, engine, sample_pcb_options):
+        """Test fast lead time is more expensive than economy"""
+        fast = engine.quote(PCBQuoteOptions(**{**sample_pcb_options, "lead_time": "fast"}))
+        economy = engine.quote(PCBQuoteOptions(**{**sample_pcb_options, "lead_time": "economy"}))
+        assert fast["total"] > economy["total"]
+        assert fast["lead_time_days"] == "3-5"
+
+    def test_volume_discount(self, engine, sample_pcb_options):
+        """Test unit price falls as quantity grows"""
+        small = engine.quote(PCBQuoteOptions(**{**sample_pcb_options, "quantity": 10}))
+        large = engine.quote(PCBQuoteOptions(**{**sample_pcb_options, "quantity": 10000}))
+        assert large["unit_price"] < small["unit_price"]
+
+    def test_unknown_finish_warns(self, engine, sample_pcb_options):
+        """Test unknown option values are priced at the default factor with a warning"""
+        result = engine.quote(PCBQuoteOptions(**{**sample_pcb_options, "finish": "Unobtainium"}))
+        assert any("Unknown option" in w for w in result["warnings"])
+
+    def test_dfm_analysis(self, engine, sample_pcb_options, extreme_pcb_options):
+        """Test DFM grade drops for extreme options"""
+        clean = engine.quote(PCBQuoteOptions(**sample_pcb_options), analysis=True)
+        extreme = engine.quote(PCBQuoteOptions(**extreme_pcb_options), analysis=True)
+        assert clean["dfm_analysis"]["grade"] == "A"
+        assert extreme["dfm_analysis"]["score"] < clean["dfm_analysis"]["score"]
+        assert extreme["dfm_analysis"]["issues"] == extreme["warnings"]
+
+
+class TestQuoteCurve:
+    """Test price-break curves"""
+
+    def test_curve_matches_single_quotes(self, engine, sample_smt_options):
+        """Test every curve point equals a calculate call at that quantity"""
+        options = PCBQuoteOptions(**sample_smt_options)
+        curve = engine.price_curve(options, points=20)
+        for q, total in list(zip(curve["quantities"], curve["total"]))[::5]:
+            single = engine.quote(options.model_copy(update={"quantity": q}))
+            assert single["total"] == pytest.approx(total, abs=0.01)
+
+    def test_curve_covers_quantity_range(self, engine, sample_pcb_options):
+        """Test curve spans FORM_LIMITS and includes every price break"""
+        curve = engine.price_curve(PCBQuoteOptions(**sample_pcb_options))
+        assert curve["quantities"][0] == 1
+        assert curve["quantities"][-1] == 100000
+        assert curve["quantities"] == sorted(set(curve["quantities"]))
+        for price_break in curve["price_breaks"]:
+            assert price_break["quantity"] in curve["quantities"]
+
+    def test_curve_cached_by_options(self, engine, sample_pcb_options):
+        """Test quantity does not affect the cache key but other options do"""
+        base = engine.price_curve(PCBQuoteOptions(**sample_pcb_options))
+        same = engine.price_curve(PCBQuoteOptions(**{**sample_pcb_options, "quantity": 999}))
+        other = engine.price_curve(PCBQuoteOptions(**{**sample_pcb_options, "layers": 6}))
+        assert same is base
+        assert other is not base
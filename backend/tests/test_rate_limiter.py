@@ -0,0 +1,334 @@
+"""
+Rate Limiter Tests
+Unit tests for RateLimiter and its storage backends.
+"""
+
+import asyncio
+import os
+from collections import Counter
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI
+
+from middleware.rate_limiter import (
+    CHECK_AND_RECORD_SCRIPT, InMemoryBackend, RateLimitConfig, RateLimiter, RedisBackend,
+    SlidingWindowCounterBackend, local_backend_stats, run_sweeper,
+    PRICING_RATE_LIMIT, UPLOAD_RATE_LIMIT,
+    check_pricing_rate_limit, check_upload_rate_limit, configure_endpoint_rate_limiter, get_endpoint_rate_limiter,
+)
+
+
+class FakeRequest:
+    """Minimal stand-in for a Starlette request"""
+
+    def __init__(self, ip: str = "203.0.113.7"):
+        self.headers = {"X-Real-IP": ip}
+        self.client = None
+
+
+class AtomicCountingBackend(InMemoryBackend):
+    """In-memory backend exposing check_and_record, counting round trips"""
+
+    atomic = True
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def check_and_record(self, windows):
+        self.calls += 1
+        for index, (key, window, limit) in enumerate(windows):
+            if await self.get_count(key, window) >= limit:
+                return index
+        for key, window, _ in windows:
+            await self.record_request(key, window)
+        return -1
+
+
+class FakeScriptRedis:
+    """Redis client whose registered script runs the check-and-record Lua in Python"""
+
+    def __init__(self):
+        self.sets = {}
+        self.scripts = []
+        self.calls = 0
+
+    def register_script(self, script):
+        self.scripts.append(script)
+
+        async def run(keys, args):
+            self.calls += 1
+            now, member, pairs = float(args[0]), args[1], args[2:]
+            for i, key in enumerate(keys):
+                window, limit = pairs[2 * i], pairs[2 * i + 1]
+                members = self.sets.setdefault(key, {})
+                for stale in [m for m, score in members.items() if score <= now - window]:
+                    del members[stale]
+                if len(members) >= limit:
+                    return i + 1
+            for key in keys:
+                self.sets[key][member] = now
+            return 0
+        return run
+
+
+def run_requests(limiter: RateLimiter, count: int, ip: str = "203.0.113.7"):
+    async def _run():
+        return [await limiter.check_rate_limit(FakeRequest(ip)) for _ in range(count)]
+    return asyncio.run(_run())
+
+
+class TestRateLimiter:
+    """Test allow/deny semantics across windows"""
+
+    def test_burst_limit(self):
+        """Test requests beyond the burst limit are denied"""
+        limiter = RateLimiter(RateLimitConfig(burst_limit=3), InMemoryBackend())
+        results = run_requests(limiter, 5)
+        assert [allowed for allowed, _, _ in results] == [True, True, True, False, False]
+        assert results[-1][2] == limiter.config.burst_window_seconds
+
+    def test_minute_limit(self):
+        """Test the per-minute window denies once exhausted"""
+        config = RateLimitConfig(burst_limit=100, requests_per_minute=2)
+        limiter = RateLimiter(config, InMemoryBackend())
+        allowed, message, retry_after = run_requests(limiter, 3)[-1]
+        assert allowed is False
+        assert "per minute" in message
+        assert retry_after == 60
+
+    def test_denied_requests_not_recorded(self):
+        """Test a denied request does not consume quota in other windows"""
+        backend = InMemoryBackend()
+        limiter = RateLimiter(RateLimitConfig(burst_limit=2), backend)
+        run_requests(limiter, 5)
+        assert asyncio.run(backend.get_count("rl:203.0.113.7:min", 60)) == 2
+
+    def test_whitelisted_ip(self):
+        """Test whitelisted IPs bypass limits"""
+        limiter = RateLimiter(RateLimitConfig(burst_limit=1), InMemoryBackend())
+        assert all(allowed for allowed, _, _ in run_requests(limiter, 5, ip="127.0.0.1"))
+
+    def test_atomic_backend_single_call(self):
+        """Test atomic backends are checked and recorded in one call per request"""
+        backend = AtomicCountingBackend()
+        limiter = RateLimiter(RateLimitConfig(burst_limit=3), backend)
+        results = run_requests(limiter, 4)
+        assert backend.calls == 4
+        assert [allowed for allowed, _, _ in results] == [True, True, True, False]
+
+
+class TestInMemoryBackendBounds:
+    """Test LRU bounds and expiry wheel of the in-memory backend"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = {"t": 1_000_020.0}
+        monkeypatch.setattr("middleware.rate_limiter.time.time", lambda: now["t"])
+        return now
+
+    def test_lru_eviction(self, clock):
+        """Test the least recently used key is evicted at max_keys"""
+        backend = InMemoryBackend(max_keys=2)
+        asyncio.run(backend.record_request("a", 60))
+        asyncio.run(backend.record_request("b", 60))
+        asyncio.run(backend.get_count("a", 60))  # "b" is now least recently used
+        asyncio.run(backend.record_request("c", 60))
+        assert list(backend._requests) == ["a", "c"]
+        assert backend.stats()["evictions"] == 1
+        assert "b" not in backend._key_bucket
+
+    def test_expiry_wheel(self, clock):
+        """Test cleanup expires only keys whose window has passed"""
+        backend = InMemoryBackend(bucket_seconds=5)
+        asyncio.run(backend.record_request("short", 10))
+        asyncio.run(backend.record_request("long", 3600))
+        clock["t"] += 20
+        asyncio.run(backend.cleanup())
+        assert list(backend._requests) == ["long"]
+        assert backend.stats()["expirations"] == 1
+
+    def test_sweeper_runs_cleanup(self):
+        """Test the background sweeper cleans live backends"""
+        backend = InMemoryBackend(bucket_seconds=1)
+        backend._requests["stale"] = [0.0]
+        backend._schedule("stale", 1.0)
+
+        async def _run():
+            task = asyncio.create_task(run_sweeper(0.01))
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        asyncio.run(_run())
+        assert backend.stats()["keys"] == 0
+        assert local_backend_stats()["backends"] >= 1
+
+
+class TestEndpointRateLimits:
+    """Load test: endpoint dependencies enforce their limits across many requests"""
+
+    @pytest.fixture
+    def app(self):
+        app = FastAPI()
+
+        @app.get("/pricing", dependencies=[Depends(check_pricing_rate_limit)])
+        async def pricing():
+            return {"ok": True}
+
+        @app.get("/upload", dependencies=[Depends(check_upload_rate_limit)])
+        async def upload():
+            return {"ok": True}
+
+        return app
+
+    def _hammer(self, app, requests_per_ip: int, ips: int):
+        async def _run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                calls = [
+                    client.get(path, headers={"X-Real-IP": f"192.0.2.{ip}"})
+                    for path in ("/pricing", "/upload")
+                    for ip in range(ips)
+                    for _ in range(requests_per_ip)
+                ]
+                responses = await asyncio.gather(*calls)
+            return Counter((r.request.url.path, r.status_code) for r in responses)
+        return asyncio.run(_run())
+
+    def test_limits_hold_under_load(self, app):
+        """Test only burst_limit requests per IP get through on each endpoint"""
+        ips = 20
+        counts = self._hammer(app, requests_per_ip=25, ips=ips)
+        assert counts[("/pricing", 200)] == PRICING_RATE_LIMIT.burst_limit * ips
+        assert counts[("/upload", 200)] == UPLOAD_RATE_LIMIT.burst_limit * ips
+        assert counts[("/pricing", 429)] == (25 - PRICING_RATE_LIMIT.burst_limit) * ips
+
+    def test_limiters_reused(self, app):
+        """Test dependencies reuse one limiter per endpoint and one shared backend"""
+        self._hammer(app, requests_per_ip=2, ips=2)
+        registry = get_endpoint_rate_limiter()
+        assert set(registry.limiters) == {"pricing", "upload"}
+        backends = {id(limiter._backend) for limiter in registry.limiters.values()}
+        assert len(backends) == 1
+
+
+class TestSlidingWindowCounterBackend:
+    """Test the constant-memory approximate backend"""
+
+    @pytest.fixture
+    def clock(self, monkeypatch):
+        now = {"t": 1_000_020.0}  # aligned to 10s and 60s windows
+        monkeypatch.setattr("middleware.rate_limiter.time.time", lambda: now["t"])
+        return now
+
+    def test_counts_within_window(self, clock):
+        """Test counts are exact inside a single window"""
+        backend = SlidingWindowCounterBackend()
+        counts = [asyncio.run(backend.record_request("k", 60)) for _ in range(5)]
+        assert counts == [1, 2, 3, 4, 5]
+        assert asyncio.run(backend.get_count("missing", 60)) == 0
+
+    def test_previous_window_weighted(self, clock):
+        """Test the previous window decays linearly into the next"""
+        backend = SlidingWindowCounterBackend()
+        for _ in range(10):
+            asyncio.run(backend.record_request("k", 60))
+        clock["t"] += 60 + 30  # halfway through the next window
+        assert asyncio.run(backend.get_count("k", 60)) == 5
+        clock["t"] += 120
+        assert asyncio.run(backend.get_count("k", 60)) == 0
+
+    def test_constant_state_per_key(self, clock):
+        """Test state size does not grow with request count"""
+        backend = SlidingWindowCounterBackend()
+        for _ in range(500):
+            asyncio.run(backend.record_request("k", 3600))
+        assert len(backend._windows) == 1
+        assert len(backend._windows["k"]) == 4
+
+    def test_cleanup_drops_idle_keys(self, clock):
+        """Test cleanup removes keys idle for two windows"""
+        backend = SlidingWindowCounterBackend()
+        asyncio.run(backend.record_request("idle", 10))
+        clock["t"] += 25
+        asyncio.run(backend.record_request("active", 10))
+        asyncio.run(backend.cleanup())
+        assert list(backend._windows) == ["active"]
+
+    def test_lru_eviction(self, clock):
+        """Test the key table is bounded like InMemoryBackend's"""
+        backend = SlidingWindowCounterBackend(max_keys=2)
+        for key in ("a", "b"):
+            asyncio.run(backend.record_request(key, 60))
+        asyncio.run(backend.get_count("a", 60))  # "a" is now most recent
+        asyncio.run(backend.record_request("c", 60))
+        assert list(backend._windows) == ["a", "c"]
+        assert backend.stats() == {"keys": 2, "max_keys": 2, "evictions": 1, "expirations": 0}
+
+    def test_enabled_from_settings(self):
+        """Test the approximate toggle reaches the endpoint limiter backend"""
+        registry = configure_endpoint_rate_limiter(max_keys=5, approximate=True)
+        assert isinstance(registry._backend, SlidingWindowCounterBackend)
+        assert registry._backend.stats()["max_keys"] == 5
+
+    def test_limiter_semantics(self):
+        """Test RateLimiter denies on the burst window with this backend"""
+        limiter = RateLimiter(RateLimitConfig(burst_limit=3), SlidingWindowCounterBackend())
+        results = run_requests(limiter, 5)
+        assert [allowed for allowed, _, _ in results] == [True, True, True, False, False]
+
+
+class TestRedisBackendScript:
+    """Test RedisBackend's atomic path against a fake client"""
+
+    def test_check_and_record(self):
+        """Test the registered script is the Lua constant and drives allow/deny"""
+        backend = RedisBackend("redis://unused")
+        backend._redis = FakeScriptRedis()
+        windows = [("rl:ip:10", 10, 2), ("rl:ip:60", 60, 5)]
+
+        async def _run():
+            return [await backend.check_and_record(windows) for _ in range(3)]
+
+        assert asyncio.run(_run()) == [-1, -1, 0]
+        assert backend._redis.scripts == [CHECK_AND_RECORD_SCRIPT]
+        assert len(backend._redis.sets["rl:ip:60"]) == 2
+
+    def test_limiter_uses_one_round_trip(self):
+        """Test RateLimiter takes the atomic path instead of falling back"""
+        backend = RedisBackend("redis://unused")
+        backend._redis = FakeScriptRedis()
+        limiter = RateLimiter(RateLimitConfig(burst_limit=3), backend)
+        results = run_requests(limiter, 5)
+        assert [allowed for allowed, _, _ in results] == [True, True, True, False, False]
+        assert backend._redis.calls == 5
+
+    def test_atomic_failure_logged(self, caplog):
+        """Test a failing atomic path is logged once and falls back"""
+        backend = AtomicCountingBackend()
+
+        async def broken(windows):
+            raise RuntimeError("script failed")
+        backend.check_and_record = broken
+        limiter = RateLimiter(RateLimitConfig(burst_limit=3), backend)
+        with caplog.at_level("WARNING", logger="middleware.rate_limiter"):
+            results = run_requests(limiter, 4)
+        assert [allowed for allowed, _, _ in results] == [True, True, True, False]
+        assert sum("script failed" in record.message for record in caplog.records) == 1
+
+
+@pytest.mark.integration
+@pytest.mark.skipif(not os.environ.get("REDIS_URL"), reason="REDIS_URL not set")
+class TestRedisBackend:
+    """Test the Lua check-and-record script against a live Redis"""
+
+    def test_script_matches_pipeline_semantics(self):
+        """Test atomic and pipeline modes allow and deny the same requests"""
+        config = RateLimitConfig(burst_limit=3, requests_per_minute=5)
+        outcomes = []
+        for atomic, ip in ((True, "198.51.100.1"), (False, "198.51.100.2")):
+            backend = RedisBackend(os.environ["REDIS_URL"], atomic=atomic)
+            results = run_requests(RateLimiter(config, backend), 5, ip=ip)
+            outcomes.append([allowed for allowed, _, _ in results])
+        assert outcomes[0] == outcomes[1] == [True, True, True, False, False]
@@ -0,0 +1,100 @@
+"""
+Readiness Probe Tests
+Unit tests for cached dependency pings.
+"""
+
+import asyncio
+
+from services.readiness import ReadinessProbe
+
+
+class FakePing:
+    """Ping that succeeds, raises, or hangs until released"""
+
+    def __init__(self, error=None, hang=False):
+        self.error = error
+        self.release = asyncio.Event() if hang else None
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.release is not None:
+            await self.release.wait()
+        if self.error is not None:
+            raise self.error
+
+
+class TestReadinessProbe:
+    """Test readiness follows the last background round"""
+
+    def test_not_ready_before_first_round(self):
+        """Test a probe that has not pinged yet reports not ready"""
+        probe = ReadinessProbe()
+        probe.add("mongo", FakePing())
+        assert not probe.report()["ready"]
+
+    def test_required_and_optional(self):
+        """Test only required dependencies gate readiness"""
+        async def _run():
+            probe = ReadinessProbe(timeout=0.1)
+            probe.add("mongo", FakePing())
+            probe.add("redis", FakePing(error=ConnectionError("refused")), required=False)
+            await probe.check()
+            ready = probe.report()
+            probe.checks["mongo"].ping.error = ConnectionError("refused")
+            await probe.check()
+            return ready, probe.report()
+
+        ready, not_ready = asyncio.run(_run())
+        assert ready["ready"]
+        assert ready["checks"]["mongo"]["latency_percentiles_ms"]["samples"] == 1
+        assert ready["checks"]["redis"]["error"] == "ConnectionError: refused"
+        assert not not_ready["ready"]
+        assert not_ready["checks"]["mongo"]["failures"] == 1
+
+    def test_hung_ping_not_restarted(self):
+        """Test a ping past its timeout is waited on again, not re-sent"""
+        async def _run():
+            ping = FakePing(hang=True)
+            probe = ReadinessProbe(timeout=0.01)
+            probe.add("mongo", ping)
+            await probe.check()
+            await probe.check()
+            timed_out = probe.report()
+            ping.release.set()
+            await probe.check()
+            return ping.calls, timed_out, probe.report()
+
+        calls, timed_out, recovered = asyncio.run(_run())
+        assert calls == 1
+        assert not timed_out["ready"]
+        assert timed_out["checks"]["mongo"]["error"] == "no response within 0.01s"
+        assert recovered["ready"]
+
+    def test_stale_results(self):
+        """Test results older than the staleness bound do not count"""
+        async def _run():
+            probe = ReadinessProbe(interval=0.001, timeout=0.001)
+            probe.add("mongo", FakePing())
+            await probe.check()
+            await asyncio.sleep(0.01)
+            return probe.report()
+
+        assert not asyncio.run(_run())["ready"]
+
+    def test_background_task(self):
+        """Test start pings repeatedly and stop ends the task"""
+        async def _run():
+            ping = FakePing()
+            probe = ReadinessProbe(interval=0.01, timeout=0.1)
+            probe.add("mongo", ping)
+            probe.start()
+            await asyncio.sleep(0.05)
+            await probe.stop()
+            calls = ping.calls
+            await asyncio.sleep(0.02)
+            return calls, ping.calls, probe.report()
+
+        calls, later_calls, report = asyncio.run(_run())
+        assert calls >= 2 and later_calls == calls
+        assert report["ready"]
@@ -0,0 +1,188 @@
+"""
+Response Cache Tests
+Unit tests for the response cache tiers and fill/invalidation races.
+"""
+
+import asyncio
+
+import pytest
+
+from services.response_cache import ResponseCache
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.ops.append((name, args))
+
+    async def execute(self):
+        return [getattr(self.redis, name)(*args) for name, args in self.ops]
+
+
+class FakeRedis:
+    """Shared Redis holding strings and hashes, with the store-if-current script"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def hget(self, key, field):
+        return self.data.get(key, {}).get(field)
+
+    def hset(self, key, field, value):
+        self.data.setdefault(key, {})[field] = value
+
+    def expire(self, key, seconds):
+        pass
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, "0")) + 1)
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def register_script(self, script):
+        async def run(keys, args):
+            if self.data.get(keys[1], "0") != args[0]:
+                return 0
+            self.hset(keys[0], args[1], args[2])
+            return 1
+        return run
+
+
+class DownRedis(FakeRedis):
+    """Redis whose every call fails to connect, counting the attempts"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    async def get(self, key):
+        self.calls += 1
+        raise ConnectionError("Connection refused")
+
+    hget = get
+
+
+def redis_cache(redis, **kwargs):
+    cache = ResponseCache(redis_url="redis://unused", **kwargs)
+    cache._redis = redis
+    return cache
+
+
+class TestResponseCache:
+    """Test TTL, keying and invalidation"""
+
+    def test_cached_route_hits(self):
+        """Test repeated calls with the same params hit the cache"""
+        cache = ResponseCache(ttl_seconds=60)
+        calls = []
+
+        @cache.cached("projects")
+        async def get_projects(featured=None, industry=None):
+            calls.append((featured, industry))
+            return [{"slug": "a"}]
+
+        async def _run():
+            await get_projects(featured=True)
+            await get_projects(True)          # positional call shares the key
+            await get_projects(featured=False)
+        asyncio.run(_run())
+
+        assert calls == [(True, None), (False, None)]
+        assert cache.stats()["hits"] == 1
+
+    def test_ttl_expiry(self, monkeypatch):
+        """Test entries expire after the local TTL"""
+        now = {"t": 100.0}
+        monkeypatch.setattr("services.response_cache.time.monotonic", lambda: now["t"])
+        cache = ResponseCache(ttl_seconds=10)
+        asyncio.run(cache.set("projects", "k", [1]))
+        assert asyncio.run(cache.get("projects", "k")) == [1]
+        now["t"] += 11
+        assert asyncio.run(cache.get("projects", "k")) is None
+
+    def test_invalidate_tag(self):
+        """Test invalidation drops only the given tag"""
+        cache = ResponseCache()
+        asyncio.run(cache.set("projects", "a", 1))
+        asyncio.run(cache.set("other", "a", 2))
+        asyncio.run(cache.invalidate("projects"))
+        assert asyncio.run(cache.get("projects", "a")) is None
+        assert asyncio.run(cache.get("other", "a")) == 2
+
+    def test_exceptions_not_cached(self):
+        """Test failing calls are retried rather than cached"""
+        cache = ResponseCache()
+        calls = []
+
+        @cache.cached("projects")
+        async def get_project_by_slug(slug):
+            calls.append(slug)
+            raise LookupError(slug)
+
+        for _ in range(2):
+            with pytest.raises(LookupError):
+                asyncio.run(get_project_by_slug(slug="missing"))
+        assert len(calls) == 2
+
+    def test_fill_racing_invalidation_not_stored(self):
+        """Test a value read before an invalidation is not cached after it"""
+        cache = ResponseCache(ttl_seconds=60)
+        version = {"v": 1}
+
+        @cache.cached("projects")
+        async def get_projects():
+            read = version["v"]
+            await cache.invalidate("projects")  # a write lands mid-fill
+            version["v"] += 1
+            return read
+
+        async def _run():
+            first = await get_projects()
+            cached = await cache.get("projects", "get_projects")
+            return first, cached
+
+        assert asyncio.run(_run()) == (1, None)
+
+    def test_invalidation_from_another_worker(self):
+        """Test a worker's in-flight fill is not stored in Redis after another worker invalidates"""
+        redis = FakeRedis()
+        filler, writer = redis_cache(redis), redis_cache(redis)
+
+        async def _run():
+            generation = await filler.generation("projects")
+            await writer.invalidate("projects")
+            stored = await filler.set("projects", "k", "stale", generation)
+            fresh = await writer.set("projects", "k", "fresh", await writer.generation("projects"))
+            return stored, fresh, await redis_cache(redis).get("projects", "k")
+
+        assert asyncio.run(_run()) == (False, True, "fresh")
+
+    def test_unreachable_redis_skipped(self, monkeypatch):
+        """Test a connection failure skips the Redis tier until the retry delay passes"""
+        redis = DownRedis()
+        cache = redis_cache(redis, redis_retry_seconds=30)
+        now = [1000.0]
+        monkeypatch.setattr("services.response_cache.time.monotonic", lambda: now[0])
+
+        @cache.cached("projects")
+        async def get_projects(page=None):
+            return [page]
+
+        async def _run():
+            results = [await get_projects(page=n) for n in range(3)]
+            skipped = redis.calls
+            now[0] += 31
+            await get_projects(page=9)
+            return results, skipped, redis.calls
+
+        assert asyncio.run(_run()) == ([[0], [1], [2]], 1, 2)
@@ -0,0 +1,68 @@
+"""
+Sanitizer Tests
+Equivalence fuzzing of the fast path against a full bleach pass.
+"""
+
+import random
+
+import pytest
+
+from services.sanitizer import clean_html, sanitize_input
+
+# Weighted towards characters and fragments that matter to an HTML parser
+FRAGMENTS = [
+    "a", "Z", "0", " ", "  ", "\t", "\n", "\r\n", "\x0c", "\x00", "\x01", "\x1f", "\x7f", "\x85", "\xa0",
+    "\u2028", "\ufeff", "ş", "İ", "ğ", "€", "😀", "\"", "'", "=", "/", ";", "#",
+    "<", ">", "&", "&amp;", "&lt;", "&#60;", "&#x3c;", "&nbsp;", "&unknown;",
+    "<b>", "</b>", "<script>", "</script>", "<!--", "-->", "<![CDATA[", "]]>",
+    "<img src=x onerror=alert(1)>", "<a href=\"javascript:alert(1)\">", "<svg/onload=alert(1)>",
+    "<style>", "<textarea>", "<title>", "<?xml", "<!DOCTYPE html>",
+]
+
+XSS_PAYLOADS = [
+    "<script>alert('x')</script>",
+    "<img src=x onerror=alert(1)>",
+    "<a href=\"javascript:alert(1)\">click</a>",
+    "<svg><script>alert(1)</script></svg>",
+    "<<script>script>alert(1)<</script>/script>",
+    "&lt;script&gt;alert(1)&lt;/script&gt;",
+    "<iframe src=//evil.example>",
+    "<!--<script>-->alert(1)",
+]
+
+
+def reference(value: str) -> str:
+    """The previous implementation: always parse, then normalize whitespace"""
+    if not value:
+        return value
+    return " ".join(clean_html(value).split()).strip()
+
+
+class TestSanitizerEquivalence:
+    """Test the fast path never changes the sanitized output"""
+
+    def test_fuzz_against_bleach(self):
+        """Test random mixes of text and markup sanitize identically"""
+        rng = random.Random(1234)
+        for _ in range(3000):
+            value = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(0, 12)))
+            assert sanitize_input(value) == reference(value), repr(value)
+
+    def test_every_bmp_character(self):
+        """Test each single character (between letters) matches bleach"""
+        for codepoint in range(0x3000):
+            value = f"a{chr(codepoint)}b"
+            assert sanitize_input(value) == reference(value), hex(codepoint)
+
+    @pytest.mark.parametrize("payload", XSS_PAYLOADS)
+    def test_xss_payloads(self, payload):
+        """Test known payloads are neutralized exactly as bleach does"""
+        cleaned = sanitize_input(payload)
+        assert cleaned == reference(payload)
+        assert "<" not in cleaned
+
+    def test_plain_text_unchanged(self):
+        """Test plain text only has its whitespace normalized"""
+        assert sanitize_input("  Ahmet   Yılmaz\n") == "Ahmet Yılmaz"
+        assert sanitize_input("") == ""
+        assert sanitize_input(None) is None
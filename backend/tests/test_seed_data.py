@@ -0,0 +1,196 @@
+"""
+Seed Data Tests
+Unit tests for hashed, incremental seeding and the leader lock.
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+from seed_data import SAMPLE_PROJECTS, SEED_HASH_FIELD, SITE_CONFIG, changed_seeds, content_hash, seed_config
+from services.leader_lock import LOCKS_COLLECTION, acquire, leader_lock, release, wait_released
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    async def to_list(self, length):
+        return self.docs
+
+
+class FakeResult:
+    def __init__(self, modified_count=0):
+        self.modified_count = modified_count
+
+
+class FakeCollection:
+    """The handful of collection operations seeding and locking use"""
+
+    def __init__(self):
+        self.docs = {}
+        self.bulk_ops = 0
+
+    async def estimated_document_count(self):
+        return len(self.docs)
+
+    async def insert_one(self, doc):
+        if doc["_id"] in self.docs:
+            raise DuplicateKeyError("duplicate _id")
+        self.docs[doc["_id"]] = dict(doc)
+
+    async def update_one(self, query, update):
+        doc = self.docs.get(query["_id"])
+        if doc and doc["expires_at"] < query["expires_at"]["$lt"]:
+            doc.update(update["$set"])
+            return FakeResult(1)
+        return FakeResult(0)
+
+    async def find_one(self, query, projection):
+        doc = self.docs.get(query["_id"])
+        if doc and doc["expires_at"] > query["expires_at"]["$gt"]:
+            return doc
+        return None
+
+    async def delete_one(self, query):
+        if self.docs.get(query["_id"], {}).get("owner") == query["owner"]:
+            del self.docs[query["_id"]]
+
+    def find(self, query, projection):
+        field, condition = next(iter(query.items()))
+        return FakeCursor([
+            {k: v for k, v in doc.items() if projection.get(k)}
+            for doc in self.docs.values() if doc.get(field) in condition["$in"]
+        ])
+
+    async def bulk_write(self, operations, ordered=True):
+        self.bulk_ops += 1
+        for op in operations:
+            update, key = op._doc, tuple(op._filter.values())
+            key = key[0] if len(key) == 1 else key
+            if key in self.docs:
+                self.docs[key].update(update.get("$set", {}))
+            else:
+                self.docs[key] = {**update.get("$setOnInsert", {}), **update.get("$set", {})}
+
+
+class FakeDb(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+    def __getattr__(self, name):
+        return self[name]
+
+
+def seeded_db() -> FakeDb:
+    db = FakeDb()
+    db["project_facets"].docs["x"] = {}  # facets already materialized
+    return db
+
+
+class TestContentHash:
+    """Test change detection"""
+
+    def test_hash_ignores_key_order(self):
+        """Test reordered keys hash the same and changed values do not"""
+        doc = {"a": 1, "b": {"c": [1, 2]}}
+        assert content_hash(doc) == content_hash({"b": {"c": [1, 2]}, "a": 1})
+        assert content_hash(doc) != content_hash({"a": 1, "b": {"c": [2, 1]}})
+
+    def test_changed_seeds(self):
+        """Test only seeds with a missing or stale hash are returned"""
+        seeds = [{"slug": "a", "v": 1}, {"slug": "b", "v": 2}, {"slug": "c", "v": 3}]
+        stored = {"a": content_hash(seeds[0]), "b": "stale"}
+        assert [seed["slug"] for seed, _ in changed_seeds(seeds, "slug", stored)] == ["b", "c"]
+
+
+class TestLeaderLock:
+    """Test one worker at a time holds a lock"""
+
+    def test_exclusive_until_released(self):
+        """Test a held lock is refused and free again after release"""
+        async def _run():
+            db = FakeDb()
+            async with leader_lock(db, "job") as first:
+                async with leader_lock(db, "job") as second:
+                    pass
+            async with leader_lock(db, "job") as third:
+                pass
+            return first, second, third, db[LOCKS_COLLECTION].docs
+
+        assert asyncio.run(_run()) == (True, False, True, {})
+
+    def test_expired_lock_taken_over(self):
+        """Test a lock left by a dead worker is taken once expired"""
+        async def _run():
+            db = FakeDb()
+            db[LOCKS_COLLECTION].docs["job"] = {
+                "_id": "job", "owner": "dead", "expires_at": datetime.now(timezone.utc) - timedelta(seconds=1),
+            }
+            async with leader_lock(db, "job") as leader:
+                return leader
+
+        assert asyncio.run(_run())
+
+
+    def test_wait_released_on_expiry(self):
+        """Test waiting on a lock left by a dead worker ends once it expires"""
+        async def _run():
+            db = FakeDb()
+            db[LOCKS_COLLECTION].docs["job"] = {
+                "_id": "job", "owner": "dead", "expires_at": datetime.now(timezone.utc) + timedelta(seconds=0.05),
+            }
+            await asyncio.wait_for(wait_released(db, "job", poll_seconds=0.01), 1)
+
+        asyncio.run(_run())
+
+
+class TestSeedConfig:
+    """Test seeding writes only what changed"""
+
+    def test_second_run_writes_nothing(self):
+        """Test an unchanged reseed issues no writes"""
+        async def _run():
+            db = seeded_db()
+            first = await seed_config(db)
+            stored = dict(db.projects.docs[SAMPLE_PROJECTS[0]["slug"]])
+            second = await seed_config(db)
+            return db, first, second, stored
+
+        db, first, second, stored = asyncio.run(_run())
+        assert first == {"config": 2, "projects": len(SAMPLE_PROJECTS)}
+        assert second == {"config": 0, "projects": 0}
+        assert db.projects.bulk_ops == 1 and db.config.bulk_ops == 1
+        assert db.projects.docs[SAMPLE_PROJECTS[0]["slug"]] == stored
+        assert db.config.docs[SITE_CONFIG["key"]][SEED_HASH_FIELD] == content_hash(SITE_CONFIG)
+
+    def test_only_changed_project_rewritten(self):
+        """Test a stale hash rewrites that project and keeps its id"""
+        async def _run():
+            db = seeded_db()
+            await seed_config(db)
+            doc = db.projects.docs[SAMPLE_PROJECTS[1]["slug"]]
+            doc[SEED_HASH_FIELD] = "stale"
+            project_id = doc["id"]
+            return await seed_config(db), db.projects.docs[SAMPLE_PROJECTS[1]["slug"]]["id"] == project_id
+
+        result, kept_id = asyncio.run(_run())
+        assert result == {"config": 0, "projects": 1}
+        assert kept_id
+
+    def test_skipped_after_leader_finishes(self, monkeypatch):
+        """Test a worker that cannot take the lock waits for its release, then skips"""
+        monkeypatch.setattr("seed_data.SEED_LOCK_POLL_SECONDS", 0.01)
+
+        async def _run():
+            db = seeded_db()
+            owner = await acquire(db[LOCKS_COLLECTION], "seed_config", 300)
+            follower = asyncio.create_task(seed_config(db))
+            await asyncio.sleep(0.05)
+            waiting = not follower.done()
+            await release(db[LOCKS_COLLECTION], "seed_config", owner)
+            return waiting, await asyncio.wait_for(follower, 1), db.projects.docs
+
+        assert asyncio.run(_run()) == (True, None, {})
@@ -0,0 +1,69 @@
+"""
+Startup Profile Tests
+Unit tests for startup phase timing and import-time parsing.
+"""
+
+import asyncio
+
+import pytest
+
+from services.startup_profile import StartupProfile, parse_importtime
+
+
+class TestStartupProfile:
+    """Test phase recording"""
+
+    def test_phases_and_ready(self):
+        """Test phases are recorded in order, failures with their error"""
+        profile = StartupProfile()
+
+        async def _run():
+            async with profile.phase("queue"):
+                await asyncio.sleep(0.01)
+            profile.mark_ready()
+            with pytest.raises(ConnectionError):
+                async with profile.phase("indexes"):
+                    raise ConnectionError("no primary")
+
+        asyncio.run(_run())
+        report = profile.report()
+        queue, indexes = report["phases"]
+        assert queue["name"] == "queue" and queue["ok"] and queue["ms"] >= 10
+        assert indexes == {**indexes, "ok": False, "error": "ConnectionError: no primary"}
+        assert indexes["at_ms"] >= queue["at_ms"] + queue["ms"]
+        assert 0 < report["ready_ms"] <= report["uptime_ms"]
+
+    def test_parse_importtime(self):
+        """Test -X importtime lines are parsed and sorted by cumulative time"""
+        output = "\n".join([
+            "import time: self [us] | cumulative | imported package",
+            "import time:       120 |        120 |     bleach._vendor",
+            "import time:       350 |      37802 |   bleach",
+            "import time:      2000 |      50000 | server",
+        ])
+        rows = parse_importtime(output)
+        assert [row["module"] for row in rows] == ["server", "bleach", "bleach._vendor"]
+        assert rows[1] == {"module": "bleach", "self_us": 350, "cumulative_us": 37802, "depth": 1}
+
+
+class TestWarmUpRetry:
+    """Test failed warm-up steps are retried in the background"""
+
+    def test_retried_until_success(self, monkeypatch):
+        """Test a step is retried with backoff and profiled once failed, once done"""
+        import server
+
+        profile = StartupProfile()
+        monkeypatch.setattr(server, "startup_profile", profile)
+        attempts = []
+
+        async def flaky():
+            attempts.append(len(attempts))
+            if len(attempts) < 3:
+                raise ConnectionError("no primary")
+
+        asyncio.run(server.run_warm_up_step("ensure_indexes", flaky, delay=0.01))
+        assert len(attempts) == 3
+        failed, done = profile.report()["phases"]
+        assert (failed["name"], failed["ok"]) == ("ensure_indexes", False)
+        assert (done["name"], done["ok"]) == ("ensure_indexes (attempt 3)", True)
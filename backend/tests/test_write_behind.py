@@ -0,0 +1,265 @@
+"""
+Write-Behind Queue Tests
+Unit tests for batched inserts, retry and journal recovery.
+"""
+
+import asyncio
+import json
+
+import pytest
+from pymongo.errors import AutoReconnect, BulkWriteError, OperationFailure
+
+from services.write_behind import QueueFull, WriteBehindQueue
+
+
+class FakeCollection:
+    """Collection whose insert_many fails `failures` times before succeeding"""
+
+    def __init__(self, failures: int = 0, duplicates: bool = False, invalid=(), error=None):
+        self.failures = failures
+        self.duplicates = duplicates
+        self.invalid = set(invalid)
+        self.error = error
+        self.batches = []
+
+    async def insert_many(self, docs, ordered=True):
+        if self.error is not None:
+            raise self.error
+        if self.failures:
+            self.failures -= 1
+            raise AutoReconnect("primary stepped down")
+        if self.duplicates:
+            self.duplicates = False
+            raise BulkWriteError({"writeErrors": [{"code": 11000, "index": 0}]})
+        rejected = [
+            {"code": 121, "index": index, "errmsg": "Document failed validation"}
+            for index, doc in enumerate(docs) if doc["id"] in self.invalid
+        ]
+        self.batches.append([doc["id"] for doc in docs if doc["id"] not in self.invalid])
+        if rejected:
+            raise BulkWriteError({"writeErrors": rejected, "writeConcernErrors": []})
+
+
+def make_queue(tmp_path, collection, **kwargs):
+    return WriteBehindQueue(collection, str(tmp_path), "leads", max_retry_delay=0.01, **kwargs)
+
+
+def journal_files(tmp_path):
+    return sorted(tmp_path.glob("leads-*.ndjson"))
+
+
+class TestWriteBehindQueue:
+    """Test flushing behaviour"""
+
+    def test_batches_and_truncates_journal(self, tmp_path):
+        """Test submits are inserted in batches and the journal empties once acked"""
+        collection = FakeCollection()
+
+        async def _run():
+            queue = make_queue(tmp_path, collection, batch_size=4)
+            await queue.start()
+            for i in range(10):
+                queue.submit({"id": str(i)})
+            await queue.stop()
+            return queue.stats()
+
+        stats = asyncio.run(_run())
+        assert [len(batch) for batch in collection.batches] == [4, 4, 2]
+        assert stats["persisted"] == 10 and stats["unacked"] == 0
+        assert journal_files(tmp_path)[0].read_text() == ""
+
+    def test_retries_until_persisted(self, tmp_path):
+        """Test transient Mongo errors are retried, not dropped"""
+        collection = FakeCollection(failures=3)
+
+        async def _run():
+            queue = make_queue(tmp_path, collection)
+            await queue.start()
+            queue.submit({"id": "a"})
+            await queue.stop()
+            return queue.retries
+
+        assert asyncio.run(_run()) == 3
+        assert collection.batches == [["a"]]
+
+    def test_duplicate_keys_count_as_persisted(self, tmp_path):
+        """Test a replayed document already in Mongo is acked"""
+        collection = FakeCollection(duplicates=True)
+
+        async def _run():
+            queue = make_queue(tmp_path, collection)
+            await queue.start()
+            queue.submit({"id": "a"})
+            await queue.stop()
+            return queue.stats()
+
+        assert asyncio.run(_run())["unacked"] == 0
+        assert collection.batches == []
+
+    def test_permanent_errors_dead_lettered(self, tmp_path):
+        """Test a document Mongo rejects is set aside and acked, not retried"""
+        collection = FakeCollection(invalid={"bad"})
+
+        async def _run():
+            queue = make_queue(tmp_path, collection)
+            await queue.start()
+            for doc_id in ("a", "bad", "b"):
+                queue.submit({"id": doc_id})
+            await queue.stop(timeout=1)
+            return queue.stats()
+
+        stats = asyncio.run(_run())
+        assert stats["retries"] == 0 and stats["unacked"] == 0
+        assert (stats["persisted"], stats["dead_lettered"]) == (2, 1)
+        assert collection.batches == [["a", "b"]]
+        entry = json.loads((tmp_path / "leads.dead-letter.ndjson").read_text())
+        assert entry["doc"] == {"id": "bad"} and entry["error"]["code"] == 121
+
+    def test_non_transient_batch_error_dead_lettered(self, tmp_path):
+        """Test a batch-level error that retrying cannot fix does not block the queue"""
+        collection = FakeCollection(error=OperationFailure("not authorized", code=13))
+
+        async def _run():
+            queue = make_queue(tmp_path, collection)
+            await queue.start()
+            queue.submit({"id": "a"})
+            await queue.stop(timeout=1)
+            return queue.stats()
+
+        stats = asyncio.run(_run())
+        assert (stats["retries"], stats["dead_lettered"], stats["unacked"]) == (0, 1, 0)
+
+    def test_failed_batch_retried(self, tmp_path):
+        """Test a batch whose flush raises is retried until it persists"""
+        collection = FakeCollection(error=TypeError("boom"))
+
+        async def _run():
+            queue = make_queue(tmp_path, collection)
+            await queue.start()
+            queue.submit({"id": "a"})
+            while queue.failed < 2:
+                await asyncio.sleep(0.01)
+            collection.error = None
+            queue.submit({"id": "b"})
+            await queue.stop(timeout=1)
+            return queue.stats()
+
+        stats = asyncio.run(_run())
+        assert collection.batches[0] == ["a"] and "b" in sum(collection.batches, [])
+        assert stats["persisted"] == 2 and stats["unacked"] == 0
+        assert journal_files(tmp_path)[0].read_text() == ""
+
+    def test_flush_error_does_not_strand_journal(self, tmp_path):
+        """Test an error after the insert still lets the journal be truncated"""
+        collection = FakeCollection()
+
+        async def _run():
+            queue = make_queue(tmp_path, collection)
+            flush, calls = queue._flush, []
+
+            async def failing_flush(batch):
+                calls.append(batch)
+                if len(calls) == 1:
+                    raise RuntimeError("journal write failed")
+                await flush(batch)
+
+            queue._flush = failing_flush
+            await queue.start()
+            queue.submit({"id": "a"})
+            await queue.stop(timeout=1)
+            return queue.stats()
+
+        stats = asyncio.run(_run())
+        assert collection.batches == [["a"]]
+        assert (stats["failed"], stats["persisted"], stats["unacked"]) == (1, 1, 0)
+        assert journal_files(tmp_path)[0].read_text() == ""
+
+    def test_full_queue_rejects(self, tmp_path):
+        """Test submits beyond max_size raise QueueFull"""
+        async def _run():
+            queue = make_queue(tmp_path, FakeCollection(), max_size=2)
+            await queue.start()
+            queue._task.cancel()  # nothing drains
+            queue.submit({"id": "a"})
+            queue.submit({"id": "b"})
+            with pytest.raises(QueueFull):
+                queue.submit({"id": "c"})
+
+        asyncio.run(_run())
+
+
+class TestJournalRecovery:
+    """Test unpersisted documents survive a restart"""
+
+    def test_orphaned_journal_requeued(self, tmp_path):
+        """Test unacked entries of a dead process are inserted on start"""
+        orphan = tmp_path / "leads-1234-deadbeef.ndjson"
+        orphan.write_text("\n".join([
+            json.dumps({"add": {"id": "a"}}),
+            json.dumps({"add": {"id": "b"}}),
+            json.dumps({"ack": ["a"]}),
+            json.dumps({"add": {"id": "c"}}),
+            '{"add": {"id": "tor',  # crash mid-write
+        ]))
+        collection = FakeCollection()
+
+        async def _run():
+            queue = make_queue(tmp_path, collection)
+            recovered = await queue.start()
+            await queue.stop()
+            return recovered
+
+        assert asyncio.run(_run()) == 2
+        assert collection.batches == [["b", "c"]]
+        assert not orphan.exists()
+
+    def test_orphan_replayed_once(self, tmp_path):
+        """Test a worker recovering alongside another skips the orphan it holds"""
+        orphan = tmp_path / "leads-1234-deadbeef.ndjson"
+        orphan.write_text(json.dumps({"add": {"id": "a"}}) + "\n")
+        first = WriteBehindQueue(None, str(tmp_path), "leads")._recover_orphans()
+        second = WriteBehindQueue(None, str(tmp_path), "leads")._recover_orphans()
+        (path, f), = first[1]
+        path.unlink(missing_ok=True)
+        f.close()
+        third = WriteBehindQueue(None, str(tmp_path), "leads")._recover_orphans()
+        assert first[0] == [{"id": "a"}]
+        assert second == ([], []) and third == ([], [])
+
+    def test_live_journal_not_stolen(self, tmp_path):
+        """Test a journal locked by a running worker is left alone"""
+        async def _run():
+            owner = make_queue(tmp_path, FakeCollection(failures=1000))
+            await owner.start()
+            owner.submit({"id": "a"})
+            other = make_queue(tmp_path, FakeCollection())
+            recovered = await other.start()
+            await other.stop()
+            await owner.stop(timeout=0.05)
+            return recovered
+
+        assert asyncio.run(_run()) == 0
+        assert len(journal_files(tmp_path)) == 2
+
+    def test_journal_locked_before_visible(self, tmp_path, monkeypatch):
+        """Test recovery never finds a live worker's journal unlocked"""
+        import services.write_behind as write_behind
+        rename = write_behind.os.rename
+        seen = []
+
+        def checked_rename(src, dst):
+            # Another worker recovering right now must skip the journal
+            seen.append(WriteBehindQueue(None, str(tmp_path), "leads")._recover_orphans()[1])
+            rename(src, dst)
+            seen.append(WriteBehindQueue(None, str(tmp_path), "leads")._recover_orphans()[1])
+
+        monkeypatch.setattr(write_behind.os, "rename", checked_rename)
+
+        async def _run():
+            queue = make_queue(tmp_path, FakeCollection())
+            await queue.start()
+            await queue.stop()
+
+        asyncio.run(_run())
+        assert seen == [[], []]
+        assert len(journal_files(tmp_path)) == 1
@@ -14,7 +14,8 @@
  * - Bypasses nginx for faster SSR data fetching
  */
 
-import type { ApiResult, ApiErrorCode, HttpStatusCode } from '@/types';
+import type { ApiPaginatedResponse, ApiResult, ApiErrorCode, HttpStatusCode } from '@/types';
+import type { Locale } from '@/lib/i18n';
 
 type FetchOptions = RequestInit & {
   timeout?: number;
@@ -127,19 +128,22 @@ function statusToErrorCode(status: number): ApiErrorCode {
  */
 export const api = {
   // Projects
-  getProjects: (params?: { featured?: boolean; industry?: string }) => {
+  getProjects: (params?: { featured?: boolean; industry?: string; per_page?: number; cursor?: string; locale?: Locale }) => {
     const searchParams = new URLSearchParams();
     if (params?.featured !== undefined) searchParams.set('featured', String(params.featured));
     if (params?.industry) searchParams.set('industry', params.industry);
+    if (params?.per_page) searchParams.set('per_page', String(params.per_page));
+    if (params?.cursor) searchParams.set('cursor', params.cursor);
+    if (params?.locale) searchParams.set('locale', params.locale);
     const query = searchParams.toString();
-    return apiFetch<Project[]>(`/projects${query ? `?${query}` : ''}`);
+    return apiFetch<ApiPaginatedResponse<ProjectListItem>>(`/projects${query ? `?${query}` : ''}`);
   },
 
-  getProject: (slug: string) =>
-    apiFetch<Project>(`/projects/${slug}`),
+  getProject: (slug: string, locale?: Locale) =>
+    apiFetch<Project>(`/projects/${slug}${locale ? `?locale=${locale}` : ''}`),
 
-  getProjectsByIndustry: (industry: string) =>
-    apiFetch<Project[]>(`/projects/industry/${industry}`),
+  getProjectsByIndustry: (industry: string, locale?: Locale) =>
+    apiFetch<Project[]>(`/projects/industry/${industry}${locale ? `?locale=${locale}` : ''}`),
 
   // Technologies & Industries
   getTechnologies: () => apiFetch<string[]>('/technologies'),
@@ -184,6 +188,23 @@ export interface Project {
   schema_version?: number;
 }
 
+/** Grid/list view of a project; fetch the full Project by slug */
+export interface ProjectListItem {
+  id: string;
+  slug: string;
+  title: string;
+  title_en?: string;
+  subtitle: string;
+  subtitle_en?: string;
+  thumbnail?: string;
+  hero_image?: string;
+  client_industry: string;
+  client_industry_en?: string;
+  technologies: string[];
+  featured: boolean;
+  order: number;
+}
+
 export interface ProjectPhase {
   title: string;
   description: string;
@@ -23,6 +23,8 @@ export interface ApiPaginatedResponse<T> {
   page: number;
   per_page: number;
   pages: number;
+  /** Opaque keyset cursor for the next page; null on the last page */
+  next_cursor: string | null;
   timestamp: string;
 }
 